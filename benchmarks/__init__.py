@@ -0,0 +1 @@
+"""Benchmarks for ELBASHA Multi Tools (not packaged into the APK)."""
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Banknote detection benchmark: accuracy and latency on synthetic photos.
+
+    python benchmarks/bench_banknotes.py --images 20 --size 2000x1500
+
+Each denomination gets a synthetic reference note (its own colour, pattern
+and an off-centre watermark, so it is not symmetric). Scenes scatter a few
+of them, scaled, rotated and brightened or darkened, on a noisy cloth, then
+blur and save them as JPEGs, so decoding is part of the measured time.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter
+
+from core import banknotes
+
+NOTE_SIZE = (320, 150)
+NOTE_COLOURS = {
+    200: (110, 125, 70),
+    100: (170, 90, 70),
+    50: (150, 80, 125),
+    20: (80, 140, 100),
+    10: (205, 110, 135),
+    5: (115, 110, 175),
+    1: (195, 160, 100),
+}
+CLOTH = (55, 60, 72)
+
+
+def _shade(colour, factor):
+    return tuple(max(0, min(255, int(c * factor))) for c in colour)
+
+
+def make_note(value):
+    """A synthetic note: base colour, value-seeded shapes, watermark and border"""
+    rng = random.Random(value)
+    colour = NOTE_COLOURS[value]
+    w, h = NOTE_SIZE
+    note = Image.new('RGB', NOTE_SIZE, colour)
+    draw = ImageDraw.Draw(note)
+    for _ in range(14):
+        x, y = rng.randrange(w), rng.randrange(h)
+        rx, ry = rng.randint(8, 60), rng.randint(8, 40)
+        fill = _shade(colour, rng.choice((0.55, 0.7, 1.25, 1.4)))
+        if rng.random() < 0.5:
+            draw.ellipse((x - rx, y - ry, x + rx, y + ry), fill=fill)
+        else:
+            draw.rectangle((x - rx, y - ry, x + rx, y + ry), fill=fill)
+    for i in range(rng.randint(3, 9)):
+        x = 20 + i * 12
+        draw.line((x, 15, x, h - 15), fill=_shade(colour, 0.5), width=3)
+    draw.ellipse((w - 110, 30, w - 30, h - 30), fill=(235, 230, 215))
+    draw.rectangle((0, 0, w - 1, h - 1), outline=_shade(colour, 0.45), width=6)
+    return note
+
+
+def make_scene(values, size, rng):
+    """Notes with the given values scattered without overlap; returns the photo"""
+    scene = Image.effect_noise(size, 18).convert('RGB')
+    scene = Image.blend(Image.new('RGB', size, CLOTH), scene, 0.15)
+    note_length = min(size) / 3.2
+    placed = []
+    for value in values:
+        note = make_note(value)
+        scale = note_length * rng.uniform(0.85, 1.1) / NOTE_SIZE[0]
+        note = note.resize((int(NOTE_SIZE[0] * scale), int(NOTE_SIZE[1] * scale)))
+        note = ImageEnhance.Brightness(note).enhance(rng.uniform(0.85, 1.15))
+        note = note.convert('RGBA').rotate(rng.uniform(0, 360), expand=True,
+                                           resample=Image.Resampling.BILINEAR)
+        radius = math.hypot(*note.size) / 2 * 0.75
+        for _ in range(200):
+            cx = rng.uniform(radius, size[0] - radius)
+            cy = rng.uniform(radius, size[1] - radius)
+            if all(math.hypot(cx - x, cy - y) > radius + r + 10 for x, y, r in placed):
+                break
+        else:
+            continue
+        placed.append((cx, cy, radius))
+        scene.paste(note, (int(cx - note.size[0] / 2), int(cy - note.size[1] / 2)), note)
+    return scene.filter(ImageFilter.GaussianBlur(1.2)), len(placed)
+
+
+def make_scenes(folder, images, size, seed=11):
+    """Write JPEG scenes to `folder`; return [(path, {value: count})]"""
+    rng = random.Random(seed)
+    scenes = []
+    for n in range(images):
+        values = [rng.choice(list(NOTE_COLOURS)) for _ in range(rng.randint(3, 8))]
+        scene, placed = make_scene(values, size, rng)
+        truth = {}
+        for value in values[:placed]:
+            truth[value] = truth.get(value, 0) + 1
+        path = os.path.join(folder, f"scene-{n:03d}.jpg")
+        scene.save(path, quality=88)
+        scenes.append((path, truth))
+    return scenes
+
+
+def run(images=20, size=(2000, 1500), seed=11):
+    """Return one result row per matching backend"""
+    backends = [False]
+    if banknotes.numpy is not None:
+        backends.append(True)
+    references = [banknotes.reference_template(v, make_note(v)) for v in NOTE_COLOURS]
+
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        scenes = make_scenes(folder, images, size, seed)
+        for use_numpy in backends:
+            # Big enough to hold every scene, so the second pass measures cache hits
+            detector = banknotes.Detector(references, use_numpy=use_numpy,
+                                          cache_size=max(banknotes.CACHE_SIZE, len(scenes)))
+            times = []
+            notes = found = correct = exact = 0
+            for path, truth in scenes:
+                start = time.perf_counter()
+                counts = detector.count(path)
+                times.append(time.perf_counter() - start)
+                notes += sum(truth.values())
+                found += sum(counts.values())
+                correct += sum(min(n, counts.get(v, 0)) for v, n in truth.items())
+                exact += counts == truth
+            start = time.perf_counter()
+            for path, _ in scenes:
+                detector.count(path)
+            cached = (time.perf_counter() - start) / len(scenes)
+            times.sort()
+            results.append({
+                'backend': 'numpy' if use_numpy else 'python',
+                'images': len(scenes),
+                'notes': notes,
+                'recall': correct / notes if notes else 1.0,
+                'precision': correct / found if found else 1.0,
+                'exact_images': exact / len(scenes),
+                'mean_ms': sum(times) / len(times) * 1000,
+                'max_ms': times[-1] * 1000,
+                'cached_us': cached * 1e6,
+            })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--images', type=int, default=20)
+    parser.add_argument('--size', default='2000x1500', help="WIDTHxHEIGHT of each scene")
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args(argv)
+    size = tuple(int(part) for part in args.size.lower().split('x'))
+
+    print(f"{'backend':<8} {'images':>6} {'notes':>6} {'recall':>7} {'precis.':>7} "
+          f"{'exact':>6} {'mean ms':>8} {'max ms':>8} {'cached us':>10}")
+    for row in run(args.images, size, args.seed):
+        print(f"{row['backend']:<8} {row['images']:>6} {row['notes']:>6} {row['recall']:>7.1%} "
+              f"{row['precision']:>7.1%} {row['exact_images']:>6.0%} {row['mean_ms']:>8.1f} "
+              f"{row['max_ms']:>8.1f} {row['cached_us']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch tape benchmark: expressions per second, sequential against the pools.
+
+    python benchmarks/bench_batch.py --lines 20000 --workers 4
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_expression import generate
+from core import batch
+
+
+def run(lines=20000, mode='decimal', workers=None):
+    """Return one result row per executor (the sequential loop first)"""
+    exprs = generate(lines)
+    text = '\n'.join(exprs) + '\n'
+
+    start = time.perf_counter()
+    expected = batch.evaluate_chunk(exprs, mode, batch.EXPRESSION_TIMEOUT)
+    sequential = time.perf_counter() - start
+    results = [{'executor': 'sequential', 'workers': 1, 'seconds': sequential,
+                'per_second': lines / sequential}]
+
+    kinds = ['thread']
+    if batch.processes_available():
+        kinds.append('process')
+    for kind in kinds:
+        out = io.StringIO()
+        report = batch.run_batch(io.StringIO(text), out, mode, workers=workers, kind=kind)
+        if out.getvalue().splitlines() != expected:
+            raise AssertionError(f"{kind} results differ from the sequential loop")
+        results.append({'executor': kind, 'workers': report.workers, 'seconds': report.seconds,
+                        'per_second': report.per_second})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=20000)
+    parser.add_argument('--mode', default='decimal', choices=('float', 'decimal', 'fraction'))
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args(argv)
+
+    print(f"{'executor':<11} {'workers':>7} {'seconds':>8} {'expr/s':>9}")
+    for row in run(args.lines, args.mode, args.workers):
+        print(f"{row['executor']:<11} {row['workers']:>7} {row['seconds']:>8.2f} "
+              f"{row['per_second']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Change-making benchmark: cold and memoized query cost per denomination set.
+
+    python benchmarks/bench_change.py --queries 2000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.change import ChangeSolver
+
+CASES = {
+    # Notes in pounds, as counted on the money screen
+    'egp_notes': (200, 100, 50, 20, 10, 5, 1),
+    # Notes and coins in piastres
+    'egp_piastres': (20000, 10000, 5000, 2000, 1000, 500, 100, 50, 25),
+    # Non-canonical set where plain greedy fails
+    'arbitrary': (97, 61, 37, 13, 7, 3),
+}
+
+
+def _first_query(denominations, stock, target, changes=9):
+    """Median ms of the first query after a count change (a new solver each time)"""
+    times = []
+    for i in range(changes):
+        stock = list(stock)
+        stock[i % len(stock)] += 1
+        solver = ChangeSolver(denominations, stock)
+        start = time.perf_counter()
+        solver.solve(target)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def run(queries=2000, seed=7):
+    """Milliseconds per query: first (builds the DP table), cold and repeated
+
+    Targets are drawn up to what the stock can pay, so most are solvable.
+    The 99th percentile of cold queries is what TARGETS in run.py checks;
+    on a busy machine the maximum is mostly scheduling noise.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for name, denominations in CASES.items():
+        stock = [rng.randint(0, 5000) for _ in denominations]
+        step = min(denominations)
+        capacity = sum(d * s for d, s in zip(denominations, stock))
+        targets = [rng.randint(1, capacity // step) * step for _ in range(queries)]
+
+        first = _first_query(denominations, stock, targets[0])
+        solver = ChangeSolver(denominations, stock)
+        solver.solve(targets[0])
+        cold = []
+        for target in targets[1:]:
+            start = time.perf_counter()
+            solver.solve(target)
+            cold.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        for target in targets:
+            solver.solve(target)
+        warm = (time.perf_counter() - start) / queries
+
+        rows.append({
+            'case': name,
+            'queries': queries,
+            'first_ms': first,
+            'cold_mean_ms': sum(cold) / len(cold) * 1000,
+            'cold_p99_ms': statistics.quantiles(cold, n=100)[98] * 1000,
+            'cold_max_ms': max(cold) * 1000,
+            'repeat_mean_ms': warm * 1000,
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<14} {'first':>10} {'cold mean':>10} {'cold p99':>10} {'cold max':>10} "
+          f"{'repeat':>10}  (ms/query)")
+    for row in run(args.queries):
+        print(f"{row['case']:<14} {row['first_ms']:>10.3f} {row['cold_mean_ms']:>10.3f} "
+              f"{row['cold_p99_ms']:>10.3f} {row['cold_max_ms']:>10.3f} "
+              f"{row['repeat_mean_ms']:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
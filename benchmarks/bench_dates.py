@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bulk age benchmark: rows per second through bulk_ages, per backend.
+
+    python benchmarks/bench_dates.py --rows 50000
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import dates
+
+
+def make_roster(rows, seed=3):
+    """An in-memory CSV of staff birth dates"""
+    rng = random.Random(seed)
+    start = date(1950, 1, 1)
+    lines = ["employee_id,name,birth_date\n"]
+    for i in range(rows):
+        birth = start + timedelta(days=rng.randint(0, 20000))
+        lines.append(f"{i},Employee {i},{birth.isoformat()}\n")
+    return "".join(lines)
+
+
+def run(rows=50000, chunk_rows=dates.CHUNK_ROWS):
+    """Return one result row per backend"""
+    roster = make_roster(rows)
+    backends = [False]
+    if dates.numpy is not None:
+        backends.append(True)
+
+    results = []
+    for use_numpy in backends:
+        out = io.StringIO()
+        start = time.perf_counter()
+        dates.bulk_ages(io.StringIO(roster), out, today=(2025, 1, 1),
+                        chunk_rows=chunk_rows, use_numpy=use_numpy)
+        elapsed = time.perf_counter() - start
+        results.append({
+            'backend': 'numpy' if use_numpy else 'python',
+            'rows': rows,
+            'seconds': elapsed,
+            'rows_per_second': rows / elapsed,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--chunk-rows', type=int, default=dates.CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    print(f"{'backend':<8} {'rows':>8} {'seconds':>9} {'rows/s':>10}")
+    for row in run(args.rows, args.chunk_rows):
+        print(f"{row['backend']:<8} {row['rows']:>8} {row['seconds']:>9.3f} "
+              f"{row['rows_per_second']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Expression engine benchmark: eval() against core.expression on generated input.
+
+    python benchmarks/bench_expression.py --count 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import expression
+
+
+def generate(count, seed=1234, max_terms=8):
+    """Calculator-style expressions such as '12*7+300/4-9'"""
+    rng = random.Random(seed)
+    exprs = []
+    for _ in range(count):
+        terms = [str(rng.randint(0, 9999)) for _ in range(rng.randint(1, max_terms))]
+        text = terms[0]
+        for term in terms[1:]:
+            text += rng.choice('+-*/') + term
+        exprs.append(text.replace('/0', '/7'))
+    return exprs
+
+
+def _time(fn, exprs):
+    start = time.perf_counter()
+    for text in exprs:
+        fn(text)
+    return (time.perf_counter() - start) / len(exprs) * 1e6
+
+
+def run(count=5000, seed=1234):
+    """Mean microseconds per expression for eval and the engine (cold/warm)"""
+    exprs = generate(count, seed)
+    results = {'count': count, 'eval_us': _time(eval, exprs)}
+    for mode in expression.MODES:
+        expression.compile_expression.cache_clear()
+        results[f'{mode}_cold_us'] = _time(lambda t: expression.evaluate(t, mode), exprs)
+        # Warm: the same text again hits the LRU of compiled programs
+        warm = exprs[:expression.compile_expression.cache_info().maxsize]
+        for text in warm:
+            expression.evaluate(text, mode)
+        results[f'{mode}_warm_us'] = _time(lambda t: expression.evaluate(t, mode), warm)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    results = run(args.count, args.seed)
+    print(f"{results['count']} expressions, mean us/expression")
+    print(f"  eval()            {results['eval_us']:8.2f}")
+    for mode in expression.MODES:
+        print(f"  {mode:<8} cold      {results[mode + '_cold_us']:8.2f}")
+        print(f"  {mode:<8} cached    {results[mode + '_warm_us']:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
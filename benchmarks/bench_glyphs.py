@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Label update benchmark: cost per text change of an MDLabel, which
+rasterizes a new texture (before), and of a GlyphLabel, which only
+rewrites glyph-atlas quads (after).
+
+    python benchmarks/bench_glyphs.py --changes 2000
+
+Each change is followed by the work the next frame would do for it
+(texture_update() for the label, redraw() for the glyph label), as when
+a +/- button is held or keys are pressed faster than the frame rate.
+Needs Kivy; runs headless (see headless.py).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import headless  # noqa: F401  (sets the Kivy environment before any import)
+
+# (name, font settings, texts): the money total, a row subtotal, the calculator display
+CASES = [
+    ('total', {'font_size': '48sp'},
+     lambda n: f"{n * 50:,} EGP".replace(',', '.')),
+    ('subtotal', {'font_size': '12sp', 'bold': True},
+     lambda n: f"{n * 200:,}".replace(',', '.')),
+    ('display', {'font_name': 'RobotoLight', 'font_size': '60sp'},
+     lambda n: "12+34*5-" * (n % 4) + str(n)),
+]
+
+
+def _per_change(label, texts, settle):
+    start = time.perf_counter()
+    for text in texts:
+        label.text = text
+        settle()
+    return (time.perf_counter() - start) / len(texts)
+
+
+def run(changes=2000):
+    """µs per text change for each label kind and case.
+
+    Expects a running (or registered) MDApp, since KivyMD widgets look up
+    theme_cls through it.
+    """
+    from kivy.metrics import sp
+    from kivymd.uix.label import MDLabel
+    from core import glyphs
+    from widgets import GlyphAtlas, GlyphLabel
+
+    rows = []
+    for name, font, text_for in CASES:
+        texts = [text_for(n) for n in range(changes)]
+
+        label = MDLabel(font_name=font.get('font_name', 'Roboto'), font_size=font['font_size'],
+                        bold=font.get('bold', False), halign='center', size=(600, 120))
+        label.texture_update()
+        before = _per_change(label, texts, label.texture_update)
+
+        glyph = GlyphLabel(halign='center', size=(600, 120), **font)
+        glyph.redraw()
+        after = _per_change(glyph, texts, glyph.redraw)
+
+        # The vertex layout alone, without the Mesh upload
+        metrics = GlyphAtlas.get(glyph.font_name, glyph.font_size, glyph.bold).metrics
+        start = time.perf_counter()
+        for text in texts:
+            glyphs.layout(metrics, text, 0, 0, 600, 120, 'center')
+        layout = (time.perf_counter() - start) / changes
+
+        rows.append({
+            'case': name,
+            'font_px': round(sp(float(font['font_size'][:-2]))),
+            'label_us': before * 1e6,
+            'glyph_us': after * 1e6,
+            'layout_us': layout * 1e6,
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--changes', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    from kivy.app import App
+    from main import ElbashaApp
+    App._running_app = ElbashaApp()
+
+    print(f"{'case':<10} {'font px':>8} {'MDLabel us':>11} {'GlyphLabel us':>14} {'layout us':>10}")
+    for row in run(args.changes):
+        print(f"{row['case']:<10} {row['font_px']:>8} {row['label_us']:>11.1f} "
+              f"{row['glyph_us']:>14.1f} {row['layout_us']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Layout benchmark: GlassCard resize passes with the vector outline (before)
+and the shared 9-patch border texture (after).
+
+    python benchmarks/bench_layout.py --cards 12 --passes 300
+
+Needs Kivy; runs headless (see headless.py).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import headless  # noqa: F401  (sets the Kivy environment before any import)
+
+
+def run(cards=12, passes=300):
+    """ms per layout pass of a column of cards, per border style.
+
+    Expects a running (or registered) MDApp, since KivyMD widgets look up
+    theme_cls through it.
+    """
+    from kivymd.uix.boxlayout import MDBoxLayout
+    from widgets import GlassCard, textures
+
+    styles = [('line', False)]
+    if textures.Image is not None:
+        styles.append(('ninepatch', True))
+
+    rows = []
+    for name, ninepatch in styles:
+        GlassCard.use_ninepatch = ninepatch
+        try:
+            column = MDBoxLayout(orientation='vertical', size=(1080, 1920))
+            for _ in range(cards):
+                column.add_widget(GlassCard())
+            column.do_layout()
+            start = time.perf_counter()
+            for i in range(passes):
+                # Alternate sizes, as in a rotation or a screen transition
+                column.size = (1080 - i % 2 * 40, 1920 - i % 2 * 60)
+                column.do_layout()
+            elapsed = time.perf_counter() - start
+        finally:
+            GlassCard.use_ninepatch = textures.Image is not None
+        rows.append({'border': name, 'cards': cards, 'pass_ms': elapsed / passes * 1000})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cards', type=int, default=12)
+    parser.add_argument('--passes', type=int, default=300)
+    args = parser.parse_args(argv)
+
+    from kivy.app import App
+    from main import ElbashaApp
+    App._running_app = ElbashaApp()
+
+    print(f"{'border':<10} {'cards':>6} {'ms/pass':>9}")
+    for row in run(args.cards, args.passes):
+        print(f"{row['border']:<10} {row['cards']:>6} {row['pass_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
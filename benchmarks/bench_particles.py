@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Particle field benchmark: per-step cost (step + vertex fill) against count.
+
+    python benchmarks/bench_particles.py --counts 20,200,2000,20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import particles
+from core.particles import ParticleField
+
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def run(counts=(20, 200, 2000, 10000), steps=200):
+    """Return one result row per (backend, count)"""
+    backends = [False]
+    if particles.numpy is not None:
+        backends.append(True)
+
+    rows = []
+    for use_numpy in backends:
+        for count in counts:
+            field = ParticleField(count, 1080, 1920, use_numpy=use_numpy, seed=42)
+            start = time.perf_counter()
+            for _ in range(steps):
+                field.step(1 / 60)
+                vertices = field.vertices()
+                for bucket in range(len(field.buckets)):
+                    field.bucket_vertices(vertices, bucket)
+            per_step = (time.perf_counter() - start) / steps
+            rows.append({
+                'backend': 'numpy' if use_numpy else 'array',
+                'count': field.count,
+                'step_ms': per_step * 1000,
+                'us_per_particle': per_step * 1e6 / field.count,
+            })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--counts', default='20,200,2000,10000')
+    parser.add_argument('--steps', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    counts = [int(c) for c in args.counts.split(',')]
+    print(f"{'backend':<8} {'count':>7} {'ms/step':>9} {'us/particle':>12}  60fps budget")
+    for row in run(counts, args.steps):
+        share = row['step_ms'] / FRAME_BUDGET_MS * 100
+        print(f"{row['backend']:<8} {row['count']:>7} {row['step_ms']:>9.3f} "
+              f"{row['us_per_particle']:>12.3f}  {share:5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Valuation benchmark: rate table access and multi-currency revaluation.
+
+    python benchmarks/bench_rates.py --currencies 170 --targets 4,16,64
+
+A table of synthetic rates is written and memory-mapped. Counting one
+note is a Valuation.add() (one multiply-add, whatever the number of
+targets); showing the result is values(), one integer division per target.
+The full path re-sums every denomination of every profile for comparison.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import currencies, rates
+
+
+def _per_call(fn, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - start) / calls
+
+
+def make_rates(count, seed=9):
+    """{code: rate} for the profiles' currencies plus synthetic 'X..' codes"""
+    rng = random.Random(seed)
+    table = {rates.rate_code(code): Decimal(rng.randint(1, 10 ** 6)).scaleb(-rng.randint(2, 8))
+             for code in currencies.CURRENCIES}
+    n = 0
+    while len(table) < count:
+        table[f"X{n:04d}"] = Decimal(rng.randint(1, 10 ** 6)).scaleb(-rng.randint(2, 8))
+        n += 1
+    table['USD'] = Decimal(1)
+    return table
+
+
+def run(count=170, targets=(4, 16, 64), calls=20000, seed=9):
+    """Return one result row per target count"""
+    rng = random.Random(seed)
+    profiles = list(currencies.CURRENCIES.values())
+    counts = {c.code: [rng.randint(0, 500) for _ in c.values] for c in profiles}
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'rates.bin')
+        start = time.perf_counter()
+        rates.write_table(path, make_rates(count, seed))
+        write = time.perf_counter() - start
+        start = time.perf_counter()
+        table = rates.RateTable(path)
+        mapped = time.perf_counter() - start
+        codes = list(table)
+        lookup = _per_call(lambda i: table.rate(codes[i % len(codes)]), calls)
+
+        for n in targets:
+            valuation = rates.Valuation(table, codes[:n])
+            for c in profiles:
+                valuation.set(c.code, sum(v * k for v, k in zip(c.values, counts[c.code])))
+            steps = [(profiles[i % len(profiles)], rng.choice((-1, 1))) for i in range(calls)]
+            add = _per_call(lambda i: valuation.add(steps[i][0].code,
+                                                    steps[i][1] * steps[i][0].values[0]), calls)
+            values = _per_call(lambda i: valuation.values(), calls // 10)
+
+            def full(i):
+                for c in profiles:
+                    valuation.set(c.code, sum(v * k for v, k in zip(c.values, counts[c.code])))
+                valuation.values()
+
+            results.append({
+                'currencies': len(table),
+                'targets': len(valuation.targets),
+                'write_ms': write * 1000,
+                'map_us': mapped * 1e6,
+                'lookup_us': lookup * 1e6,
+                'count_change_us': (add + values) * 1e6,
+                'values_us': values * 1e6,
+                'full_recompute_us': _per_call(full, calls // 10) * 1e6,
+            })
+        table.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--currencies', type=int, default=170)
+    parser.add_argument('--targets', default='4,16,64', help="comma-separated target counts")
+    parser.add_argument('--calls', type=int, default=20000)
+    args = parser.parse_args(argv)
+    targets = [int(n) for n in args.targets.split(',')]
+
+    print(f"{'targets':>7} {'map us':>8} {'lookup us':>10} {'change us':>10} "
+          f"{'values us':>10} {'full us':>9}")
+    for row in run(args.currencies, targets, args.calls):
+        print(f"{row['targets']:>7} {row['map_us']:>8.1f} {row['lookup_us']:>10.2f} "
+              f"{row['count_change_us']:>10.2f} {row['values_us']:>10.2f} "
+              f"{row['full_recompute_us']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
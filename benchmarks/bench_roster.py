@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Roster benchmark: build, save/load and query times for a large roster.
+
+    python benchmarks/bench_roster.py --rows 50000
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_dates import make_roster
+from core.roster import Roster
+
+
+def _per_call(fn, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - start) / calls
+
+
+def run(rows=50000, calls=200, seed=5):
+    """Return a dict of timings; query times are per call"""
+    text = make_roster(rows)
+    start = time.perf_counter()
+    roster, _ = Roster.from_csv(io.StringIO(text))
+    build = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'roster.bin')
+        start = time.perf_counter()
+        roster.save(path)
+        save = time.perf_counter() - start
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        roster = Roster.load(path)
+        load = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    days = [date(2025, 1, 1) + timedelta(days=rng.randint(0, 364)) for _ in range(calls)]
+    births = [date(1950, 1, 1) + timedelta(days=rng.randint(0, 20000)) for _ in range(calls)]
+    returned = sum(len(roster.upcoming(day, 7)) for day in days) / calls
+    slots = []
+    return {
+        'rows': rows,
+        'file_bytes': size,
+        'from_csv_ms': build * 1000,
+        'save_ms': save * 1000,
+        'load_ms': load * 1000,
+        'upcoming_7_days_us': _per_call(lambda i: roster.upcoming(days[i], 7), calls) * 1e6,
+        'upcoming_rows': returned,
+        'turning_us': _per_call(lambda i: roster.turning(2025, days[i].month, 40), calls) * 1e6,
+        'aged_us': _per_call(lambda i: roster.aged(days[i], 30), calls) * 1e6,
+        'age_counts_us': _per_call(lambda i: roster.age_counts(days[i]), calls) * 1e6,
+        'insert_us': _per_call(
+            lambda i: slots.append(roster.add(f"New {i}", (births[i].year, births[i].month,
+                                                           births[i].day))), calls) * 1e6,
+        'delete_us': _per_call(lambda i: roster.remove(slots[i]), calls) * 1e6,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--calls', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    for name, value in run(args.rows, args.calls).items():
+        shown = f"{value:.4g}" if isinstance(value, float) else value
+        print(f"{name:<20} {shown}")
+
+
+if __name__ == "__main__":
+    main()
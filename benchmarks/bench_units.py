@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit conversion benchmark: per-conversion cost as the unit catalogue grows.
+
+    python benchmarks/bench_units.py --sizes 10,100,1000,10000
+
+Each catalogue is one dimension of N synthetic units, every unit defined
+against a random earlier one (so paths to the root get longer as N grows).
+The closure is built once; after that a conversion should cost the same
+for 10 units as for 10,000, because it is one memoized lookup.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from fractions import Fraction
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import units
+
+
+def make_graph(size, seed=3):
+    """A graph of `size` units in one dimension, each defined against an earlier one"""
+    rng = random.Random(seed)
+    graph = units.UnitGraph()
+    graph.add_unit('u0', 'unit 0', 'synthetic')
+    for n in range(1, size):
+        graph.add_unit(f'u{n}', f'unit {n}', 'synthetic')
+        graph.add_edge(f'u{n}', f'u{rng.randrange(n)}', Fraction(rng.randint(2, 1000), rng.randint(1, 999)))
+    return graph
+
+
+def run(sizes=(10, 100, 1000, 10000), calls=20000, column=100000, seed=3):
+    """Return one result row per catalogue size"""
+    rng = random.Random(seed)
+    values = [rng.uniform(-1000, 1000) for _ in range(column)]
+    results = []
+    for size in sizes:
+        graph = make_graph(size, seed)
+        pairs = [(f'u{rng.randrange(size)}', f'u{rng.randrange(size)}') for _ in range(calls)]
+
+        start = time.perf_counter()
+        graph.conversion('u0', 'u0')
+        closure = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for source, target in pairs:
+            graph.conversion(source, target)
+        cold = time.perf_counter() - start
+
+        convert = graph.convert
+        start = time.perf_counter()
+        for source, target in pairs:
+            convert(1.5, source, target)
+        warm = time.perf_counter() - start
+
+        source, target = pairs[0]
+        start = time.perf_counter()
+        graph.convert_column(values, source, target, use_numpy=False)
+        python_column = time.perf_counter() - start
+        row = {
+            'units': size,
+            'closure_ms': closure * 1000,
+            'first_pair_us': cold / calls * 1e6,
+            'convert_us': warm / calls * 1e6,
+            'column_python_per_s': column / python_column,
+        }
+        if units.numpy is not None:
+            start = time.perf_counter()
+            graph.convert_column(values, source, target, use_numpy=True)
+            row['column_numpy_per_s'] = column / (time.perf_counter() - start)
+        results.append(row)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10,100,1000,10000', help="comma-separated catalogue sizes")
+    parser.add_argument('--calls', type=int, default=20000)
+    parser.add_argument('--column', type=int, default=100000, help="values in the bulk column")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    print(f"{'units':>6} {'closure ms':>11} {'first pair us':>14} {'convert us':>11} "
+          f"{'column/s py':>12} {'column/s np':>12}")
+    for row in run(sizes, args.calls, args.column):
+        numpy_rate = row.get('column_numpy_per_s')
+        shown = f"{numpy_rate:.0f}" if numpy_rate else '-'
+        print(f"{row['units']:>6} {row['closure_ms']:>11.2f} {row['first_pair_us']:>14.2f} "
+              f"{row['convert_us']:>11.3f} {row['column_python_per_s']:>12.0f} {shown:>12}")
+
+
+if __name__ == "__main__":
+    main()
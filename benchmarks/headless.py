@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""
+Import before Kivy to run benchmarks without a display: the mock GL backend
+and SDL's dummy video driver, unless the environment already says otherwise
+(e.g. a real driver under xvfb-run).
+"""
+
+import os
+
+HEADLESS_ENV = {
+    'KIVY_GL_BACKEND': 'mock',
+    'SDL_VIDEODRIVER': 'dummy',
+    'KIVY_NO_ARGS': '1',
+    'KIVY_NO_CONSOLELOG': '1',
+    'KIVY_NO_FILELOG': '1',
+}
+
+for key, value in HEADLESS_ENV.items():
+    os.environ.setdefault(key, value)
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite: app build, every screen, the background tick and each tool.
+
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --baseline bench.json --tolerance 0.25
+
+Runs headless: unless already set, Kivy gets the mock GL backend and SDL's
+dummy video driver (or run it under xvfb-run with a real driver). UI
+benchmarks are skipped when Kivy is not installed; the core ones still run.
+
+Metric names say which way is better: *_ms / *_us are times (lower is
+better), *_per_s are rates (higher is better); anything else is context.
+With --baseline, any time or rate worse than the baseline by more than
+--tolerance is reported as a regression and the exit status is 1. A few
+metrics also have absolute TARGETS; going over one is reported the same way.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import headless  # noqa: F401  (sets the Kivy environment before any import)
+
+LOWER_IS_BETTER = ('_ms', '_us')
+HIGHER_IS_BETTER = ('_per_s',)
+DEFAULT_TOLERANCE = 0.25
+# benchmark -> {metric: upper limit}, whatever the baseline says
+TARGETS = {
+    # Change for any amount in a few milliseconds, the first query after a
+    # count change included
+    'change': {f'{case}_{metric}': 5.0
+               for case in ('egp_notes', 'egp_piastres', 'arbitrary')
+               for metric in ('first_ms', 'cold_p99_ms')},
+}
+
+
+class Skipped(Exception):
+    """A benchmark that cannot run here (e.g. Kivy missing)"""
+
+
+def _seconds(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _kivy_app():
+    """An ElbashaApp registered as the running app, without starting the loop"""
+    try:
+        from kivy.app import App
+    except ImportError:
+        raise Skipped("kivy is not installed")
+    from main import ElbashaApp
+    app = ElbashaApp()
+    app.prewarm_screens = False
+    # KivyMD widgets find theme_cls through the running app
+    App._running_app = app
+    return app
+
+
+def _dispose(screen):
+    worker = getattr(screen, 'worker', None)
+    if worker is not None:
+        worker.shutdown()
+
+
+# ==================== UI ====================
+def bench_app_build(repeat=3):
+    """ElbashaApp.build(): first call (imports included) and best repeat"""
+    times = []
+    for _ in range(repeat + 1):
+        app = _kivy_app()
+        times.append(_seconds(app.build))
+        app.background.stop()
+    return {'first_ms': times[0] * 1000, 'repeat_ms': min(times[1:]) * 1000}
+
+
+def bench_screens(repeat=3):
+    """Build cost of the home screen and every registered tool screen"""
+    _kivy_app()
+    import tools
+    from screens.home import HomeScreen
+
+    builders = [('home', lambda: HomeScreen(name='home'))]
+    builders += [(tool.screen, tool.build) for tool in tools.TOOLS]
+    results = {}
+    for name, build in builders:
+        times = []
+        for _ in range(repeat + 1):
+            start = time.perf_counter()
+            screen = build()
+            times.append(time.perf_counter() - start)
+            _dispose(screen)
+        results[f'{name}_first_ms'] = times[0] * 1000
+        results[f'{name}_ms'] = min(times[1:]) * 1000
+    return results
+
+
+def bench_background(steps=300):
+    """AnimatedBackground.animate_particles per frame at phone resolution"""
+    _kivy_app()
+    from widgets import AnimatedBackground
+
+    widget = AnimatedBackground(size=(1080, 1920))
+    widget.setup_background()
+    elapsed = _seconds(lambda: [widget.animate_particles(1 / 60) for _ in range(steps)])
+    return {'particles': widget.field.count, 'step_ms': elapsed / steps * 1000}
+
+
+def bench_money(edits=5000, seed=7):
+    """Rapid +/- edits on the money screen, flushed every few edits like frames
+
+    Runs on the classic 7-note profile and on the 15-row euro profile; the
+    row widgets are recycled, so the two should cost about the same.
+    """
+    _kivy_app()
+    import tools
+
+    screen = tools.get_tool('money').build()
+    results = {'edits': edits}
+    for code, prefix in (('EGP', ''), ('EUR', 'eur_')):
+        screen.select_currency(code)
+        rng = random.Random(seed)
+        denominations = list(screen.currency_data)
+        steps = [(rng.choice(denominations), rng.choice((1, 1, -1))) for _ in range(edits)]
+
+        def edit():
+            for i, (denomination, change) in enumerate(steps):
+                screen.update_count(denomination, change)
+                if i % 10 == 9:
+                    screen.flush_labels()
+
+        edit_time = _seconds(edit)
+        rounds = 100
+
+        def reload():
+            for _ in range(rounds):
+                screen.calculate_total()
+                screen.flush_labels()
+
+        results[prefix + 'rows'] = len(denominations)
+        results[prefix + 'edit_us'] = edit_time / edits * 1e6
+        results[prefix + 'calculate_total_ms'] = _seconds(reload) / rounds * 1000
+    return results
+
+
+def bench_age(calls=2000):
+    """AgeCalculatorScreen.calculate_age (fields to label) and core dates.age"""
+    _kivy_app()
+    import tools
+    from core import dates
+
+    screen = tools.get_tool('age').build()
+    screen.day_field.text, screen.month_field.text, screen.year_field.text = '29', '2', '2000'
+    screen_time = _seconds(lambda: [screen.calculate_age() for _ in range(calls)])
+    core_time = _seconds(lambda: [dates.age((2000, 2, 29), (2025, 2, 28)) for _ in range(calls)])
+    return {
+        'screen_calls_per_s': calls / screen_time,
+        'core_calls_per_s': calls / core_time,
+    }
+
+
+def bench_glyphs(changes=1000):
+    """Label text changes: MDLabel rasterizing against GlyphLabel quads"""
+    _kivy_app()
+    import bench_glyphs
+
+    return {row['case'] + '_' + key: value
+            for row in bench_glyphs.run(changes)
+            for key, value in row.items() if key.endswith('_us')}
+
+
+def bench_layout():
+    """GlassCard layout passes, vector outline against the 9-patch border"""
+    _kivy_app()
+    import bench_layout
+
+    return {row['border'] + '_pass_ms': row['pass_ms'] for row in bench_layout.run()}
+
+
+# ==================== CORE ====================
+def bench_calculator(count=5000):
+    """Expression evaluation throughput per mode, cold and with cached programs"""
+    import bench_expression
+
+    results = bench_expression.run(count)
+    for mode in ('float', 'decimal', 'fraction'):
+        results[f'{mode}_per_s'] = 1e6 / results[f'{mode}_cold_us']
+    return results
+
+
+def bench_change(queries=1000):
+    import bench_change
+
+    return {row['case'] + '_' + key: value
+            for row in bench_change.run(queries)
+            for key, value in row.items() if key not in ('case', 'queries')}
+
+
+def bench_bulk_ages(rows=20000):
+    import bench_dates
+
+    return {row['backend'] + '_rows_per_s': row['rows_per_second'] for row in bench_dates.run(rows)}
+
+
+def bench_batch(lines=5000):
+    import bench_batch
+
+    return {row['executor'] + '_per_s': row['per_second'] for row in bench_batch.run(lines)}
+
+
+def bench_roster(rows=20000):
+    import bench_roster
+
+    return bench_roster.run(rows)
+
+
+def bench_banknotes(images=10):
+    """Photo import: detection latency and accuracy on synthetic scenes"""
+    try:
+        import bench_banknotes
+    except ImportError:
+        raise Skipped("Pillow is not installed")
+
+    return {row['backend'] + '_' + key: value
+            for row in bench_banknotes.run(images)
+            for key, value in row.items() if key != 'backend'}
+
+
+def bench_rates(calls=5000):
+    """Offline valuation: one count change revalued in 4 and 16 currencies"""
+    import bench_rates
+
+    return {f"{key}_{row['targets']}": value
+            for row in bench_rates.run(targets=(4, 16), calls=calls)
+            for key, value in row.items() if key.endswith('_us')}
+
+
+def bench_units(calls=20000):
+    """Memoized conversion cost, which should not grow with the catalogue"""
+    import bench_units
+
+    return {f"{key}_{row['units']}": value
+            for row in bench_units.run((10, 1000), calls, column=50000)
+            for key, value in row.items() if key != 'units'}
+
+
+BENCHMARKS = {
+    'app_build': bench_app_build,
+    'screens': bench_screens,
+    'background': bench_background,
+    'layout': bench_layout,
+    'glyphs': bench_glyphs,
+    'money': bench_money,
+    'age': bench_age,
+    'calculator': bench_calculator,
+    'change': bench_change,
+    'bulk_ages': bench_bulk_ages,
+    'batch': bench_batch,
+    'roster': bench_roster,
+    'banknotes': bench_banknotes,
+    'units': bench_units,
+    'rates': bench_rates,
+}
+
+
+def run(names=None):
+    """Run the selected benchmarks; failures are recorded, not raised"""
+    results = {}
+    for name in names or BENCHMARKS:
+        try:
+            results[name] = BENCHMARKS[name]()
+        except Skipped as e:
+            results[name] = {'skipped': str(e)}
+        except Exception as e:
+            results[name] = {'error': f"{type(e).__name__}: {e}"}
+    return {
+        'recorded': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """(benchmark, metric, old, new, ratio) for every metric worse than allowed"""
+    regressions = []
+    for name, old_metrics in baseline.get('results', {}).items():
+        new_metrics = report['results'].get(name, {})
+        for metric, old in old_metrics.items():
+            new = new_metrics.get(metric)
+            if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or old <= 0:
+                continue
+            ratio = new / old
+            if metric.endswith(LOWER_IS_BETTER) and ratio > 1 + tolerance:
+                regressions.append((name, metric, old, new, ratio))
+            elif metric.endswith(HIGHER_IS_BETTER) and ratio < 1 / (1 + tolerance):
+                regressions.append((name, metric, old, new, ratio))
+    return regressions
+
+
+def over_targets(report, targets=TARGETS):
+    """(benchmark, metric, limit, value) for every metric above its TARGETS limit"""
+    over = []
+    for name, limits in targets.items():
+        metrics = report['results'].get(name, {})
+        for metric, limit in limits.items():
+            value = metrics.get(metric)
+            if isinstance(value, (int, float)) and value > limit:
+                over.append((name, metric, limit, value))
+    return over
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--only', help="comma-separated subset of: " + ", ".join(BENCHMARKS))
+    parser.add_argument('--output', help="write the JSON report here")
+    parser.add_argument('--baseline', help="JSON report to compare against")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown as a fraction (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(',') if args.only else None
+    unknown = set(names or ()) - set(BENCHMARKS)
+    if unknown:
+        parser.error("unknown benchmark: " + ", ".join(sorted(unknown)))
+
+    report = run(names)
+    for name, metrics in report['results'].items():
+        print(name)
+        for metric, value in metrics.items():
+            shown = f"{value:.4g}" if isinstance(value, float) else value
+            print(f"  {metric:<28} {shown}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+
+    status = 0
+    if any('error' in metrics for metrics in report['results'].values()):
+        status = 2
+    for name, metric, limit, value in over_targets(report):
+        print(f"OVER TARGET {name}.{metric}: {value:.4g} > {limit:.4g}", file=sys.stderr)
+        status = status or 1
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+        regressions = compare(report, baseline, args.tolerance)
+        for name, metric, old, new, ratio in regressions:
+            print(f"REGRESSION {name}.{metric}: {old:.4g} -> {new:.4g} ({ratio:.2f}x)", file=sys.stderr)
+        if regressions:
+            status = status or 1
+        else:
+            print(f"no regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
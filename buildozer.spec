@@ -4,6 +4,7 @@ package.name = elbashatools
 package.domain = com.elbasha
 source.dir = .
 source.include_exts = py,png,jpg,kv,atlas
+source.exclude_dirs = benchmarks
 version = 1.0
 
 requirements = python3,kivy==2.1.0,kivymd==1.1.1,pillow
@@ -0,0 +1,5 @@
+"""
+ELBASHA Multi Tools - computation core
+Pure-Python building blocks used by the screens. Nothing in this package
+imports Kivy, so it loads fast and runs on plain Linux boxes too.
+"""
@@ -0,0 +1,377 @@
+"""
+Banknote detection for the money counter's photo import.
+
+A photo of notes spread on a plain surface is decoded at reduced size (JPEG
+draft mode) and halved into a pyramid with Image.reduce, so a 12-megapixel
+photo costs about as much as a small one. Then:
+
+1. Segment: on the coarsest level, pixels that differ from the background
+   colour (sampled along the border) by more than the border's own noise
+   form a mask; connected components big enough to be a note are candidates,
+   and ones about k times the median size are split k ways (touching notes).
+2. Orient: each candidate's principal axis, from its pixel moments, gives
+   its angle and size. The note is cut from the smallest level where it is
+   still at least TEMPLATE_SIZE, turned upright and scaled in one affine
+   transform.
+3. Prefilter: the candidate's hue histogram is compared with every
+   denomination's, and only the SHORTLIST closest go on to matching.
+4. Match: normalized cross-correlation of the grey candidate, both ways up,
+   against the shortlisted templates. With NumPy this is one matrix product
+   for all candidates.
+
+References are one cropped image per denomination (from_folder reads
+'<value>.png' or '<value>.jpg'). Results are cached per file path, size and
+mtime. Notes that overlap heavily are still counted as one.
+"""
+
+from collections import OrderedDict
+import math
+import os
+
+try:
+    from PIL import Image, ImageChops, ImageFilter
+except ImportError:
+    Image = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+WORK_SIZE = 1024            # JPEG draft target for the longest side
+COARSE_SIZE = 160           # segmentation level: longest side at most twice this
+TEMPLATE_SIZE = (64, 32)    # matching resolution, long side first
+HUE_BINS = 16
+SHORTLIST = 3
+MIN_AREA = 0.004            # smallest note, as a share of the coarse image
+MIN_SCORE = 0.4             # best correlation below this is "not a note"
+MIN_THRESHOLD = 30          # floor for the summed background difference
+NOISE_MARGIN = 3            # threshold over the surface's own variation
+SATURATION_FLOOR = 40       # pixels below this count as grey in the histogram
+CACHE_SIZE = 16
+
+
+class Detection:
+    """One candidate: matched value (None if unrecognised), score and placement"""
+    __slots__ = ('value', 'score', 'center', 'size', 'angle')
+
+    def __init__(self, value, score, center, size, angle):
+        self.value = value
+        self.score = score
+        self.center = center        # (x, y) in decoded-image pixels
+        self.size = size            # (length, width) in decoded-image pixels
+        self.angle = angle          # radians, image coordinates (y down)
+
+
+class Template:
+    """Reference features of one denomination"""
+    __slots__ = ('value', 'histogram', 'vector')
+
+    def __init__(self, value, histogram, vector):
+        self.value = value
+        self.histogram = histogram
+        self.vector = vector
+
+
+# ==================== FEATURES ====================
+def _resample(name):
+    return getattr(getattr(Image, 'Resampling', Image), name)
+
+
+def hue_histogram(patch):
+    """HUE_BINS hue shares of saturated pixels plus one share for grey ones"""
+    hue, saturation, _ = patch.convert('HSV').split()
+    mask = saturation.point(lambda s: 255 if s >= SATURATION_FLOOR else 0)
+    counts = hue.histogram(mask)
+    step = 256 // HUE_BINS
+    bins = [sum(counts[i:i + step]) for i in range(0, 256, step)]
+    total = patch.size[0] * patch.size[1]
+    bins.append(total - sum(bins))
+    return [b / total for b in bins]
+
+
+def histogram_similarity(a, b):
+    """Histogram intersection, 1.0 for identical colour distributions"""
+    return sum(min(x, y) for x, y in zip(a, b))
+
+
+def grey_vector(patch):
+    """Zero-mean, unit-length grey pixels of a TEMPLATE_SIZE patch"""
+    pixels = list(patch.convert('L').tobytes())
+    mean = sum(pixels) / len(pixels)
+    centred = [p - mean for p in pixels]
+    norm = math.sqrt(sum(c * c for c in centred)) or 1.0
+    return [c / norm for c in centred]
+
+
+def _correlation(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+def reference_template(value, image):
+    """Template from a cropped, roughly upright picture of one note"""
+    image = image.convert('RGB')
+    if image.size[1] > image.size[0]:
+        image = image.transpose(getattr(getattr(Image, 'Transpose', Image), 'ROTATE_90'))
+    patch = image.resize(TEMPLATE_SIZE, _resample('BOX'))
+    return Template(value, hue_histogram(patch), grey_vector(patch))
+
+
+# ==================== SEGMENTATION ====================
+def decode(source):
+    """RGB image from a path, file object or Image, JPEGs decoded at reduced size"""
+    if Image is not None and isinstance(source, Image.Image):
+        return _rgb(source)
+    # convert() loads the pixels, so the file can be closed right after
+    with Image.open(source) as image:
+        return _rgb(image)
+
+
+def _rgb(image):
+    if image.format == 'JPEG':
+        image.draft('RGB', (WORK_SIZE, WORK_SIZE))
+    return image.convert('RGB')
+
+
+def pyramid(image, smallest=COARSE_SIZE):
+    """[image, image/2, image/4, ...] until the longest side is below 2 * smallest"""
+    levels = [image]
+    while max(levels[-1].size) >= 2 * smallest:
+        levels.append(levels[-1].reduce(2))
+    return levels
+
+
+def _border(image):
+    """Pixels along the four edges, assumed to be background"""
+    w, h = image.size
+    pixels = []
+    for box in ((0, 0, w, 1), (0, h - 1, w, h), (0, 0, 1, h), (w - 1, 0, w, h)):
+        pixels.extend(image.crop(box).getdata())
+    return pixels
+
+
+def foreground_mask(image):
+    """'L' mask of pixels unlike the background, opened and closed to drop specks
+
+    The difference is summed over the channels, so dark notes on a dark
+    surface still stand out. The threshold sits NOISE_MARGIN times above the
+    border's own 95th-percentile difference, to adapt to the surface texture.
+    """
+    border = _border(image)
+    background = tuple(sorted(p[c] for p in border)[len(border) // 2] for c in range(3))
+    r, g, b = ImageChops.difference(image, Image.new('RGB', image.size, background)).split()
+    difference = ImageChops.add(ImageChops.add(r, g), b)
+    noise = sorted(_border(difference))[len(border) * 95 // 100]
+    threshold = max(MIN_THRESHOLD, noise * NOISE_MARGIN)
+    mask = difference.point(lambda v: 255 if v > threshold else 0)
+    mask = mask.filter(ImageFilter.MinFilter(3)).filter(ImageFilter.MaxFilter(3))
+    return mask.filter(ImageFilter.MaxFilter(5)).filter(ImageFilter.MinFilter(5))
+
+
+def components(mask, min_area):
+    """Pixel-index lists of the 4-connected regions of at least `min_area` pixels"""
+    w, h = mask.size
+    todo = bytearray(mask.tobytes())
+    found = []
+    for start in range(w * h):
+        if not todo[start]:
+            continue
+        todo[start] = 0
+        stack = [start]
+        region = []
+        while stack:
+            i = stack.pop()
+            region.append(i)
+            x = i % w
+            if x > 0 and todo[i - 1]:
+                todo[i - 1] = 0
+                stack.append(i - 1)
+            if x < w - 1 and todo[i + 1]:
+                todo[i + 1] = 0
+                stack.append(i + 1)
+            if i >= w and todo[i - w]:
+                todo[i - w] = 0
+                stack.append(i - w)
+            if i < w * (h - 1) and todo[i + w]:
+                todo[i + w] = 0
+                stack.append(i + w)
+        if len(region) >= min_area:
+            found.append(region)
+    return found
+
+
+def split_touching(regions, width, iterations=8):
+    """Split regions much larger than the median into that many notes (k-means on position)"""
+    if len(regions) < 2:
+        return regions
+    median = sorted(len(r) for r in regions)[len(regions) // 2]
+    result = []
+    for region in regions:
+        parts = round(len(region) / median)
+        if parts < 2:
+            result.append(region)
+            continue
+        points = [(i % width, i // width) for i in region]
+        # Seed the centres along the region's long axis
+        cx, cy, length, _, angle = oriented_box(region, width)
+        step = length / parts
+        centres = [(cx + (k - (parts - 1) / 2) * step * math.cos(angle),
+                    cy + (k - (parts - 1) / 2) * step * math.sin(angle)) for k in range(parts)]
+        for _ in range(iterations):
+            groups = [[] for _ in centres]
+            for index, (x, y) in zip(region, points):
+                nearest = min(range(parts), key=lambda k: (x - centres[k][0]) ** 2 + (y - centres[k][1]) ** 2)
+                groups[nearest].append(index)
+            centres = [(sum(i % width for i in g) / len(g), sum(i // width for i in g) / len(g))
+                       if g else c for g, c in zip(groups, centres)]
+        result.extend(g for g in groups if g)
+    return result
+
+
+def oriented_box(region, width):
+    """(cx, cy, length, breadth, angle) of the rectangle with the region's moments"""
+    n = len(region)
+    xs = [i % width for i in region]
+    ys = [i // width for i in region]
+    cx = sum(xs) / n
+    cy = sum(ys) / n
+    mxx = sum((x - cx) ** 2 for x in xs) / n
+    myy = sum((y - cy) ** 2 for y in ys) / n
+    mxy = sum((x - cx) * (y - cy) for x, y in zip(xs, ys)) / n
+    angle = 0.5 * math.atan2(2 * mxy, mxx - myy)
+    spread = math.hypot((mxx - myy) / 2, mxy)
+    # A uniform rectangle of side L has variance L**2 / 12 along that side
+    length = math.sqrt(12 * ((mxx + myy) / 2 + spread))
+    breadth = math.sqrt(12 * max((mxx + myy) / 2 - spread, 0))
+    return cx + 0.5, cy + 0.5, length, breadth, angle
+
+
+def cut_out(image, cx, cy, length, breadth, angle):
+    """The rotated box, upright and scaled to TEMPLATE_SIZE, in one affine transform"""
+    tw, th = TEMPLATE_SIZE
+    cos, sin = math.cos(angle), math.sin(angle)
+    a, b = length / tw * cos, -breadth / th * sin
+    d, e = length / tw * sin, breadth / th * cos
+    c = cx - a * tw / 2 - b * th / 2
+    f = cy - d * tw / 2 - e * th / 2
+    return image.transform(TEMPLATE_SIZE, getattr(getattr(Image, 'Transform', Image), 'AFFINE'),
+                           (a, b, c, d, e, f), _resample('BILINEAR'))
+
+
+# ==================== DETECTOR ====================
+class Detector:
+    """Finds and classifies notes in photos against per-denomination templates"""
+
+    def __init__(self, templates=(), use_numpy=None, cache_size=CACHE_SIZE):
+        if Image is None:
+            raise RuntimeError("Pillow is not installed")
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        elif use_numpy and numpy is None:
+            raise RuntimeError("NumPy is not installed")
+        self.use_numpy = use_numpy
+        self.templates = []
+        self._matrix = None
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        for template in templates:
+            self.add(template)
+
+    @classmethod
+    def from_folder(cls, folder, **kwargs):
+        """Templates from '<value>.png' / '<value>.jpg' files; values are ints"""
+        templates = []
+        for name in sorted(os.listdir(folder)):
+            stem, ext = os.path.splitext(name)
+            if ext.lower() in ('.png', '.jpg', '.jpeg') and stem.isdigit():
+                with Image.open(os.path.join(folder, name)) as image:
+                    templates.append(reference_template(int(stem), image))
+        return cls(templates, **kwargs)
+
+    @property
+    def values(self):
+        return [t.value for t in self.templates]
+
+    def add(self, template):
+        self.templates.append(template)
+        self._matrix = None
+        self._cache.clear()
+
+    def count(self, source):
+        """{value: notes} for a photo (unrecognised candidates are left out)"""
+        counts = {}
+        for detection in self.detect(source):
+            if detection.value is not None:
+                counts[detection.value] = counts.get(detection.value, 0) + 1
+        return counts
+
+    def detect(self, source):
+        """Detections in a photo; repeat calls for an unchanged file are cached"""
+        key = None
+        if isinstance(source, str):
+            stat = os.stat(source)
+            key = (os.path.abspath(source), stat.st_size, stat.st_mtime_ns)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        detections = self._detect(decode(source))
+        if key is not None:
+            self._cache[key] = detections
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return detections
+
+    def _detect(self, image):
+        levels = pyramid(image)
+        coarse = levels[-1]
+        scale = image.size[0] / coarse.size[0]
+        min_area = MIN_AREA * coarse.size[0] * coarse.size[1]
+        candidates = []
+        for region in split_touching(components(foreground_mask(coarse), min_area), coarse.size[0]):
+            cx, cy, length, breadth, angle = oriented_box(region, coarse.size[0])
+            if breadth < 1:
+                continue
+            # Smallest level where the note still covers the template
+            level = len(levels) - 1
+            while level > 0 and length * scale / 2 ** level < TEMPLATE_SIZE[0]:
+                level -= 1
+            k = scale / 2 ** level
+            patch = cut_out(levels[level], cx * k, cy * k, length * k, breadth * k, angle)
+            candidates.append((patch, (cx * scale, cy * scale), (length * scale, breadth * scale), angle))
+        if not candidates or not self.templates:
+            return [Detection(None, 0.0, center, size, angle) for _, center, size, angle in candidates]
+
+        histograms = [hue_histogram(patch) for patch, _, _, _ in candidates]
+        vectors = [grey_vector(patch) for patch, _, _, _ in candidates]
+        shortlists = []
+        for histogram in histograms:
+            ranked = sorted(range(len(self.templates)), reverse=True,
+                            key=lambda t: histogram_similarity(histogram, self.templates[t].histogram))
+            shortlists.append(ranked[:SHORTLIST])
+        scores = self._scores(vectors, shortlists)
+
+        detections = []
+        for (_, center, size, angle), shortlist, row in zip(candidates, shortlists, scores):
+            best = max(shortlist, key=lambda t: row[t])
+            if row[best] >= MIN_SCORE:
+                detections.append(Detection(self.templates[best].value, row[best], center, size, angle))
+            else:
+                detections.append(Detection(None, row[best], center, size, angle))
+        return detections
+
+    def _scores(self, vectors, shortlists):
+        """Per candidate, {template index: correlation} over its shortlist, either way up"""
+        if self.use_numpy:
+            if self._matrix is None:
+                self._matrix = numpy.array([t.vector for t in self.templates])
+            upright = numpy.array(vectors)
+            # Turning a patch by 180 degrees reverses its flattened pixels
+            both = numpy.maximum(upright @ self._matrix.T, upright[:, ::-1] @ self._matrix.T)
+            return [{t: float(both[i, t]) for t in shortlist} for i, shortlist in enumerate(shortlists)]
+        scores = []
+        for vector, shortlist in zip(vectors, shortlists):
+            flipped = vector[::-1]
+            scores.append({t: max(_correlation(vector, self.templates[t].vector),
+                                  _correlation(flipped, self.templates[t].vector))
+                           for t in shortlist})
+        return scores
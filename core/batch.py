@@ -0,0 +1,151 @@
+"""
+Batch tape: evaluate a file of expressions, one per line, across workers.
+
+Lines are read lazily and sent to a ProcessPoolExecutor in chunks of
+CHUNK_LINES. Each expression gets its own Budget, so a slow one times out
+without holding up the rest of its chunk. Results are written in input
+order, one output line per input line (blank lines stay blank, failures
+read 'error: ...'), as soon as every earlier chunk is done. At most a few
+chunks per worker are in flight, so memory stays flat for any file size.
+
+Android builds of Python have no multiprocessing semaphores, so there (or
+with kind='thread') a thread pool runs the chunks instead; the evaluator's
+budget checks release the GIL regularly, so threads still overlap.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+from decimal import DecimalException
+import multiprocessing
+import os
+import sys
+import time
+
+from core.expression import Budget, MAX_RESULT_BITS, evaluate, format_result
+
+CHUNK_LINES = 256
+EXPRESSION_TIMEOUT = 2.0    # seconds per expression
+IN_FLIGHT_PER_WORKER = 2
+
+
+class BatchReport:
+    """Counts and timing of one batch run"""
+    __slots__ = ('lines', 'expressions', 'errors', 'seconds', 'workers', 'kind')
+
+    def __init__(self, workers, kind):
+        self.lines = 0
+        self.expressions = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.workers = workers
+        self.kind = kind
+
+    @property
+    def per_second(self):
+        return self.expressions / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.expressions} expressions, {self.errors} errors in {self.seconds:.2f}s "
+                f"({self.per_second:.0f}/s, {self.workers} {self.kind} workers)")
+
+
+def evaluate_chunk(lines, mode, timeout, max_bits=MAX_RESULT_BITS):
+    """Output lines for a chunk of input lines; runs in the worker"""
+    results = []
+    for line in lines:
+        text = line.strip()
+        if not text:
+            results.append('')
+            continue
+        try:
+            results.append(format_result(evaluate(text, mode, Budget(max_bits, timeout))))
+        except (ArithmeticError, DecimalException, TypeError, ValueError) as e:
+            # One bad line must not cost the rest of the tape
+            results.append(f"error: {str(e) or type(e).__name__}")
+    return results
+
+
+def processes_available():
+    """False where multiprocessing has no semaphores (Android, some sandboxes)"""
+    if sys.platform == 'android' or 'ANDROID_ARGUMENT' in os.environ:
+        return False
+    try:
+        import multiprocessing.synchronize  # noqa: F401  (needs sem_open)
+    except ImportError:
+        return False
+    return True
+
+
+def make_executor(workers=None, kind=None):
+    """(executor, kind, workers): a process pool when possible, else threads"""
+    workers = workers or os.cpu_count() or 1
+    if kind is None:
+        kind = 'process' if processes_available() else 'thread'
+    if kind == 'process':
+        # Spawned, not forked: the app (and the state writer) run other threads
+        context = multiprocessing.get_context('spawn')
+        return ProcessPoolExecutor(max_workers=workers, mp_context=context), kind, workers
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch'), 'thread', workers
+
+
+def _chunks(lines, size):
+    chunk = []
+    for line in lines:
+        chunk.append(line.rstrip('\r\n'))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(src, dst, mode='float', workers=None, kind=None, chunk_lines=CHUNK_LINES,
+              timeout=EXPRESSION_TIMEOUT, progress=None, cancelled=None):
+    """Evaluate every line of `src` into `dst` in order; returns a BatchReport.
+
+    `progress(report)` is called after each chunk is written, and a truthy
+    `cancelled()` stops the run after the current chunk.
+    """
+    executor, kind, workers = make_executor(workers, kind)
+    report = BatchReport(workers, kind)
+    pending = deque()
+    # A chunk that runs far past its expressions' own timeouts is abandoned
+    chunk_timeout = timeout * chunk_lines + 30
+    start = time.perf_counter()
+
+    def write_oldest():
+        chunk, future = pending.popleft()
+        try:
+            results = future.result(chunk_timeout)
+        except TimeoutError:
+            future.cancel()
+            results = ['error: timed out' if line.strip() else '' for line in chunk]
+        except Exception as e:
+            # A worker died (BrokenProcessPool, MemoryError); the chunks
+            # already written stay, and later ones are still tried
+            results = [f"error: {str(e) or type(e).__name__}" if line.strip() else '' for line in chunk]
+        for result in results:
+            dst.write(result + '\n')
+            report.lines += 1
+            if result:
+                report.expressions += 1
+                report.errors += result.startswith('error: ')
+        report.seconds = time.perf_counter() - start
+        if progress is not None:
+            progress(report)
+
+    try:
+        for chunk in _chunks(src, chunk_lines):
+            if cancelled is not None and cancelled():
+                break
+            pending.append((chunk, executor.submit(evaluate_chunk, chunk, mode, timeout)))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                write_oldest()
+        while pending:
+            write_oldest()
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=not pending)
+    report.seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,220 @@
+"""
+Change-making: the minimum-note breakdown of an amount from counted stock.
+
+The solver walks denominations from largest to smallest and, at each level,
+only tries a short window of counts for the current note:
+
+* if fewer than `stock - M` of the current note D are used, no smaller note
+  d can appear D/gcd(d, D) or more times (swapping those for d/gcd(d, D)
+  notes of D would use fewer notes), which bounds the smaller notes' total
+  and so gives a lower limit on the count of D;
+* otherwise the count is one of the top M values, M = max d/gcd(d, D).
+
+Within that window counts are tried greedily (largest first) and results
+are memoized per (level, amount). The branch-and-bound cut bounds the rest
+by paying it with the largest smaller notes as far as their stock goes;
+that bound only grows as the count drops, so the first cut ends the level.
+Once the remaining notes can pay at most TABLE_LIMIT between them, a
+bounded-coin DP table over those notes answers directly. The table is built
+on the first query for each stock vector, so it is kept small enough that
+the first query after a count change stays within a few milliseconds. The
+result is exact for any denomination set and any stock, including coins
+expressed in piastres, and takes a few dozen steps for typical currencies.
+"""
+
+from collections import deque
+from functools import lru_cache
+from math import gcd
+
+UNLIMITED = None
+MEMO_LIMIT = 200000     # memo entries kept per solver
+TABLE_LIMIT = 1 << 12   # largest amount covered by the small-note DP table
+
+
+class ChangeSolver:
+    """Minimum-note breakdowns for one denomination set and stock vector"""
+
+    def __init__(self, denominations, stock=None):
+        if stock is None:
+            stock = [UNLIMITED] * len(denominations)
+        pairs = sorted(zip(denominations, stock), reverse=True)
+        if any(d <= 0 for d, _ in pairs):
+            raise ValueError("denominations must be positive")
+        self.denominations = tuple(d for d, _ in pairs)
+        self.stock = tuple(s for _, s in pairs)
+        self._gcd = 0
+        for d in self.denominations:
+            self._gcd = gcd(self._gcd, d)
+
+        # Per level: (bound on what smaller notes can add, top-window size)
+        self._windows = []
+        for i, big in enumerate(self.denominations):
+            bound, top = 0, 1
+            for d, s in zip(self.denominations[i + 1:], self.stock[i + 1:]):
+                g = gcd(d, big)
+                most = big // g - 1
+                if s is not UNLIMITED:
+                    most = min(most, s)
+                bound += d * most
+                top = max(top, d // g)
+            self._windows.append((bound, top))
+
+        # Most that the notes from each level down can pay (None = no limit)
+        self._capacity = [0] * (len(self.denominations) + 1)
+        for i in range(len(self.denominations) - 1, -1, -1):
+            below = self._capacity[i + 1]
+            s = self.stock[i]
+            if below is UNLIMITED or s is UNLIMITED:
+                self._capacity[i] = UNLIMITED
+            else:
+                self._capacity[i] = below + self.denominations[i] * s
+        self._memo = {}
+
+        # First level whose notes (with the ones below) fit in the DP table
+        self._table_level = len(self.denominations)
+        for i in range(len(self.denominations) - 1, -1, -1):
+            capacity = self._capacity[i]
+            if capacity is UNLIMITED or capacity > TABLE_LIMIT:
+                break
+            self._table_level = i
+        self._table = None
+
+    def _build_table(self):
+        """notes[level][a] and counts[level][a] for every level in the table
+
+        Bounded coin change per level: for each residue class of the note,
+        a sliding-window minimum over the last `stock + 1` entries.
+        """
+        size = len(self.denominations)
+        missing = size + 1 + sum(self.stock[self._table_level:])
+        below = [0]
+        table = {}
+        for level in range(size - 1, self._table_level - 1, -1):
+            big = self.denominations[level]
+            stock = self.stock[level]
+            length = self._capacity[level] + 1
+            below = below + [missing] * (length - len(below))
+            notes = [missing] * length
+            counts = [0] * length
+            for residue in range(min(big, length)):
+                window = deque()
+                for j, a in enumerate(range(residue, length, big)):
+                    value = below[a] - j
+                    while window and window[-1][1] >= value:
+                        window.pop()
+                    window.append((j, value))
+                    while window[0][0] < j - stock:
+                        window.popleft()
+                    i, best = window[0]
+                    if best + j < missing:
+                        notes[a] = best + j
+                        counts[a] = j - i
+            table[level] = (notes, counts, missing)
+            below = notes
+        return table
+
+    def _lookup(self, level, amount):
+        """Answer from the DP table for a level at or past `_table_level`"""
+        if self._table is None:
+            self._table = self._build_table()
+        notes, _, missing = self._table[level]
+        if amount >= len(notes) or notes[amount] >= missing:
+            return None
+        total = notes[amount]
+        found = []
+        for step in range(level, len(self.denominations)):
+            count = self._table[step][1][amount]
+            found.append(count)
+            amount -= count * self.denominations[step]
+        return (total, tuple(found))
+
+    def solve(self, amount):
+        """Return {denomination: count} using the fewest notes, or None"""
+        if amount < 0:
+            raise ValueError("amount cannot be negative")
+        if amount == 0:
+            return {}
+        if not self.denominations or amount % self._gcd:
+            return None
+        if len(self._memo) > MEMO_LIMIT:
+            self._memo.clear()
+        found = self._best(0, amount)
+        if found is None:
+            return None
+        return {d: n for d, n in zip(self.denominations, found[1]) if n}
+
+    def _fewest(self, level, amount):
+        """Lower bound on the notes from `level` on that pay `amount`:
+        the largest notes first, as far as their stock goes"""
+        notes = 0
+        for d, s in zip(self.denominations[level:], self.stock[level:]):
+            if s is UNLIMITED or d * s >= amount:
+                return notes + -(-amount // d)
+            notes += s
+            amount -= d * s
+        return notes + 1     # cannot be paid at all; capacity checks catch it
+
+    def _best(self, level, amount):
+        """(notes, counts from `level` on) for `amount`, or None"""
+        if level >= self._table_level:
+            return self._lookup(level, amount)
+        key = (level, amount)
+        if key in self._memo:
+            return self._memo[key]
+
+        denominations = self.denominations
+        big = denominations[level]
+        stock = self.stock[level]
+        most = amount // big
+        if stock is not UNLIMITED:
+            most = min(most, stock)
+
+        capacity = self._capacity[level]
+        if capacity is not UNLIMITED and amount > capacity:
+            self._memo[key] = None
+            return None
+
+        if level == len(denominations) - 1:
+            result = None
+            if amount % big == 0 and amount // big <= most:
+                result = (most, (most,))
+            self._memo[key] = result
+            return result
+
+        bound, top = self._windows[level]
+        low = -(-(amount - bound) // big)
+        if stock is not UNLIMITED:
+            low = min(low, stock - top + 1)
+        # Smaller notes must be able to cover whatever is left
+        below = self._capacity[level + 1]
+        if below is not UNLIMITED:
+            low = max(low, -(-(amount - below) // big))
+        low = max(low, 0)
+
+        best = None
+        for count in range(most, low - 1, -1):
+            rest = amount - count * big
+            # Even the fewest notes that could pay the rest cannot beat what
+            # we have, and fewer of this note only makes that bound larger
+            if best is not None and count + self._fewest(level + 1, rest) >= best[0]:
+                break
+            if rest == 0:
+                found = (0, (0,) * (len(denominations) - level - 1))
+            else:
+                found = self._best(level + 1, rest)
+            if found is not None and (best is None or count + found[0] < best[0]):
+                best = (count + found[0], (count,) + found[1])
+
+        self._memo[key] = best
+        return best
+
+
+@lru_cache(maxsize=64)
+def solver_for(denominations, stock=None):
+    """Shared solver per (denominations, stock) tuple; repeat queries hit its memo"""
+    return ChangeSolver(denominations, stock)
+
+
+def make_change(amount, denominations, stock=None):
+    """Minimum-note breakdown of `amount`, or None if it cannot be paid"""
+    return solver_for(tuple(denominations), None if stock is None else tuple(stock)).solve(amount)
@@ -0,0 +1,279 @@
+"""
+Command-line front end for the computation core, for batch and server use.
+
+    python -m core calc "2**10 + 5!"         (or one expression per stdin line)
+    python -m core total 200=3 50=1 1=7
+    python -m core age 2000-02-29 --today 2025-02-28
+    python -m core ages roster.csv -o ages.csv
+    python -m core change 385 --stock 200=1,100=2,50=3,20=5,10=4,5=9,1=20
+    python -m core batch sheet.txt -o results.txt --mode decimal
+    python -m core convert mi km 1 26.2          (or one value per stdin line)
+    python -m core rates rates.csv -o rates.bin --pivot USD --as-of 2026-10-01
+    python -m core value rates.bin EGP=12345 USD=20.50 --in USD,EUR,SAR
+
+Each subcommand imports only the core module it needs. Bad input (a
+malformed number or date, a missing or corrupt file) is reported as
+'error: ...' on stderr with exit status 1, never as a traceback.
+"""
+
+import argparse
+import sys
+
+
+def _pairs(items):
+    """['200=3', '50=1'] or '200=3,50=1' -> {200: 3, 50: 1}"""
+    if isinstance(items, str):
+        items = [items]
+    counts = {}
+    for item in items:
+        for part in item.split(','):
+            if not part:
+                continue
+            denomination, _, count = part.partition('=')
+            try:
+                counts[int(denomination)] = int(count or 0)
+            except ValueError:
+                raise ValueError(f"bad pair {part!r}, expected DENOMINATION=COUNT") from None
+    return counts
+
+
+def _date(text):
+    """(y, m, d) from 'YYYY-MM-DD', or None for no text"""
+    from core.dates import parse_iso
+
+    if not text:
+        return None
+    try:
+        return parse_iso(text)
+    except ValueError:
+        raise ValueError(f"bad date {text!r}, expected YYYY-MM-DD") from None
+
+
+def cmd_calc(args):
+    from core.expression import ExpressionError, evaluate, format_result
+
+    lines = args.expression or (line.strip() for line in sys.stdin)
+    failed = 0
+    for text in lines:
+        if not text:
+            continue
+        try:
+            print(format_result(evaluate(text, args.mode)))
+        except ExpressionError as e:
+            print(f"error: {e}", file=sys.stderr)
+            failed += 1
+    return 1 if failed else 0
+
+
+def cmd_total(args):
+    from core.sessions import DENOMINATIONS, Tally, format_amount
+
+    counts = _pairs(args.counts)
+    denominations = sorted(set(DENOMINATIONS) | set(counts), reverse=True)
+    tally = Tally(denominations)
+    for denomination, count in counts.items():
+        if count < 0:
+            raise ValueError("counts cannot be negative")
+        tally.add(denominations.index(denomination), count)
+    for denomination in denominations:
+        if tally.count(denomination):
+            print(f"{denomination:>6} x {tally.count(denomination):<6} "
+                  f"{format_amount(tally.subtotal(denomination)):>12}")
+    print(f"{'total':>17} {format_amount(tally.total):>12} EGP")
+    return 0
+
+
+def cmd_age(args):
+    from core import dates
+
+    today = _date(args.today)
+    birth = _date(args.birth_date)
+    years, months, days = dates.age(birth, today)
+    print(f"{years} years, {months} months, {days} days "
+          f"({dates.total_days(birth, today)} days)")
+    return 0
+
+
+def cmd_ages(args):
+    from core import dates
+
+    today = _date(args.today)
+    src = open(args.input, newline='', encoding='utf-8') if args.input != '-' else sys.stdin
+    dst = open(args.output, 'w', newline='', encoding='utf-8') if args.output != '-' else sys.stdout
+    try:
+        rows = dates.bulk_ages(src, dst, column=args.column, today=today)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    print(f"{rows} rows", file=sys.stderr)
+    return 0
+
+
+def cmd_change(args):
+    from core.change import make_change
+    from core.sessions import DENOMINATIONS
+
+    stock = _pairs(args.stock) if args.stock else None
+    denominations = sorted(stock) if stock else list(DENOMINATIONS)
+    counts = [stock[d] for d in denominations] if stock else None
+    breakdown = make_change(args.amount, denominations, counts)
+    if breakdown is None:
+        print("no breakdown possible", file=sys.stderr)
+        return 1
+    for denomination, count in breakdown.items():
+        print(f"{denomination:>6} x {count}")
+    print(f"{sum(breakdown.values())} notes")
+    return 0
+
+
+def cmd_batch(args):
+    from core.batch import run_batch
+
+    src = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    dst = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        report = run_batch(src, dst, args.mode, workers=args.workers,
+                           kind='thread' if args.threads else None,
+                           chunk_lines=args.chunk, timeout=args.timeout)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    print(report, file=sys.stderr)
+    return 1 if report.errors else 0
+
+
+def cmd_convert(args):
+    from core.units import UnitError, default_graph, format_value, parse_value
+
+    graph = default_graph()
+    try:
+        conversion = graph.conversion(args.source, args.target)
+    except UnitError as e:
+        print(f"error: {e.args[0]}", file=sys.stderr)
+        return 1
+    values = args.value or (line.strip() for line in sys.stdin)
+    status = 0
+    for text in values:
+        if not text:
+            continue
+        try:
+            value = parse_value(text)
+        except ValueError as e:
+            print(f"error: {text}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        print(format_value(conversion(value)))
+    return status
+
+
+def cmd_rates(args):
+    from datetime import date
+    from core.rates import read_csv, write_table
+
+    src = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+    try:
+        rates, digits = read_csv(src)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+    as_of = date.fromisoformat(args.as_of) if args.as_of else date.today()
+    count = write_table(args.output, rates, args.pivot, as_of, digits)
+    print(f"{count} rates against {args.pivot}", file=sys.stderr)
+    return 0
+
+
+def cmd_value(args):
+    from core import currencies
+    from core.rates import RateTable, Valuation
+
+    with RateTable(args.table) as table:
+        targets = args.targets.split(',') if args.targets else list(table)
+        valuation = Valuation(table, targets)
+        for item in args.amounts:
+            code, _, amount = item.partition('=')
+            code = code.upper()
+            if code in currencies.CURRENCIES:
+                minor = currencies.get(code).to_minor(amount)
+            else:
+                minor = int(amount)     # held in major units
+            valuation.add(code, minor)
+        if valuation.missing:
+            print(f"no rate for {', '.join(sorted(valuation.missing))}", file=sys.stderr)
+            return 1
+        for text in valuation.formatted():
+            print(text)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m core', description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    calc = commands.add_parser('calc', help="evaluate expressions")
+    calc.add_argument('expression', nargs='*', help="expressions (default: one per stdin line)")
+    calc.add_argument('--mode', default='float', choices=('float', 'decimal', 'fraction'))
+    calc.set_defaults(func=cmd_calc)
+
+    total = commands.add_parser('total', help="total a note count")
+    total.add_argument('counts', nargs='+', help="DENOMINATION=COUNT pairs")
+    total.set_defaults(func=cmd_total)
+
+    age = commands.add_parser('age', help="age from a birth date")
+    age.add_argument('birth_date', help="YYYY-MM-DD")
+    age.add_argument('--today', help="end date, YYYY-MM-DD (default: today)")
+    age.set_defaults(func=cmd_age)
+
+    ages = commands.add_parser('ages', help="ages for a CSV roster")
+    ages.add_argument('input', help="CSV file, or - for stdin")
+    ages.add_argument('-o', '--output', default='-', help="CSV file (default: stdout)")
+    ages.add_argument('--column', default='birth_date')
+    ages.add_argument('--today', help="end date, YYYY-MM-DD (default: today)")
+    ages.set_defaults(func=cmd_ages)
+
+    change = commands.add_parser('change', help="fewest-note breakdown of an amount")
+    change.add_argument('amount', type=int)
+    change.add_argument('--stock', help="DENOMINATION=COUNT,... (default: unlimited pound notes)")
+    change.set_defaults(func=cmd_change)
+
+    batch = commands.add_parser('batch', help="evaluate a file of expressions in parallel")
+    batch.add_argument('input', help="one expression per line, or - for stdin")
+    batch.add_argument('-o', '--output', default='-', help="results, one per line (default: stdout)")
+    batch.add_argument('--mode', default='float', choices=('float', 'decimal', 'fraction'))
+    batch.add_argument('--workers', type=int, help="default: one per CPU")
+    batch.add_argument('--chunk', type=int, default=256, help="lines per work item")
+    batch.add_argument('--timeout', type=float, default=2.0, help="seconds per expression")
+    batch.add_argument('--threads', action='store_true', help="use threads instead of processes")
+    batch.set_defaults(func=cmd_batch)
+
+    convert = commands.add_parser('convert', help="convert values between units")
+    convert.add_argument('source', help="unit symbol, e.g. mi, °F, GiB")
+    convert.add_argument('target')
+    convert.add_argument('value', nargs='*', help="values (default: one per stdin line)")
+    convert.set_defaults(func=cmd_convert)
+
+    rates = commands.add_parser('rates', help="build a binary rate table from a CSV")
+    rates.add_argument('input', help="CSV of code,rate[,digits]; rate = pivot per unit (- for stdin)")
+    rates.add_argument('-o', '--output', default='rates.bin')
+    rates.add_argument('--pivot', default='USD')
+    rates.add_argument('--as-of', help="YYYY-MM-DD (default: today)")
+    rates.set_defaults(func=cmd_rates)
+
+    value = commands.add_parser('value', help="value cash in several currencies at once")
+    value.add_argument('table', help="rate table written by 'rates'")
+    value.add_argument('amounts', nargs='+', help="CODE=AMOUNT pairs, e.g. EGP=12345 USD=20.50")
+    value.add_argument('--in', dest='targets', help="CODE,... (default: every currency in the table)")
+    value.set_defaults(func=cmd_value)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
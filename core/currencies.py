@@ -0,0 +1,101 @@
+"""
+Currency profiles for the money counter.
+
+A profile lists its denominations largest first, as integers in the
+currency's minor unit (piastres, cents, ...), so coins and notes share one
+integer Tally and totals stay exact. Where a note and a coin have the same
+value they share a row. The classic 'EGP' profile counts whole-pound notes
+(minor unit 1), matching the original seven rows.
+"""
+
+from decimal import Decimal, InvalidOperation
+
+NOTE = 'note'
+COIN = 'coin'
+
+
+class Denomination:
+    """One row: value in minor units, display label and kind (note/coin)"""
+    __slots__ = ('value', 'label', 'kind')
+
+    def __init__(self, value, label, kind=NOTE):
+        self.value = value
+        self.label = label
+        self.kind = kind
+
+
+class Currency:
+    """A named set of denominations sharing one minor unit"""
+
+    def __init__(self, code, name, minor, rows):
+        self.code = code
+        self.name = name
+        self.minor = minor              # minor units per major unit (1 = whole units only)
+        self.rows = sorted(rows, key=lambda row: row.value, reverse=True)
+        self.values = tuple(row.value for row in self.rows)
+        if len(set(self.values)) != len(self.values):
+            raise ValueError(f"{code}: denomination values must be unique")
+
+    def format(self, amount, suffix=True):
+        """Minor units -> '12.345 EGP' or '1.234,50 EUR' (code left off without suffix)"""
+        sign = '-' if amount < 0 else ''
+        major, minor = divmod(abs(int(amount)), self.minor)
+        text = f"{major:,}".replace(',', '.')
+        if self.minor > 1:
+            digits = len(str(self.minor - 1))
+            text += f",{minor:0{digits}d}"
+        return f"{sign}{text} {self.code}" if suffix else sign + text
+
+    def to_minor(self, text):
+        """'12.5' or '12,50' in major units -> minor units; raises ValueError"""
+        try:
+            value = Decimal(text.strip().replace(',', '.')) * self.minor
+        except InvalidOperation:
+            raise ValueError(f"not an amount: {text!r}")
+        if value != value.to_integral_value():
+            raise ValueError(f"{text} is finer than the smallest unit")
+        return int(value)
+
+
+def _rows(minor, notes, coins=()):
+    """Rows from major-unit note and coin values (coins may be fractional)"""
+    rows = {}
+    for kind, values in ((COIN, coins), (NOTE, notes)):
+        for major in values:
+            value = int(Decimal(str(major)) * minor)
+            label = f"{major:g}" if value % minor == 0 or minor == 1 else f"{Decimal(str(major)):f}"
+            rows[value] = Denomination(value, label, kind)   # notes win a shared value
+    return list(rows.values())
+
+
+CURRENCIES = {}
+
+
+def register(currency):
+    CURRENCIES[currency.code] = currency
+    return currency
+
+
+register(Currency('EGP', 'Egyptian pound (notes)', 1, _rows(1, (200, 100, 50, 20, 10, 5, 1))))
+register(Currency('EGP-PT', 'Egyptian pound (notes + coins)', 100,
+                  _rows(100, (200, 100, 50, 20, 10, 5, 1, 0.5, 0.25), (1, 0.5, 0.25, 0.1, 0.05))))
+register(Currency('EUR', 'Euro', 100,
+                  _rows(100, (500, 200, 100, 50, 20, 10, 5), (2, 1, 0.5, 0.2, 0.1, 0.05, 0.02, 0.01))))
+register(Currency('USD', 'US dollar', 100,
+                  _rows(100, (100, 50, 20, 10, 5, 2, 1), (1, 0.5, 0.25, 0.1, 0.05, 0.01))))
+register(Currency('GBP', 'Pound sterling', 100,
+                  _rows(100, (50, 20, 10, 5), (2, 1, 0.5, 0.2, 0.1, 0.05, 0.02, 0.01))))
+register(Currency('SAR', 'Saudi riyal', 100,
+                  _rows(100, (500, 200, 100, 50, 20, 10, 5), (2, 1, 0.5, 0.25, 0.1, 0.05, 0.01))))
+register(Currency('AED', 'UAE dirham', 100,
+                  _rows(100, (1000, 500, 200, 100, 50, 20, 10, 5), (1, 0.5, 0.25))))
+register(Currency('CHF', 'Swiss franc', 100,
+                  _rows(100, (1000, 200, 100, 50, 20, 10), (5, 2, 1, 0.5, 0.2, 0.1, 0.05))))
+register(Currency('JPY', 'Japanese yen', 1,
+                  _rows(1, (10000, 5000, 2000, 1000), (500, 100, 50, 10, 5, 1))))
+
+DEFAULT = 'EGP'
+
+
+def get(code):
+    return CURRENCIES[code]
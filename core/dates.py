@@ -0,0 +1,214 @@
+"""
+Calendar arithmetic for the age calculator.
+
+Durations follow the usual "years, months, days" reading: whole months are
+counted up to the latest monthly anniversary that is not after the end date
+(an anniversary on a day the month lacks falls on its last day, so a
+29 February birthday turns a year older on 28 February), and the remaining
+days are counted exactly. Month lengths and days-before-month come from
+tables indexed by a leap-year flag, so nothing here approximates a month.
+
+`bulk_ages` streams a CSV of birth dates through in chunks; with NumPy each
+chunk is computed as whole-array arithmetic, otherwise row by row with the
+same rules.
+"""
+
+from datetime import date
+import csv
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Indexed [leap][month], month 1..12 (slot 0 unused)
+MONTH_DAYS = (
+    (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31),
+    (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31),
+)
+# Days in the year before the first of each month
+DAYS_BEFORE_MONTH = tuple(
+    tuple(sum(lengths[1:month]) for month in range(13)) for lengths in MONTH_DAYS
+)
+
+CHUNK_ROWS = 4096
+RESULT_COLUMNS = ('years', 'months', 'days', 'total_days')
+
+
+def is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def month_length(year, month):
+    return MONTH_DAYS[is_leap(year)][month]
+
+
+def check_date(year, month, day):
+    """Raise ValueError unless year-month-day is a real calendar date"""
+    if not 1 <= year <= 9999:
+        raise ValueError(f"year {year} is out of range")
+    if not 1 <= month <= 12:
+        raise ValueError(f"month {month} is out of range")
+    if not 1 <= day <= MONTH_DAYS[is_leap(year)][month]:
+        raise ValueError(f"day {day} is out of range for {year}-{month:02d}")
+
+
+def ordinal(year, month, day):
+    """Days since 0001-01-01 plus one (same numbering as date.toordinal)"""
+    y = year - 1
+    return (365 * y + y // 4 - y // 100 + y // 400
+            + DAYS_BEFORE_MONTH[is_leap(year)][month] + day)
+
+
+def age(birth, today=None):
+    """(years, months, days) from `birth` to `today`; both (y, m, d) or dates"""
+    by, bm, bd = _parts(birth)
+    ty, tm, td = _parts(today or date.today())
+    check_date(by, bm, bd)
+    check_date(ty, tm, td)
+    if (by, bm, bd) > (ty, tm, td):
+        raise ValueError("birth date is after the end date")
+
+    months = (ty - by) * 12 + (tm - bm)
+    ay, am, ad = _anniversary(by, bm, bd, months)
+    if (ay, am, ad) > (ty, tm, td):
+        months -= 1
+        ay, am, ad = _anniversary(by, bm, bd, months)
+    days = ordinal(ty, tm, td) - ordinal(ay, am, ad)
+    return months // 12, months % 12, days
+
+
+def total_days(birth, today=None):
+    return ordinal(*_parts(today or date.today())) - ordinal(*_parts(birth))
+
+
+def _parts(value):
+    if isinstance(value, date):
+        return value.year, value.month, value.day
+    return tuple(value)
+
+
+def _anniversary(year, month, day, months):
+    """`months` after year-month-day, clamped to the end of a short month"""
+    index = month - 1 + months
+    year, month = year + index // 12, index % 12 + 1
+    return year, month, min(day, MONTH_DAYS[is_leap(year)][month])
+
+
+# ==================== BULK ====================
+def parse_iso(text):
+    """'YYYY-MM-DD' -> (y, m, d); raises ValueError"""
+    year, month, day = text.strip().split('-')
+    return int(year), int(month), int(day)
+
+
+def _ages_numpy(years, months, days, today):
+    """Vectorized age(): int arrays in, (years, months, days, total) arrays out"""
+    ty, tm, td = today
+    lengths = numpy.array(MONTH_DAYS, dtype=numpy.int64)
+    before = numpy.array(DAYS_BEFORE_MONTH, dtype=numpy.int64)
+
+    def leap(y):
+        return ((y % 4 == 0) & ((y % 100 != 0) | (y % 400 == 0))).astype(numpy.int64)
+
+    def ordinals(y, m, d):
+        p = y - 1
+        return 365 * p + p // 4 - p // 100 + p // 400 + before[leap(y), m] + d
+
+    def anniversary(count):
+        index = months - 1 + count
+        ay, am = years + index // 12, index % 12 + 1
+        return ay, am, numpy.minimum(days, lengths[leap(ay), am])
+
+    count = (ty - years) * 12 + (tm - months)
+    ay, am, ad = anniversary(count)
+    late = (ay * 10000 + am * 100 + ad) > (ty * 10000 + tm * 100 + td)
+    count = count - late
+    ay, am, ad = anniversary(count)
+    end = ordinal(ty, tm, td)
+    return count // 12, count % 12, end - ordinals(ay, am, ad), end - ordinals(years, months, days)
+
+
+def _compute_chunk(births, today, use_numpy):
+    """Ages for a list of (y, m, d) or None; invalid rows come back as None"""
+    if use_numpy:
+        return _compute_chunk_numpy(births, today)
+    results = [None] * len(births)
+    end = ordinal(*today)
+    for i, birth in enumerate(births):
+        if birth is None or birth > today:
+            continue
+        try:
+            results[i] = age(birth, today) + (end - ordinal(*birth),)
+        except ValueError:
+            pass
+    return results
+
+
+def _compute_chunk_numpy(births, today):
+    results = [None] * len(births)
+    # Parts outside int64 would make numpy.array raise; they are invalid anyway
+    table = numpy.array([birth if birth and 1 <= birth[0] <= 9999 and 0 <= birth[1] <= 12
+                         and 0 <= birth[2] <= 31 else (0, 0, 0) for birth in births],
+                        dtype=numpy.int64)
+    if not len(table):
+        return results
+    years, months, days = table[:, 0], table[:, 1], table[:, 2]
+    ty, tm, td = today
+    leap = (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+    lengths = numpy.array(MONTH_DAYS, dtype=numpy.int64)[leap.astype(numpy.int64),
+                                                          numpy.clip(months, 0, 12)]
+    valid = ((years >= 1) & (years <= 9999) & (months >= 1) & (months <= 12)
+             & (days >= 1) & (days <= lengths)
+             & (years * 10000 + months * 100 + days <= ty * 10000 + tm * 100 + td))
+    index = numpy.flatnonzero(valid)
+    columns = _ages_numpy(years[index], months[index], days[index], today)
+    for i, row in zip(index.tolist(), zip(*(c.tolist() for c in columns))):
+        results[i] = row
+    return results
+
+
+def bulk_ages(src, dst, column='birth_date', today=None, chunk_rows=CHUNK_ROWS,
+              use_numpy=None):
+    """Stream a CSV of ISO birth dates from `src` to `dst` with age columns added.
+
+    `column` names the date column (the first column if the header has no
+    such name). Rows with a bad or future date get empty result cells.
+    Returns the number of data rows written.
+    """
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    if use_numpy and numpy is None:
+        raise RuntimeError("NumPy is not installed")
+    today = _parts(today or date.today())
+    reader = csv.reader(src)
+    writer = csv.writer(dst)
+    header = next(reader, None)
+    if header is None:
+        return 0
+    index = header.index(column) if column in header else 0
+    writer.writerow(header + list(RESULT_COLUMNS))
+
+    rows = 0
+    chunk = []
+    for row in reader:
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            rows += _write_chunk(writer, chunk, index, today, use_numpy)
+            chunk = []
+    if chunk:
+        rows += _write_chunk(writer, chunk, index, today, use_numpy)
+    return rows
+
+
+def _write_chunk(writer, chunk, index, today, use_numpy):
+    births = []
+    for row in chunk:
+        try:
+            births.append(parse_iso(row[index]))
+        except (ValueError, IndexError):
+            births.append(None)
+    blank = ('',) * len(RESULT_COLUMNS)
+    writer.writerows(row + list(result or blank)
+                     for row, result in zip(chunk, _compute_chunk(births, today, use_numpy)))
+    return len(chunk)
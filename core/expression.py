@@ -0,0 +1,612 @@
+"""
+Safe expression engine for the calculator.
+
+Expressions are tokenized, parsed with a shunting-yard pass and compiled to a
+small postfix program. Compiled programs are cached in an LRU, so evaluating
+the same text again skips parsing. Operand size, operator count and result
+size are bounded so inputs like ``9**9**9`` fail fast instead of freezing the
+UI thread.
+
+Grammar: numbers, ``+ - * / // % **``, unary ``+``/``-``, postfix ``!``
+(factorial) and parentheses.
+
+A ``Budget`` carries the size limit plus an optional deadline, and can be
+cancelled from another thread; large powers and factorials are computed in
+steps that check it, so a worker thread can be stopped mid-way.
+
+Modes:
+    'float'    - Python semantics (int stays int, ``/`` gives float), like eval
+    'decimal'  - every literal is a ``Decimal``
+    'fraction' - every literal is a ``Fraction`` (exact)
+"""
+
+from decimal import Decimal, DecimalException, DivisionImpossible, Overflow, localcontext
+from fractions import Fraction
+from functools import lru_cache
+from math import isfinite, lgamma, log, log2, log10
+from time import monotonic
+import re
+
+MODES = ('float', 'decimal', 'fraction')
+
+MAX_LENGTH = 1000          # characters per expression
+MAX_OPERAND_DIGITS = 64    # digits per number literal
+MAX_STEPS = 256            # operators per expression
+# Exact values stay under CPython's 4300-digit int/str conversion limit;
+# anything bigger (allowed by a larger Budget) is shown in scientific form
+MAX_RESULT_BITS = 14000
+_MAX_STR_BITS = 14000
+# Exact literals ('1e99999999' as a Fraction) are held to the same size
+MAX_LITERAL_DIGITS = int(MAX_RESULT_BITS * log10(2))
+DECIMAL_PRECISION = 28
+
+# Exact powers/factorials above this size are computed step by step
+CHUNK_BITS = 4096
+_FACTORIAL_CHUNK = 256
+
+
+class ExpressionError(ValueError):
+    """The text is not a valid calculator expression"""
+
+
+class BudgetExceeded(ExpressionError):
+    """The expression is valid but too expensive to evaluate"""
+
+
+class Cancelled(ExpressionError):
+    """The evaluation was cancelled through its Budget"""
+
+
+class TimedOut(Cancelled):
+    """The evaluation ran past its Budget deadline"""
+
+
+class Budget:
+    """Limits for one evaluation; cancel() may be called from any thread"""
+    __slots__ = ('max_bits', 'deadline', 'cancelled')
+
+    def __init__(self, max_bits=MAX_RESULT_BITS, timeout=None):
+        self.max_bits = max_bits
+        self.deadline = None if timeout is None else monotonic() + timeout
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def check(self):
+        if self.cancelled:
+            raise Cancelled("cancelled")
+        if self.deadline is not None and monotonic() > self.deadline:
+            raise TimedOut("timed out")
+
+
+_DEFAULT_BUDGET = Budget()
+
+
+# ==================== TOKENIZER ====================
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<op>\*\*|//|[-+*/%])
+      | (?P<postfix>!)
+      | (?P<lparen>\()
+      | (?P<rparen>\))
+    )""", re.VERBOSE)
+
+NUMBER, OPERATOR, POSTFIX, LPAREN, RPAREN = 'number', 'op', 'postfix', 'lparen', 'rparen'
+
+
+def tokenize(text):
+    """Yield (kind, text) tokens; raise ExpressionError on stray characters"""
+    pos = 0
+    end = len(text.rstrip())
+    while pos < end:
+        match = _TOKEN_RE.match(text, pos)
+        if match is None:
+            raise ExpressionError(f"unexpected character {text[pos]!r}")
+        kind = match.lastgroup
+        yield kind, match.group(kind)
+        pos = match.end()
+
+
+# ==================== OPERATORS ====================
+def _bits(value):
+    """Rough size of an exact value in bits (0 for floats/Decimals)"""
+    if isinstance(value, int):
+        return value.bit_length()
+    if isinstance(value, Fraction):
+        return value.numerator.bit_length() + value.denominator.bit_length()
+    return 0
+
+
+def _check_bits(bits, budget):
+    if bits > budget.max_bits:
+        raise BudgetExceeded("result too large")
+
+
+def _add(a, b, budget):
+    return a + b
+
+
+def _sub(a, b, budget):
+    return a - b
+
+
+def _mul(a, b, budget):
+    _check_bits(_bits(a) + _bits(b), budget)
+    return a * b
+
+
+def _truediv(a, b, budget):
+    _check_bits(_bits(a) + _bits(b), budget)
+    return a / b
+
+
+def _floordiv(a, b, budget):
+    return a // b
+
+
+def _mod(a, b, budget):
+    if not b:
+        # Decimal('5') % 0 is an InvalidOperation, not a ZeroDivisionError
+        raise ZeroDivisionError
+    return a % b
+
+
+def _stepped_pow(a, n, budget):
+    """a ** n by repeated squaring, checking the budget between steps"""
+    result = 1
+    while n:
+        if n & 1:
+            result *= a
+        n >>= 1
+        if n:
+            a *= a
+        budget.check()
+    return result
+
+
+def _pow(a, b, budget):
+    exact = isinstance(a, (int, Fraction))
+    if isinstance(b, Fraction):
+        if b.denominator != 1:
+            raise ExpressionError("non-integer power in exact mode")
+        b = b.numerator
+    if exact and isinstance(b, int):
+        # |a| ** b has |b| * log2|a| bits; int ** -n is a float, only
+        # Fractions stay exact there
+        if abs(a) > 1 and (b > 0 or isinstance(a, Fraction)):
+            if isinstance(a, Fraction):
+                size = log2(abs(a.numerator) or 1) + log2(a.denominator)
+            else:
+                size = log2(abs(a))
+            _check_bits(abs(b) * size, budget)
+            if abs(b) * size > CHUNK_BITS:
+                if b < 0:
+                    return _stepped_pow(1 / a, -b, budget)
+                return _stepped_pow(a, b, budget)
+    elif isinstance(b, int) and abs(b) > budget.max_bits:
+        raise BudgetExceeded("exponent too large")
+    return a ** b
+
+
+def _is_finite(a):
+    if isinstance(a, float):
+        return isfinite(a)
+    if isinstance(a, Decimal):
+        return a.is_finite()
+    return True
+
+
+def _factorial(a, budget):
+    if isinstance(a, complex):
+        raise ExpressionError("factorial needs a real number")
+    if not _is_finite(a):
+        raise ExpressionError("factorial needs a finite number")
+    # n! has more than n bits from n = 8 on, so this bounds n before int()
+    if a > max(budget.max_bits, 8):
+        raise BudgetExceeded("result too large")
+    n = int(a)
+    if n != a or n < 0:
+        raise ExpressionError("factorial needs a whole number >= 0")
+    # log2(n!) from the log-gamma function
+    _check_bits(lgamma(n + 1) / log(2), budget)
+    result = 1
+    for start in range(2, n + 1, _FACTORIAL_CHUNK):
+        block = 1
+        for k in range(start, min(start + _FACTORIAL_CHUNK, n + 1)):
+            block *= k
+        result *= block
+        budget.check()
+    if isinstance(a, Fraction):
+        return Fraction(result)
+    if isinstance(a, Decimal):
+        return +Decimal(result)     # rounded to the context precision
+    return result
+
+
+def _neg(a, budget):
+    return -a
+
+
+def _pos(a, budget):
+    return +a
+
+
+# symbol -> (precedence, right associative, function)
+BINARY = {
+    '+': (1, False, _add),
+    '-': (1, False, _sub),
+    '*': (2, False, _mul),
+    '/': (2, False, _truediv),
+    '//': (2, False, _floordiv),
+    '%': (2, False, _mod),
+    '**': (4, True, _pow),
+}
+UNARY = {
+    '-': (3, _neg),
+    '+': (3, _pos),
+}
+POSTFIX_OPS = {
+    '!': _factorial,
+}
+
+
+# ==================== COMPILER ====================
+def _literal(text, mode):
+    digits = sum(c.isdigit() for c in text)
+    if digits > MAX_OPERAND_DIGITS:
+        raise BudgetExceeded("number too long")
+    if mode != 'float':
+        # The exponent, not the digit count, decides the size of an exact value
+        _, _, exponent = text.lower().partition('e')
+        if exponent and abs(int(exponent)) + digits > MAX_LITERAL_DIGITS:
+            raise BudgetExceeded("number too large")
+    try:
+        if mode == 'decimal':
+            return Decimal(text)
+        if mode == 'fraction':
+            return Fraction(text)
+        if '.' in text or 'e' in text or 'E' in text:
+            return float(text)
+        return int(text)
+    except (ValueError, ArithmeticError):
+        raise ExpressionError(f"bad number {text!r}")
+
+
+class Program:
+    """A compiled expression: a postfix list of (arity, payload) steps"""
+    __slots__ = ('code', 'mode', 'steps')
+
+    def __init__(self, code, mode):
+        self.code = code
+        self.mode = mode
+        self.steps = sum(1 for arity, _ in code if arity)
+
+    def run(self, budget=None):
+        if budget is None:
+            budget = _DEFAULT_BUDGET
+        if self.mode == 'decimal':
+            with localcontext() as ctx:
+                ctx.prec = DECIMAL_PRECISION
+                return self._execute(budget)
+        return self._execute(budget)
+
+    def _execute(self, budget):
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        try:
+            for arity, payload in self.code:
+                if arity == 0:
+                    push(payload)
+                elif arity == 1:
+                    stack[-1] = payload(stack[-1], budget)
+                else:
+                    b = pop()
+                    stack[-1] = payload(stack[-1], b, budget)
+                budget.check()
+        except ExpressionError:
+            raise
+        except ZeroDivisionError:
+            raise ExpressionError("division by zero")
+        except OverflowError:
+            raise BudgetExceeded("result too large")
+        except DecimalException as e:
+            raise _decimal_error(e)
+        except TypeError:
+            # Operators that complex values do not support (%, //, <)
+            raise ExpressionError("not a real number")
+        except (ArithmeticError, ValueError) as e:
+            raise ExpressionError(str(e) or "invalid operation")
+        return _check_result(stack[0])
+
+
+def _decimal_error(e):
+    """ExpressionError for a trapped decimal signal"""
+    # The C decimal module raises InvalidOperation for all of its conditions
+    # and lists the actual ones in args
+    signals = e.args[0] if e.args and isinstance(e.args[0], list) else [type(e)]
+    if any(issubclass(signal, Overflow) for signal in signals):
+        return BudgetExceeded("result too large")
+    if any(issubclass(signal, DivisionImpossible) for signal in signals):
+        return ExpressionError(f"quotient has more than {DECIMAL_PRECISION} digits")
+    # 0**0, (-8)**0.5, Infinity - Infinity
+    return ExpressionError("undefined result")
+
+
+def _check_result(value):
+    """`value`, unless it is complex, infinite or NaN (ExpressionError)"""
+    if isinstance(value, complex):
+        raise ExpressionError("not a real number")
+    if not _is_finite(value):
+        raise ExpressionError("undefined result" if value != value else "result out of range")
+    return value
+
+
+@lru_cache(maxsize=512)
+def compile_expression(text, mode='float'):
+    """Parse `text` into a cached Program; raise ExpressionError if invalid"""
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}")
+    if len(text) > MAX_LENGTH:
+        raise BudgetExceeded("expression too long")
+
+    code = []
+    ops = []            # pending operators: (symbol, arity)
+    expect_operand = True
+    steps = 0
+
+    def pop_op():
+        symbol, arity = ops.pop()
+        if arity == 1:
+            code.append((1, UNARY[symbol][1]))
+        else:
+            code.append((2, BINARY[symbol][2]))
+
+    for kind, tok in tokenize(text):
+        if kind == NUMBER:
+            if not expect_operand:
+                raise ExpressionError("missing operator")
+            code.append((0, _literal(tok, mode)))
+            expect_operand = False
+        elif kind == LPAREN:
+            if not expect_operand:
+                raise ExpressionError("missing operator")
+            ops.append(('(', 0))
+        elif kind == POSTFIX:
+            if expect_operand:
+                raise ExpressionError("missing operand")
+            # Binds tighter than anything else: apply to the last operand now
+            code.append((1, POSTFIX_OPS[tok]))
+            steps += 1
+        elif kind == RPAREN:
+            if expect_operand:
+                raise ExpressionError("missing operand")
+            while ops and ops[-1][0] != '(':
+                pop_op()
+            if not ops:
+                raise ExpressionError("unbalanced parenthesis")
+            ops.pop()
+        elif expect_operand:
+            if tok not in UNARY:
+                raise ExpressionError("missing operand")
+            ops.append((tok, 1))
+            steps += 1
+        else:
+            prec, right, _ = BINARY[tok]
+            while ops and ops[-1][0] != '(':
+                top, arity = ops[-1]
+                top_prec = UNARY[top][0] if arity == 1 else BINARY[top][0]
+                if top_prec > prec or (top_prec == prec and not right):
+                    pop_op()
+                else:
+                    break
+            ops.append((tok, 2))
+            expect_operand = True
+            steps += 1
+        if steps > MAX_STEPS:
+            raise BudgetExceeded("too many operations")
+
+    if expect_operand:
+        raise ExpressionError("incomplete expression")
+    while ops:
+        if ops[-1][0] == '(':
+            raise ExpressionError("unbalanced parenthesis")
+        pop_op()
+    return Program(tuple(code), mode)
+
+
+def evaluate(text, mode='float', budget=None):
+    """Compile (cached) and run `text`, returning a number"""
+    return compile_expression(text, mode).run(budget)
+
+
+# ==================== INCREMENTAL EVALUATION ====================
+# A token may change when up to this many characters are typed after it
+# ('1' -> '1e+5'), so edits re-lex from at least this far back
+_LOOKAHEAD = 3
+
+
+class _State:
+    """Parser state after one token; never mutated once built.
+
+    `values` and `ops` are persistent (head, tail) lists, so every earlier
+    state stays valid and a backspace is just a pop. Operators are applied
+    as soon as precedence allows, so values are already evaluated.
+    """
+    __slots__ = ('values', 'ops', 'expect_operand', 'steps', 'settled')
+
+    def __init__(self, values, ops, expect_operand, steps, settled):
+        self.values = values
+        self.ops = ops
+        self.expect_operand = expect_operand
+        self.steps = steps
+        # Latest state that ended on an operand (what the preview shows)
+        self.settled = self if not expect_operand else settled
+
+
+def _reduce(values, ops, budget):
+    """Apply the operator on top of `ops`; return the new (values, ops)"""
+    (symbol, arity), ops = ops
+    if arity == 1:
+        value, values = values
+        return (UNARY[symbol][1](value, budget), values), ops
+    b, (a, values) = values
+    return (BINARY[symbol][2](a, b, budget), values), ops
+
+
+def _feed(state, kind, tok, mode, budget):
+    """State after one more token; raises ExpressionError if it is invalid"""
+    values, ops, steps = state.values, state.ops, state.steps
+    if kind == NUMBER:
+        if not state.expect_operand:
+            raise ExpressionError("missing operator")
+        return _State((_literal(tok, mode), values), ops, False, steps, state.settled)
+    if kind == LPAREN:
+        if not state.expect_operand:
+            raise ExpressionError("missing operator")
+        return _State(values, (('(', 0), ops), True, steps, state.settled)
+    if kind == RPAREN:
+        if state.expect_operand:
+            raise ExpressionError("missing operand")
+        while ops is not None and ops[0][0] != '(':
+            values, ops = _reduce(values, ops, budget)
+        if ops is None:
+            raise ExpressionError("unbalanced parenthesis")
+        return _State(values, ops[1], False, steps, state.settled)
+
+    steps += 1
+    if steps > MAX_STEPS:
+        raise BudgetExceeded("too many operations")
+    if kind == POSTFIX:
+        if state.expect_operand:
+            raise ExpressionError("missing operand")
+        value, rest = values
+        return _State((POSTFIX_OPS[tok](value, budget), rest), ops, False, steps, state.settled)
+    if state.expect_operand:
+        if tok not in UNARY:
+            raise ExpressionError("missing operand")
+        return _State(values, ((tok, 1), ops), True, steps, state.settled)
+
+    prec, right, _ = BINARY[tok]
+    while ops is not None and ops[0][0] != '(':
+        top, arity = ops[0]
+        top_prec = UNARY[top][0] if arity == 1 else BINARY[top][0]
+        if top_prec > prec or (top_prec == prec and not right):
+            values, ops = _reduce(values, ops, budget)
+        else:
+            break
+    return _State(values, ((tok, 2), ops), True, steps, state.settled)
+
+
+class IncrementalEvaluator:
+    """Live preview of a growing expression.
+
+    update() keeps one parser state per token and, on each call, only
+    re-lexes the text after the longest unchanged prefix. Appending or
+    deleting a character therefore costs O(1) amortized, plus one pass over
+    the pending operators to produce the preview value.
+    """
+
+    def __init__(self, mode='float', budget=None):
+        self.mode = mode
+        self.budget = budget if budget is not None else _DEFAULT_BUDGET
+        self._text = ""
+        self._ends = [0]
+        self._states = [_State(None, None, True, 0, None)]
+
+    def update(self, text):
+        """Feed the new full text; return the preview value or None"""
+        if self.mode == 'decimal':
+            with localcontext() as ctx:
+                ctx.prec = DECIMAL_PRECISION
+                return self._update(text)
+        return self._update(text)
+
+    def _update(self, text):
+        old = self._text
+        if text.startswith(old):
+            prefix = len(old)
+        elif old.startswith(text):
+            prefix = len(text)
+        else:
+            prefix = 0
+            for a, b in zip(old, text):
+                if a != b:
+                    break
+                prefix += 1
+        self._text = text
+        if len(text) > MAX_LENGTH:
+            return None
+
+        ends, states = self._ends, self._states
+        while len(ends) > 1 and ends[-1] > prefix - _LOOKAHEAD:
+            ends.pop()
+            states.pop()
+
+        pos, state = ends[-1], states[-1]
+        while state is not None and pos < len(text):
+            match = _TOKEN_RE.match(text, pos)
+            if match is None:
+                if not text[pos:].strip():
+                    break
+                state, pos = None, pos + 1
+            else:
+                kind = match.lastgroup
+                # _feed applies operators outside Program._execute, so the raw
+                # errors come through too (ExpressionError is a ValueError)
+                try:
+                    state = _feed(state, kind, match.group(kind), self.mode, self.budget)
+                except (ArithmeticError, TypeError, ValueError):
+                    state = None
+                pos = match.end()
+            ends.append(pos)
+            states.append(state)
+        return self.preview()
+
+    def preview(self):
+        """Value of the text so far, ignoring a trailing operator and
+        closing any open parentheses; None if there is nothing to show"""
+        state = self._states[-1]
+        if state is None or state.settled is None:
+            return None
+        values, ops = state.settled.values, state.settled.ops
+        try:
+            while ops is not None:
+                if ops[0][0] == '(':
+                    ops = ops[1]
+                else:
+                    values, ops = _reduce(values, ops, self.budget)
+            return _check_result(values[0])
+        except (ArithmeticError, TypeError, ValueError):
+            return None
+
+
+def _log10(n):
+    """log10 of a positive int of any size"""
+    shift = max(n.bit_length() - 64, 0)
+    return log10(n >> shift) + shift * log10(2)
+
+
+def _scientific(value):
+    """'d.ddddddddde+N' for exact values too large for str()"""
+    sign = '-' if value < 0 else ''
+    value = abs(value)
+    if isinstance(value, Fraction):
+        exponent = _log10(value.numerator) - _log10(value.denominator)
+    else:
+        exponent = _log10(value)
+    whole = int(exponent // 1)
+    mantissa = 10 ** (exponent - whole)
+    if round(mantissa, 10) >= 10:
+        mantissa /= 10
+        whole += 1
+    return f"{sign}{mantissa:.10f}e{whole:+d}"
+
+
+def format_result(value):
+    """Text for the calculator display"""
+    if _bits(value) > _MAX_STR_BITS:
+        return _scientific(value)
+    return str(value)
@@ -0,0 +1,143 @@
+"""
+Frame-time and callback timing.
+
+Every instrumented callback gets a fixed-size ring buffer of its most recent
+durations, and frames get one of their own, so memory stays flat however long
+the app runs. Stats (p50/p99, fps, top offenders by time spent) are computed
+from the buffers on demand and can be exported as JSON for field reports.
+
+Opt in with ELBASHA_PROFILE=1; the Kivy side lives in instrument.py.
+"""
+
+from array import array
+from datetime import datetime
+from functools import wraps
+import json
+import os
+import time
+
+ENV_VAR = 'ELBASHA_PROFILE'
+enabled = os.environ.get(ENV_VAR, '') not in ('', '0')
+
+CALLBACK_SAMPLES = 256
+FRAME_SAMPLES = 600      # ten seconds at 60 fps
+
+
+class RingBuffer:
+    """The last `size` float samples, overwriting the oldest"""
+    __slots__ = ('samples', 'size', 'count', '_next')
+
+    def __init__(self, size):
+        self.samples = array('d', bytes(8 * size))
+        self.size = size
+        self.count = 0        # total ever added
+        self._next = 0
+
+    def add(self, value):
+        self.samples[self._next] = value
+        self._next = (self._next + 1) % self.size
+        self.count += 1
+
+    def values(self):
+        """Samples currently held, oldest first"""
+        if self.count < self.size:
+            return self.samples[:self.count]
+        return self.samples[self._next:] + self.samples[:self._next]
+
+    def clear(self):
+        self.count = 0
+        self._next = 0
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of already sorted values (0 when empty)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def summarize(values):
+    """count/mean/p50/p99/max in milliseconds for one buffer's samples"""
+    ordered = sorted(values)
+    if not ordered:
+        return {'samples': 0, 'total_ms': 0.0, 'mean_ms': 0.0,
+                'p50_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+    total = sum(ordered)
+    return {
+        'samples': len(ordered),
+        'total_ms': total * 1000,
+        'mean_ms': total / len(ordered) * 1000,
+        'p50_ms': percentile(ordered, 0.50) * 1000,
+        'p99_ms': percentile(ordered, 0.99) * 1000,
+        'max_ms': ordered[-1] * 1000,
+    }
+
+
+class CallbackProfiler:
+    """Per-callback and per-frame duration rings"""
+
+    def __init__(self, callback_samples=CALLBACK_SAMPLES, frame_samples=FRAME_SAMPLES):
+        self.callback_samples = callback_samples
+        self.callbacks = {}
+        self.frames = RingBuffer(frame_samples)
+        self._last_frame = None
+
+    def record(self, name, seconds):
+        ring = self.callbacks.get(name)
+        if ring is None:
+            ring = self.callbacks[name] = RingBuffer(self.callback_samples)
+        ring.add(seconds)
+
+    def frame(self, now=None):
+        """Call once per drawn frame; records the time since the previous one"""
+        now = time.perf_counter() if now is None else now
+        if self._last_frame is not None:
+            self.frames.add(now - self._last_frame)
+        self._last_frame = now
+
+    def wrap(self, name, fn):
+        """`fn` with every call timed under `name`"""
+        record = self.record
+        clock = time.perf_counter
+
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, clock() - start)
+        return timed
+
+    def frame_stats(self):
+        stats = summarize(self.frames.values())
+        stats['fps'] = 1000 / stats['mean_ms'] if stats['mean_ms'] else 0.0
+        return stats
+
+    def top(self, limit=5):
+        """(name, stats) for the callbacks with the most recorded time"""
+        rows = [(name, summarize(ring.values())) for name, ring in self.callbacks.items()]
+        rows.sort(key=lambda row: row[1]['total_ms'], reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        self.callbacks.clear()
+        self.frames.clear()
+        self._last_frame = None
+
+    def report(self):
+        return {
+            'recorded': datetime.now().isoformat(timespec='seconds'),
+            'frames': self.frame_stats(),
+            'callbacks': {name: stats for name, stats in self.top(len(self.callbacks))},
+        }
+
+    def export(self, path):
+        """Write report() as JSON to `path` and return it"""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(self.report(), fh, indent=2)
+        return path
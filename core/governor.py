@@ -0,0 +1,147 @@
+"""
+Frame-budget governor for the animated background.
+
+The background ticks at one of a few quality levels, from the profile's best
+(fast ticks, all particles) down to its cheapest. The governor watches the
+real time between ticks: when too many recent frames arrive late, it drops a
+level; after a calm spell with no late frames, it probes one level back up,
+waiting twice as long before the next probe each time a probe fails. While the
+user is touching or typing, low-end profiles hold a cheap level so input stays
+responsive. After `idle_timeout` seconds without input, the engine stops
+ticking altogether.
+
+Profiles are per device class (low / mid / high), picked from
+ELBASHA_DEVICE_CLASS or guessed from CPU count and memory.
+"""
+
+from collections import deque
+import os
+
+ENV_VAR = 'ELBASHA_DEVICE_CLASS'
+
+LATE_FACTOR = 1.5      # a frame is late when dt > interval * LATE_FACTOR
+LATE_SHARE = 0.25      # share of late frames in the window that drops a level
+WINDOW = 30            # frames per decision
+MAX_PROBE_BACKOFF = 5  # restore delay doubles up to 2**5 times
+
+
+class DeviceProfile:
+    """Quality levels and timeouts for one class of device"""
+    def __init__(self, name, particles, levels, idle_timeout, restore_after,
+                 input_level=0, input_hold=0):
+        self.name = name
+        self.particles = particles          # particle count at fraction 1.0
+        self.levels = levels                # [(tick interval s, particle fraction)], best first
+        self.idle_timeout = idle_timeout    # seconds without input before ticking stops
+        self.restore_after = restore_after  # calm seconds before probing a better level
+        self.input_level = input_level      # worst-allowed level while input is active
+        self.input_hold = input_hold        # seconds input counts as active
+
+
+PROFILES = {
+    'low': DeviceProfile(
+        'low', particles=600,
+        levels=[(1 / 30., 1.0), (1 / 20., 0.5), (1 / 15., 0.25), (1 / 10., 0.1)],
+        idle_timeout=10, restore_after=8, input_level=2, input_hold=3),
+    'mid': DeviceProfile(
+        'mid', particles=1500,
+        levels=[(1 / 60., 1.0), (1 / 45., 0.6), (1 / 30., 0.35), (1 / 20., 0.15)],
+        idle_timeout=20, restore_after=5, input_level=1, input_hold=1),
+    'high': DeviceProfile(
+        'high', particles=3000,
+        levels=[(1 / 60., 1.0), (1 / 45., 0.7), (1 / 30., 0.4)],
+        idle_timeout=30, restore_after=3),
+}
+
+
+def _total_memory():
+    """Bytes of RAM from /proc/meminfo (Linux and Android), or None"""
+    try:
+        with open('/proc/meminfo') as fh:
+            for line in fh:
+                if line.startswith('MemTotal:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def detect_device_class():
+    """ELBASHA_DEVICE_CLASS if set, else a guess from CPU count and memory"""
+    name = os.environ.get(ENV_VAR, '')
+    if name in PROFILES:
+        return name
+    cpus = os.cpu_count() or 1
+    memory = _total_memory()
+    gib = 1024 ** 3
+    if cpus <= 4 or (memory is not None and memory < 3 * gib):
+        return 'low'
+    if cpus <= 6 or (memory is not None and memory < 6 * gib):
+        return 'mid'
+    return 'high'
+
+
+class FrameGovernor:
+    """Picks the background's quality level from observed frame times"""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.level = 0
+        self._samples = deque(maxlen=WINDOW)
+        self._calm = 0.0
+        self._backoff = 0
+        self._probing = False
+        self._input_until = None
+
+    def effective_level(self, now=None):
+        """The level in force, counting the input hold"""
+        if self._input_until is not None and now is not None and now < self._input_until:
+            return max(self.level, self.profile.input_level)
+        return self.level
+
+    def settings(self, now=None):
+        """(tick interval, particle count) for the level in force"""
+        interval, fraction = self.profile.levels[self.effective_level(now)]
+        return interval, max(1, int(self.profile.particles * fraction))
+
+    def note_input(self, now):
+        if self.profile.input_hold:
+            self._input_until = now + self.profile.input_hold
+
+    def reset_samples(self):
+        """Forget recent frames (after a pause or a reschedule)"""
+        self._samples.clear()
+        self._calm = 0.0
+
+    def observe(self, dt):
+        """Feed one tick's real dt; return True when the level changed"""
+        interval = self.profile.levels[self.level][0]
+        samples = self._samples
+        samples.append(dt)
+        late = dt > interval * LATE_FACTOR
+        self._calm = 0.0 if late else self._calm + dt
+        if len(samples) < samples.maxlen:
+            return False
+
+        late_frames = sum(1 for s in samples if s > interval * LATE_FACTOR)
+        if late_frames >= LATE_SHARE * len(samples):
+            if self._probing:
+                # The better level did not hold: wait longer before the next try
+                self._backoff = min(self._backoff + 1, MAX_PROBE_BACKOFF)
+                self._probing = False
+            if self.level < len(self.profile.levels) - 1:
+                self.level += 1
+                self.reset_samples()
+                return True
+            return False
+
+        if self._probing:
+            # A full calm window at the probed level: it holds
+            self._probing = False
+            self._backoff = 0
+        if self.level > 0 and self._calm >= self.profile.restore_after * 2 ** self._backoff:
+            self.level -= 1
+            self._probing = True
+            self.reset_samples()
+            return True
+        return False
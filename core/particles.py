@@ -0,0 +1,178 @@
+"""
+Array-backed particle field for the animated background.
+
+Positions, velocities, sizes and colour buckets live in flat arrays (NumPy
+when it is installed, the stdlib ``array`` module otherwise) and are stepped
+in one pass. Particles are grouped by colour bucket so the renderer can draw
+each bucket with a single textured Mesh. set_active() thins every bucket
+evenly, so a governor can trade particle count for frame time without
+reallocating anything.
+"""
+
+from array import array
+from functools import lru_cache
+import random
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Soft blue/cyan tones, one Mesh per entry
+PALETTE = [
+    (0.35, 0.60, 0.95, 0.30),
+    (0.45, 0.75, 1.00, 0.40),
+    (0.55, 0.85, 0.95, 0.25),
+    (0.65, 0.70, 1.00, 0.45),
+]
+
+# 6 indices per particle, unsigned short indices -> 65535 / 6
+MAX_PER_BUCKET = 10922
+
+FLOATS_PER_PARTICLE = 16  # 4 vertices * (x, y, u, v)
+
+
+@lru_cache(maxsize=64)
+def quad_indices(count):
+    """Triangle indices for `count` quads, as an unsigned short array (shared; do not modify)"""
+    indices = array('H')
+    for i in range(0, count * 4, 4):
+        indices.extend((i, i + 1, i + 2, i + 2, i + 3, i))
+    return indices
+
+
+class ParticleField:
+    """Contiguous particle storage with a single vectorized step"""
+
+    def __init__(self, count, width, height, palette=PALETTE, use_numpy=None, seed=None):
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        if use_numpy and numpy is None:
+            raise RuntimeError("NumPy is not installed")
+        self.use_numpy = use_numpy
+        self.palette = list(palette)
+        self.count = min(count, MAX_PER_BUCKET * len(self.palette))
+        self.width = width
+        self.height = height
+
+        rng = random.Random(seed)
+        xs = [rng.uniform(0, width) for _ in range(self.count)]
+        ys = [rng.uniform(0, height) for _ in range(self.count)]
+        # Velocities in px/second (the old 0.5 px per 0.05 s tick)
+        vxs = [rng.uniform(-10, 10) for _ in range(self.count)]
+        vys = [rng.uniform(-10, 10) for _ in range(self.count)]
+        radii = [rng.randint(2, 6) / 2 for _ in range(self.count)]
+
+        if use_numpy:
+            self.x = numpy.array(xs, dtype=numpy.float32)
+            self.y = numpy.array(ys, dtype=numpy.float32)
+            self.vx = numpy.array(vxs, dtype=numpy.float32)
+            self.vy = numpy.array(vys, dtype=numpy.float32)
+            self.radius = numpy.array(radii, dtype=numpy.float32)
+            self._vertices = numpy.empty((self.count, 4, 4), dtype=numpy.float32)
+            self._vertices[:, :, 2:] = ((0, 0), (1, 0), (1, 1), (0, 1))
+        else:
+            self.x = array('f', xs)
+            self.y = array('f', ys)
+            self.vx = array('f', vxs)
+            self.vy = array('f', vys)
+            self.radius = array('f', radii)
+            self._vertices = array('f', (0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 1, 0, 0, 0, 1) * self.count)
+
+        # Particles are laid out bucket by bucket: [start, end) per palette entry
+        buckets = len(self.palette)
+        self.buckets = []
+        for b in range(buckets):
+            start = self.count * b // buckets
+            end = self.count * (b + 1) // buckets
+            self.buckets.append((start, end))
+        # Stepped and drawn: a prefix of each bucket
+        self.active = self.count
+        self.ranges = list(self.buckets)
+
+    def set_active(self, count):
+        """Step and draw only `count` particles, spread evenly over the buckets"""
+        count = max(0, min(count, self.count))
+        self.active = count
+        self.ranges = [(start, start + (end - start) * count // max(self.count, 1))
+                       for start, end in self.buckets]
+
+    def bucket_size(self, bucket):
+        """Active particles in one colour bucket"""
+        start, end = self.ranges[bucket]
+        return end - start
+
+    def resize(self, width, height):
+        self.width = width
+        self.height = height
+
+    def step(self, dt):
+        """Advance every particle by `dt` seconds, bouncing off the edges"""
+        width, height = self.width, self.height
+        if self.use_numpy:
+            if self.active == self.count:
+                spans = [slice(None)]
+            else:
+                spans = [slice(start, end) for start, end in self.ranges]
+            for span in spans:
+                x, y, vx, vy = self.x[span], self.y[span], self.vx[span], self.vy[span]
+                x += vx * dt
+                y += vy * dt
+                out = (x <= 0) | (x >= width)
+                vx[out] *= -1
+                out = (y <= 0) | (y >= height)
+                vy[out] *= -1
+                numpy.clip(x, 0, width, out=x)
+                numpy.clip(y, 0, height, out=y)
+            return
+
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        for i in self._active_indices():
+            nx = x[i] + vx[i] * dt
+            ny = y[i] + vy[i] * dt
+            if nx <= 0 or nx >= width:
+                vx[i] = -vx[i]
+                nx = 0 if nx <= 0 else width
+            if ny <= 0 or ny >= height:
+                vy[i] = -vy[i]
+                ny = 0 if ny <= 0 else height
+            x[i] = nx
+            y[i] = ny
+
+    def vertices(self):
+        """Fill and return the (x, y, u, v) quad buffer for all particles"""
+        if self.use_numpy:
+            if self.active == self.count:
+                spans = [slice(None)]
+            else:
+                spans = [slice(start, end) for start, end in self.ranges]
+            for span in spans:
+                v, x, y, r = self._vertices[span], self.x[span], self.y[span], self.radius[span]
+                v[:, 0, 0] = v[:, 3, 0] = x - r
+                v[:, 1, 0] = v[:, 2, 0] = x + r
+                v[:, 0, 1] = v[:, 1, 1] = y - r
+                v[:, 2, 1] = v[:, 3, 1] = y + r
+            return self._vertices.reshape(-1)
+
+        v, x, y, r = self._vertices, self.x, self.y, self.radius
+        for i in self._active_indices():
+            j = i * FLOATS_PER_PARTICLE
+            left = x[i] - r[i]
+            right = x[i] + r[i]
+            bottom = y[i] - r[i]
+            top = y[i] + r[i]
+            v[j] = v[j + 12] = left
+            v[j + 4] = v[j + 8] = right
+            v[j + 1] = v[j + 5] = bottom
+            v[j + 9] = v[j + 13] = top
+        return v
+
+    def _active_indices(self):
+        if self.active == self.count:
+            return range(self.count)
+        return (i for start, end in self.ranges for i in range(start, end))
+
+    def bucket_vertices(self, vertices, bucket):
+        """Slice of the vertex buffer belonging to one colour bucket's active particles"""
+        start, end = self.ranges[bucket]
+        return memoryview(vertices)[start * FLOATS_PER_PARTICLE:end * FLOATS_PER_PARTICLE]
@@ -0,0 +1,82 @@
+"""
+Startup profiling.
+
+Set ELBASHA_STARTUP_PROFILE to record how long each startup phase takes
+(imports, theme setup, each screen build, first frame) and write it as JSON:
+
+    ELBASHA_STARTUP_PROFILE=1 python main.py              -> <user_data_dir>/startup-profile.json
+    ELBASHA_STARTUP_PROFILE=/sdcard/run.json python main.py
+
+Times are milliseconds since this module was imported, which main.py does
+first. With the variable unset, phase() and mark() do nothing.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import os
+import platform
+import sys
+import time
+
+ENV_VAR = 'ELBASHA_STARTUP_PROFILE'
+DEFAULT_FILENAME = 'startup-profile.json'
+
+_T0 = time.perf_counter()
+_setting = os.environ.get(ENV_VAR, '')
+enabled = _setting not in ('', '0')
+phases = []
+marks = {}
+
+
+def _ms(t):
+    return round((t - _T0) * 1000, 3)
+
+
+@contextmanager
+def phase(name):
+    """Time the enclosed block as one named phase"""
+    if not enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        phases.append({'name': name, 'start_ms': _ms(start), 'ms': round((end - start) * 1000, 3)})
+
+
+def mark(name):
+    """Record a point in time (e.g. the first frame)"""
+    if enabled:
+        marks[name] = _ms(time.perf_counter())
+
+
+def output_path(default_dir='.'):
+    if _setting.endswith('.json'):
+        return _setting
+    return os.path.join(default_dir, DEFAULT_FILENAME)
+
+
+def report():
+    return {
+        'recorded': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'phases': phases,
+        'marks': marks,
+    }
+
+
+def write(default_dir='.'):
+    """Write the profile as JSON; return the path, or None when disabled"""
+    if not enabled:
+        return None
+    path = output_path(default_dir)
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as fh:
+        json.dump(report(), fh, indent=2)
+    return path
@@ -0,0 +1,294 @@
+"""
+Offline exchange rates and exact multi-currency valuation.
+
+A rate table is a small binary file: a header, then fixed-size records
+sorted by currency code. Each record holds the value of one major unit of
+its currency in the table's pivot currency as a decimal (int64 coefficient
+and power-of-ten exponent, so '0.0204' is stored exactly), and the number
+of minor-unit digits the currency is shown with. RateTable memory-maps the
+file and looks codes up by bisecting the records in place, without reading
+the table into Python objects. A new table is installed by replacing the
+file (write_table() writes a temporary file and renames it over the old
+one); RateTable.changed() notices, and the caller reopens it.
+
+Valuation keeps everything in integers. Held amounts (in each profile's
+minor units) are weighted into one running sum over a common denominator,
+so a count change is one multiply-add, and the values in all N target
+currencies come from that sum in one pass of integer divisions, rounded
+half to even in each target's minor unit.
+"""
+
+from bisect import bisect_left
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from math import lcm
+import csv
+import mmap
+import os
+import struct
+
+from core import currencies
+
+MAGIC = b'RATES1\0\0'
+_HEADER = struct.Struct('<8sII')        # pivot code, records, as-of date ordinal
+_RECORD = struct.Struct('<8sqbB6x')     # code, coefficient, exponent, minor digits
+DEFAULT_DIGITS = 2
+MAX_DIGITS = 255                        # minor-unit digits fit the record's unsigned byte
+# ISO 4217 minor units that are not 2 digits
+ISO_DIGITS = {'JPY': 0, 'KRW': 0, 'VND': 0, 'CLP': 0, 'ISK': 0,
+              'KWD': 3, 'BHD': 3, 'OMR': 3, 'JOD': 3, 'TND': 3, 'IQD': 3, 'LYD': 3}
+_INT64 = 2 ** 63
+
+
+def _code(code):
+    return code.encode('ascii').ljust(8, b'\0')
+
+
+def rate_code(code):
+    """Rate table code of a currency profile ('EGP-PT' is valued as EGP)"""
+    return code.split('-')[0]
+
+
+class RateTable:
+    """A memory-mapped rate file; close() it, or use it as a context manager"""
+    _base = len(MAGIC) + _HEADER.size
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as fh:
+            stat = os.fstat(fh.fileno())
+            if stat.st_size < len(MAGIC) + _HEADER.size:
+                raise ValueError(f"{path} is not a rate table")
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._stamp = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a rate table")
+        pivot, self._count, as_of = _HEADER.unpack_from(self._map, len(MAGIC))
+        if len(self._map) < self._base + self._count * _RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+        # Valuation divides by coefficients, so a bad one is refused here, not on first use
+        for i in range(self._count):
+            code, coefficient, _, _ = _RECORD.unpack_from(self._map, self._base + i * _RECORD.size)
+            if coefficient <= 0:
+                self.close()
+                code = code.rstrip(b'\0').decode('ascii', 'replace')
+                raise ValueError(f"{path}: the rate of {code} is not positive")
+        self.pivot = pivot.rstrip(b'\0').decode('ascii')
+        self.as_of = date.fromordinal(as_of) if as_of else None
+        self._keys = _Keys(self)
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, code):
+        return self._find(code) is not None
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._key(i).rstrip(b'\0').decode('ascii')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _key(self, i):
+        offset = self._base + i * _RECORD.size
+        return self._map[offset:offset + 8]
+
+    def _find(self, code):
+        try:
+            key = _code(rate_code(code))
+        except UnicodeEncodeError:
+            return None
+        i = bisect_left(self._keys, key)
+        if i < self._count and self._key(i) == key:
+            return _RECORD.unpack_from(self._map, self._base + i * _RECORD.size)
+        return None
+
+    def _record(self, code):
+        record = self._find(code)
+        if record is None:
+            raise KeyError(f"no rate for {code}")
+        return record
+
+    def rate(self, code):
+        """Value of one major unit of `code` in the pivot currency, as an exact Decimal"""
+        _, coefficient, exponent, _ = self._record(code)
+        return Decimal(coefficient).scaleb(exponent)
+
+    def digits(self, code):
+        """Minor-unit digits `code` is valued in (2 for cents)"""
+        return self._record(code)[3]
+
+    def changed(self):
+        """True if the file on disk is no longer the one mapped"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return True
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns) != self._stamp
+
+
+class _Keys:
+    """The record codes of a RateTable as a sequence, for bisect"""
+    __slots__ = ('table',)
+
+    def __init__(self, table):
+        self.table = table
+
+    def __len__(self):
+        return self.table._count
+
+    def __getitem__(self, i):
+        return self.table._key(i)
+
+
+def write_table(path, rates, pivot='USD', as_of=None, digits=None):
+    """Write {code: rate against the pivot} as a rate file, replacing `path` atomically.
+
+    Rates are anything Decimal() accepts; `digits` maps codes to minor-unit
+    digits (default: ISO_DIGITS, else 2).
+    """
+    digits = digits or {}
+    rates = {code: Decimal(str(rate)) for code, rate in rates.items()}
+    rates.setdefault(pivot, Decimal(1))
+    if rates[pivot] != 1:
+        raise ValueError(f"the pivot {pivot} must have rate 1")
+    records = []
+    for code in sorted(rates, key=_code):
+        rate = rates[code]
+        if not rate.is_finite() or rate <= 0:
+            raise ValueError(f"{code}: rate must be a positive number")
+        _, mantissa, exponent = rate.normalize().as_tuple()
+        coefficient = int(''.join(map(str, mantissa)))
+        if coefficient >= _INT64 or not -128 <= exponent <= 127:
+            raise ValueError(f"{code}: rate {rate} is out of range")
+        if len(code) > 8:
+            raise ValueError(f"{code}: currency codes have at most 8 characters")
+        places = digits.get(code, ISO_DIGITS.get(code, DEFAULT_DIGITS))
+        if not 0 <= places <= MAX_DIGITS:
+            raise ValueError(f"{code}: minor-unit digits {places} are out of range")
+        records.append(_RECORD.pack(_code(code), coefficient, exponent, places))
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as fh:
+        fh.write(MAGIC)
+        fh.write(_HEADER.pack(_code(pivot), len(records), as_of.toordinal() if as_of else 0))
+        fh.writelines(records)
+    os.replace(temporary, path)
+    return len(records)
+
+
+def read_csv(fh):
+    """({code: Decimal rate}, {code: digits}) from 'code,rate[,digits]' rows"""
+    rates = {}
+    digits = {}
+    for row in csv.reader(fh):
+        if not row or row[0].strip().lower() in ('', 'code', 'currency') or row[0].startswith('#'):
+            continue
+        code = row[0].strip().upper()
+        try:
+            rate = Decimal(row[1].strip())
+            if len(row) > 2 and row[2].strip():
+                digits[code] = int(row[2])
+        except (IndexError, InvalidOperation, ValueError):
+            raise ValueError(f"bad rate row: {','.join(row)}") from None
+        if not rate.is_finite() or rate <= 0:
+            raise ValueError(f"{code}: rate must be a positive number")
+        if not 0 <= digits.get(code, 0) <= MAX_DIGITS:
+            raise ValueError(f"{code}: minor-unit digits must be 0 to {MAX_DIGITS}")
+        rates[code] = rate
+    return rates, digits
+
+
+def _round_div(numerator, denominator):
+    """numerator / denominator rounded half to even (denominator > 0)"""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+# ==================== VALUATION ====================
+class Valuation:
+    """Cash held in several currency profiles, valued in several target currencies"""
+
+    def __init__(self, table, targets):
+        self.held = {}              # profile code -> amount in the profile's minor units
+        self.missing = set()        # held profiles the table has no rate for
+        self.rebase(table, targets)
+
+    def rebase(self, table, targets=None):
+        """Switch to another rate table (or target list); the held amounts are kept"""
+        self.table = table
+        if targets is not None:
+            self.requested = list(targets)
+        self.targets = [code for code in self.requested if code in table]
+        # Every rate is coefficient * 10**exponent; scaling by 10**places and by
+        # every profile's minor unit makes each weight a whole number
+        places = max([0] + [-table._record(code)[2] for code in table])
+        self.scale = 10 ** places * lcm(*(c.minor for c in currencies.CURRENCIES.values()))
+        self._weights = {}
+        self._divisors = []
+        for code in self.targets:
+            _, coefficient, exponent, digits = table._record(code)
+            numerator = 10 ** digits * 10 ** max(0, -exponent)
+            denominator = self.scale * coefficient * 10 ** max(0, exponent)
+            self._divisors.append((numerator, denominator, digits))
+        self.missing.clear()
+        self.total = 0
+        for code, amount in self.held.items():
+            self.total += amount * self._weight(code)
+
+    def _weight(self, code):
+        """Pivot value of one minor unit of a profile, times the common scale.
+
+        Codes without a profile are held in major units.
+        """
+        weight = self._weights.get(code)
+        if weight is None:
+            record = self.table._find(code)
+            if record is None:
+                self.missing.add(code)
+                weight = 0
+            else:
+                _, coefficient, exponent, _ = record
+                minor = currencies.get(code).minor if code in currencies.CURRENCIES else 1
+                weight = coefficient * self.scale // minor
+                weight = weight * 10 ** exponent if exponent >= 0 else weight // 10 ** -exponent
+            self._weights[code] = weight
+        return weight
+
+    def add(self, code, delta):
+        """`delta` minor units of profile `code` came in (or went out, if negative)"""
+        self.held[code] = self.held.get(code, 0) + delta
+        self.total += delta * self._weight(code)
+
+    def set(self, code, amount):
+        """Hold exactly `amount` minor units of profile `code`"""
+        self.add(code, amount - self.held.get(code, 0))
+
+    def values(self):
+        """[(target code, amount in its minor units)] for every target, in order"""
+        total = self.total
+        return [(code, _round_div(total * numerator, denominator))
+                for code, (numerator, denominator, _) in zip(self.targets, self._divisors)]
+
+    def decimals(self):
+        """{target code: exact Decimal amount in major units}"""
+        return {code: Decimal(amount).scaleb(-digits)
+                for (code, amount), (_, _, digits) in zip(self.values(), self._divisors)}
+
+    def formatted(self):
+        """['1.234,50 USD', ...] in the money counter's number format"""
+        return [currencies.Currency(code, code, 10 ** digits, ()).format(amount)
+                for (code, amount), (_, _, digits) in zip(self.values(), self._divisors)]
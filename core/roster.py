@@ -0,0 +1,259 @@
+"""
+Birthday roster: names and birth dates with two sorted indexes.
+
+Birth dates are kept in columns (year, month, day arrays plus a name list),
+one slot per person. Two indexes are parallel key/slot arrays kept sorted:
+
+- by day of year (month * 32 + day), for upcoming birthdays;
+- by birth date (its ordinal), for everything that depends on age.
+
+Every query is a bisect for the bounds of one key range (a few ranges at
+most), so its cost is logarithmic plus the rows it returns. Inserting or
+deleting one person is a bisect and an array insert or delete per index.
+
+A roster is built once from CSV, then saved in a small binary file of the
+raw columns and indexes that load() reads back without parsing or sorting.
+Ages follow dates.age: a 29 February birthday falls on 28 February in
+other years.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+import csv
+import os
+import struct
+import sys
+
+from core.dates import check_date, is_leap, month_length, ordinal, parse_iso, age
+
+MAGIC = b'ROSTER1\0'
+_HEADER = struct.Struct('<II')      # slots, name blob bytes
+
+
+def _day_key(month, day):
+    return month * 32 + day
+
+
+def _insert(keys, slots, key, slot):
+    i = bisect_right(keys, key)
+    keys.insert(i, key)
+    slots.insert(i, slot)
+
+
+def _delete(keys, slots, key, slot):
+    for i in range(bisect_left(keys, key), bisect_right(keys, key)):
+        if slots[i] == slot:
+            del keys[i]
+            del slots[i]
+            return
+    raise KeyError(slot)
+
+
+class Roster:
+    """People with birth dates, indexed by birthday and by birth date"""
+
+    def __init__(self):
+        self.names = []
+        self.years = array('H')
+        self.months = array('B')        # 0 marks a free slot
+        self.days = array('B')
+        self.day_keys = array('H')
+        self.day_slots = array('I')
+        self.birth_keys = array('I')
+        self.birth_slots = array('I')
+        self._free = []
+
+    def __len__(self):
+        return len(self.day_keys)
+
+    def person(self, slot):
+        """(name, (y, m, d)) of one slot"""
+        return self.names[slot], (self.years[slot], self.months[slot], self.days[slot])
+
+    # ----- changes -----
+    def add(self, name, birth):
+        """Insert a person; returns their slot"""
+        year, month, day = birth
+        check_date(year, month, day)
+        if self._free:
+            slot = self._free.pop()
+            self.names[slot] = name
+            self.years[slot], self.months[slot], self.days[slot] = year, month, day
+        else:
+            slot = len(self.names)
+            self.names.append(name)
+            self.years.append(year)
+            self.months.append(month)
+            self.days.append(day)
+        _insert(self.day_keys, self.day_slots, _day_key(month, day), slot)
+        _insert(self.birth_keys, self.birth_slots, ordinal(year, month, day), slot)
+        return slot
+
+    def remove(self, slot):
+        """Delete the person in `slot`; the slot is reused by a later add()"""
+        if slot >= len(self.months) or not self.months[slot]:
+            raise KeyError(slot)
+        year, month, day = self.years[slot], self.months[slot], self.days[slot]
+        _delete(self.day_keys, self.day_slots, _day_key(month, day), slot)
+        _delete(self.birth_keys, self.birth_slots, ordinal(year, month, day), slot)
+        self.names[slot] = None
+        self.months[slot] = 0
+        self._free.append(slot)
+
+    # ----- queries -----
+    def upcoming(self, today, days=30):
+        """[(birthday, name, birth, turning)] in the `days` days from `today`, soonest first"""
+        start = today if isinstance(today, date) else date(*today)
+        end = start + timedelta(days=max(0, min(days, 366)) - 1)
+        found = []
+        while start <= end:
+            year = start.year
+            stop = min(end, date(year, 12, 31))
+            lo = _day_key(start.month, start.day)
+            hi = _day_key(stop.month, stop.day)
+            if hi == _day_key(2, 28) and not is_leap(year):
+                hi = _day_key(2, 29)        # 29 February birthdays fall on the 28th
+            for i in range(bisect_left(self.day_keys, lo), bisect_right(self.day_keys, hi)):
+                slot = self.day_slots[i]
+                turning = year - self.years[slot]
+                if turning > 0:
+                    month = self.months[slot]
+                    birthday = date(year, month, min(self.days[slot], month_length(year, month)))
+                    found.append((birthday, self.names[slot], self.person(slot)[1], turning))
+            start = stop + timedelta(days=1)
+        return found
+
+    def turning(self, year, month, years):
+        """[(name, birth)] of people who turn `years` in year-month, by birth date"""
+        born = year - years
+        if born < 1:
+            return []
+        lo = ordinal(born, month, 1)
+        hi = ordinal(born, month, month_length(born, month))
+        return self._births(bisect_left(self.birth_keys, lo), bisect_right(self.birth_keys, hi))
+
+    def aged(self, on, low, high=None):
+        """[(name, birth, (years, months, days))] of people aged low..high on a date, oldest first"""
+        on = (on.year, on.month, on.day) if isinstance(on, date) else tuple(on)
+        high = low if high is None else high
+        i = bisect_right(self.birth_keys, self._latest_birth(on, high + 1))
+        j = bisect_right(self.birth_keys, self._latest_birth(on, low))
+        return [(name, birth, age(birth, on)) for name, birth in self._births(i, j)]
+
+    def age_counts(self, on):
+        """{years: people} on a date, one bisect per year of age"""
+        on = (on.year, on.month, on.day) if isinstance(on, date) else tuple(on)
+        counts = {}
+        years = 0
+        above = bisect_right(self.birth_keys, self._latest_birth(on, 0))
+        while above:
+            below = bisect_right(self.birth_keys, self._latest_birth(on, years + 1))
+            if above > below:
+                counts[years] = above - below
+            above = below
+            years += 1
+        return counts
+
+    def _births(self, i, j):
+        return [self.person(self.birth_slots[k]) for k in range(i, j)]
+
+    @staticmethod
+    def _latest_birth(on, years):
+        """Ordinal of the latest birth date at least `years` old on `on` (0 if none)"""
+        year, month, day = on
+        born = year - years
+        if born < 1:
+            return 0
+        if day == month_length(year, month):
+            # On the last day of a month, everyone born in that month has had their day
+            day = month_length(born, month)
+        return ordinal(born, month, min(day, month_length(born, month)))
+
+    # ----- building and storage -----
+    @classmethod
+    def from_csv(cls, fh, name_column='name', date_column='birth_date'):
+        """(roster, skipped rows) from a CSV with name and ISO date columns; sorts once"""
+        roster = cls()
+        skipped = 0
+        reader = csv.DictReader(fh)
+        for row in reader:
+            try:
+                year, month, day = parse_iso(row[date_column] or '')
+                check_date(year, month, day)
+            except (ValueError, KeyError):
+                skipped += 1
+                continue
+            roster.names.append(row.get(name_column) or '')
+            roster.years.append(year)
+            roster.months.append(month)
+            roster.days.append(day)
+        roster._reindex()
+        return roster, skipped
+
+    def _reindex(self):
+        live = [slot for slot in range(len(self.names)) if self.months[slot]]
+        day_keys = {slot: _day_key(self.months[slot], self.days[slot]) for slot in live}
+        order = sorted(live, key=day_keys.__getitem__)
+        self.day_slots = array('I', order)
+        self.day_keys = array('H', [day_keys[slot] for slot in order])
+        birth_keys = {slot: ordinal(self.years[slot], self.months[slot], self.days[slot])
+                      for slot in live}
+        order = sorted(live, key=birth_keys.__getitem__)
+        self.birth_slots = array('I', order)
+        self.birth_keys = array('I', [birth_keys[slot] for slot in order])
+        self._free = [slot for slot in range(len(self.names)) if not self.months[slot]]
+
+    def _columns(self):
+        return (self.years, self.months, self.days, self.day_keys, self.day_slots,
+                self.birth_keys, self.birth_slots)
+
+    def save(self, path):
+        """Write the columns and indexes as one little-endian binary file"""
+        names = '\0'.join(name or '' for name in self.names).encode('utf-8')
+        with open(path, 'wb') as fh:
+            fh.write(MAGIC)
+            fh.write(_HEADER.pack(len(self.names), len(names)))
+            lengths = struct.pack('<2I', len(self.day_keys), len(self.birth_keys))
+            fh.write(lengths)
+            for column in self._columns():
+                if sys.byteorder == 'big':
+                    column = array(column.typecode, column)
+                    column.byteswap()
+                fh.write(column.tobytes())
+            fh.write(names)
+
+    @classmethod
+    def load(cls, path):
+        """Read a file written by save(); raises ValueError if it is not one"""
+        roster = cls()
+        with open(path, 'rb') as fh:
+            if fh.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a roster file")
+            head = fh.read(_HEADER.size + 8)
+            if len(head) != _HEADER.size + 8:
+                raise ValueError(f"{path} is truncated")
+            slots, name_bytes = _HEADER.unpack_from(head)
+            day_rows, birth_rows = struct.unpack_from('<2I', head, _HEADER.size)
+            sizes = (slots, slots, slots, day_rows, day_rows, birth_rows, birth_rows)
+            columns = roster._columns()
+            # Checked against the file first, so a corrupt header cannot ask for huge reads
+            expected = fh.tell() + name_bytes + sum(size * column.itemsize
+                                                    for column, size in zip(columns, sizes))
+            if expected != os.fstat(fh.fileno()).st_size:
+                raise ValueError(f"{path} is truncated or corrupt")
+            for column, size in zip(columns, sizes):
+                data = fh.read(size * column.itemsize)
+                if len(data) != size * column.itemsize:
+                    raise ValueError(f"{path} is truncated")
+                column.frombytes(data)
+                if sys.byteorder == 'big':
+                    column.byteswap()
+            names = fh.read(name_bytes).decode('utf-8')
+        roster.names = names.split('\0') if slots else []
+        if len(roster.names) != slots or day_rows > slots or birth_rows > slots:
+            raise ValueError(f"{path} is corrupt")
+        roster._free = [slot for slot in range(slots) if not roster.months[slot]]
+        for slot in roster._free:
+            roster.names[slot] = None
+        return roster
@@ -0,0 +1,192 @@
+"""
+Counting sessions for the money counter.
+
+A DayLedger holds named CountingSessions (one per shift), each with many
+Tills. Counts are stored as fixed-width integer arrays, one slot per
+denomination, and every change is pushed up as a delta so till, session and
+day totals stay current without re-summing anything.
+
+Reports are streamed row by row to CSV or JSON lines; nothing builds the
+whole report in memory.
+"""
+
+from array import array
+from datetime import date
+import csv
+import json
+
+# Egyptian pound notes, largest first (the money counter's rows)
+DENOMINATIONS = (200, 100, 50, 20, 10, 5, 1)
+
+
+def format_amount(value):
+    """Whole pounds with dot thousands separators, e.g. 12.345"""
+    return f"{int(value):,}".replace(',', '.')
+
+
+def _zeros(size):
+    return array('q', bytes(8 * size))
+
+
+class Tally:
+    """Counts per denomination plus a running total, updated by deltas"""
+    __slots__ = ('denominations', 'counts', 'total', '_index')
+
+    def __init__(self, denominations=DENOMINATIONS):
+        self.denominations = tuple(denominations)
+        self.counts = _zeros(len(self.denominations))
+        self.total = 0
+        self._index = {d: i for i, d in enumerate(self.denominations)}
+
+    def slot(self, denomination):
+        """Index of a denomination in `counts`"""
+        return self._index[denomination]
+
+    def count(self, denomination):
+        return self.counts[self._index[denomination]]
+
+    def subtotal(self, denomination):
+        return denomination * self.count(denomination)
+
+    def add(self, index, delta):
+        """Add `delta` notes at denomination slot `index`"""
+        self.counts[index] += delta
+        self.total += delta * self.denominations[index]
+
+
+class Till(Tally):
+    """One cash drawer; changes propagate to its session and day"""
+    __slots__ = ('name', 'session')
+
+    def __init__(self, name, session=None, denominations=DENOMINATIONS):
+        super().__init__(denominations)
+        self.name = name
+        self.session = session
+
+    def set_count(self, denomination, count):
+        """Set a count and return the change in notes (0 if unchanged)"""
+        if count < 0:
+            raise ValueError("count cannot be negative")
+        index = self._index[denomination]
+        delta = count - self.counts[index]
+        if delta:
+            self.add(index, delta)
+            if self.session is not None:
+                self.session.add(index, delta)
+        return delta
+
+    def clear(self):
+        for denomination in self.denominations:
+            self.set_count(denomination, 0)
+
+
+class CountingSession(Tally):
+    """A named shift with many tills; its counts are the sum of its tills"""
+    __slots__ = ('name', 'day', 'tills', 'ledger')
+
+    def __init__(self, name, day=None, ledger=None, denominations=DENOMINATIONS):
+        super().__init__(denominations)
+        self.name = name
+        self.day = day or date.today()
+        self.tills = []
+        self.ledger = ledger
+
+    def add_till(self, name=None):
+        till = Till(name or f"Till {len(self.tills) + 1}", self, self.denominations)
+        self.tills.append(till)
+        return till
+
+    def add(self, index, delta):
+        super().add(index, delta)
+        if self.ledger is not None:
+            self.ledger.day_tally(self.day, self.denominations).add(index, delta)
+
+
+class DayLedger:
+    """All sessions, with a running Tally per day"""
+
+    def __init__(self):
+        self.sessions = []
+        self.days = {}
+
+    def day_tally(self, day, denominations=DENOMINATIONS):
+        tally = self.days.get(day)
+        if tally is None:
+            tally = self.days[day] = Tally(denominations)
+        return tally
+
+    def new_session(self, name=None, day=None, denominations=DENOMINATIONS):
+        day = day or date.today()
+        if name is None:
+            same_day = sum(1 for s in self.sessions if s.day == day)
+            name = f"Shift {same_day + 1}"
+        session = CountingSession(name, day, self, denominations)
+        self.sessions.append(session)
+        self.day_tally(day, denominations)
+        return session
+
+
+# ==================== PERSISTENCE ====================
+def ledger_layout(ledger):
+    """[[session name, ISO day, [till names]], ...] for the state store"""
+    return [[s.name, s.day.isoformat(), [t.name for t in s.tills]] for s in ledger.sessions]
+
+
+def till_key(ledger, till):
+    """Store key of a till's counts: 'session index:till index'"""
+    session = till.session
+    return f"{ledger.sessions.index(session)}:{session.tills.index(till)}"
+
+
+def restore_ledger(layout, counts, denominations=DENOMINATIONS):
+    """Rebuild a DayLedger from ledger_layout() and {till_key: [counts]}"""
+    ledger = DayLedger()
+    for s, (name, day, tills) in enumerate(layout):
+        session = ledger.new_session(name, date.fromisoformat(day), denominations)
+        for t, till_name in enumerate(tills):
+            till = session.add_till(till_name)
+            for denomination, count in zip(denominations, counts.get(f"{s}:{t}", ())):
+                till.set_count(denomination, count)
+    return ledger
+
+
+# ==================== STREAMING EXPORT ====================
+def iter_rows(ledger):
+    """Yield report rows: every till, then its session, then the day total"""
+    for day in sorted(ledger.days):
+        day_sessions = [s for s in ledger.sessions if s.day == day]
+        for session in day_sessions:
+            for till in session.tills:
+                yield _row('till', day, session.name, till.name, till)
+            yield _row('session', day, session.name, '', session)
+        yield _row('day', day, '', '', ledger.days[day])
+
+
+def _row(level, day, session, till, tally):
+    row = {'level': level, 'day': day.isoformat(), 'session': session, 'till': till}
+    for denomination, count in zip(tally.denominations, tally.counts):
+        row[str(denomination)] = count
+    row['total'] = tally.total
+    return row
+
+
+def export_csv(ledger, fh):
+    """Stream the report to an open text file as CSV; return the row count"""
+    writer = None
+    rows = 0
+    for row in iter_rows(ledger):
+        if writer is None:
+            writer = csv.DictWriter(fh, fieldnames=list(row))
+            writer.writeheader()
+        writer.writerow(row)
+        rows += 1
+    return rows
+
+
+def export_jsonl(ledger, fh):
+    """Stream the report as one JSON object per line; return the row count"""
+    rows = 0
+    for row in iter_rows(ledger):
+        fh.write(json.dumps(row) + '\n')
+        rows += 1
+    return rows
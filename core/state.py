@@ -0,0 +1,223 @@
+"""
+Persistent app state: an append-only journal plus a compacted snapshot.
+
+Screens call set(namespace, key, value) with small JSON values. The call
+only updates memory and hands the record to a background writer, which
+waits DEBOUNCE seconds to coalesce bursts (one record per key per batch),
+appends the batch to journal.jsonl and fsyncs it. Every COMPACT_EVERY
+records it writes the whole state to snapshot.json (temp file + fsync +
+rename) and starts a fresh journal.
+
+Records carry a sequence number and the snapshot stores the last one it
+includes, so a crash at any point loses at most the batch being written:
+load() reads the snapshot, replays newer journal records, and trims a torn
+final line. A batch that cannot be written (storage full or gone) stays
+pending and is tried again on the next flush. Values are stored as given,
+so pass fresh lists rather than ones that will be mutated later.
+"""
+
+import json
+import logging
+import os
+import threading
+
+DEBOUNCE = 0.5          # seconds to coalesce changes before writing
+COMPACT_EVERY = 500     # journal records between snapshots
+SNAPSHOT = 'snapshot.json'
+JOURNAL = 'journal.jsonl'
+
+log = logging.getLogger(__name__)
+
+
+class StateStore:
+    """Namespaced key/value state persisted off the calling thread"""
+
+    def __init__(self, folder, debounce=DEBOUNCE, compact_every=COMPACT_EVERY):
+        self.folder = folder
+        self.debounce = debounce
+        self.compact_every = compact_every
+        self.values = {}
+        self._seq = 0
+        self._journal_records = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._now = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._closed = False
+        self._thread = None
+        self._journal = None
+        self._journal_size = None   # bytes of whole records in the journal
+
+    # ----- reading -----
+    def load(self):
+        """Read the snapshot and replay the journal; returns self"""
+        snapshot = self._path(SNAPSHOT)
+        if os.path.exists(snapshot):
+            try:
+                with open(snapshot, encoding='utf-8') as fh:
+                    data = json.load(fh)
+                self.values = data.get('values', {})
+                self._seq = data.get('seq', 0)
+            except (OSError, ValueError):
+                self.values = {}
+        last = self._seq
+        journal = self._path(JOURNAL)
+        good = 0
+        ended = True
+        try:
+            with open(journal, 'rb') as fh:
+                for line in fh:
+                    try:
+                        record = json.loads(line)
+                        seq = record['seq']
+                        if seq > last:
+                            self.values.setdefault(record['ns'], {})[record['key']] = record['value']
+                            self._seq = seq
+                    except (ValueError, KeyError, TypeError):
+                        break
+                    good += len(line)
+                    ended = line.endswith(b'\n')
+                    self._journal_records += 1
+            # Drop the torn tail, and end a whole final record that lost its
+            # newline, so new records are not glued to either
+            if good < os.path.getsize(journal) or not ended:
+                with open(journal, 'r+b') as fh:
+                    fh.truncate(good)
+                    if not ended:
+                        fh.seek(good)
+                        fh.write(b'\n')
+        except OSError:
+            pass
+        return self
+
+    def get(self, namespace, key, default=None):
+        return self.values.get(namespace, {}).get(key, default)
+
+    def namespace(self, namespace):
+        """Copy of every key in one namespace"""
+        with self._lock:
+            return dict(self.values.get(namespace, {}))
+
+    # ----- writing -----
+    def set(self, namespace, key, value):
+        """Record a change; never blocks on disk"""
+        with self._lock:
+            self.values.setdefault(namespace, {})[key] = value
+            self._pending[(namespace, key)] = value
+            self._idle.clear()
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name='state-writer', daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def flush(self, timeout=None):
+        """Write pending changes now; wait up to `timeout` seconds (0 = don't wait)"""
+        self._now.set()
+        self._wake.set()
+        if timeout:
+            return self._idle.wait(timeout)
+        return self._idle.is_set()
+
+    def close(self, timeout=1.0):
+        """Flush and stop the writer (app exit)"""
+        self._closed = True
+        self.flush()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    # ----- writer thread -----
+    def _path(self, name):
+        return os.path.join(self.folder, name)
+
+    def _run(self):
+        try:
+            while True:
+                self._wake.wait()
+                # Debounce: gather more changes unless a flush is asked for
+                self._now.wait(self.debounce)
+                self._wake.clear()
+                self._now.clear()
+                try:
+                    self._write_batch()
+                except OSError:
+                    log.warning("could not save state in %s", self.folder, exc_info=True)
+                    self._close_journal()
+                    if self._closed:
+                        break
+                    continue
+                if self._closed:
+                    with self._lock:
+                        if not self._pending:
+                            break
+        finally:
+            self._close_journal()
+
+    def _open_journal(self):
+        os.makedirs(self.folder, exist_ok=True)
+        path = self._path(JOURNAL)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if self._journal_size is None:
+            self._journal_size = size
+        elif size > self._journal_size:
+            # Cut off what got out of a failed write, so no torn line is left mid-journal
+            os.truncate(path, self._journal_size)
+        self._journal = open(path, 'ab')
+
+    def _close_journal(self):
+        if self._journal is not None:
+            try:
+                self._journal.close()
+            except OSError:
+                pass
+            self._journal = None
+
+    def _write_batch(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if batch:
+            try:
+                self._append(batch)
+            except OSError:
+                with self._lock:
+                    # Keep the batch for the next flush; newer changes to a key win
+                    batch.update(self._pending)
+                    self._pending = batch
+                raise
+            if self._journal_records >= self.compact_every:
+                self._compact()
+        with self._lock:
+            if not self._pending:
+                self._idle.set()
+
+    def _append(self, batch):
+        if self._journal is None:
+            self._open_journal()
+        lines = []
+        for (namespace, key), value in batch.items():
+            self._seq += 1
+            lines.append(json.dumps({'seq': self._seq, 'ns': namespace, 'key': key, 'value': value},
+                                    separators=(',', ':')))
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        self._journal.write(data)
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._journal_size += len(data)
+        self._journal_records += len(lines)
+
+    def _compact(self):
+        # Values may already hold changes queued after _seq; replaying those
+        # records later over the snapshot is harmless (same final value)
+        with self._lock:
+            text = json.dumps({'seq': self._seq, 'values': self.values}, separators=(',', ':'))
+        temp = self._path(SNAPSHOT + '.tmp')
+        with open(temp, 'w', encoding='utf-8') as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(temp, self._path(SNAPSHOT))
+        self._close_journal()
+        self._journal_size = 0
+        self._journal = open(self._path(JOURNAL), 'wb')
+        self._journal_records = 0
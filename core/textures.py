@@ -0,0 +1,51 @@
+"""
+Pixel data for cached textures: the GlassCard 9-patch border and the
+background gradient.
+
+Functions return (width, height, rgba_bytes) with rows bottom-up, ready for
+Texture.blit_buffer. The border is drawn with Pillow at SUPERSAMPLE times the
+size and scaled down, giving an anti-aliased outline that can be stretched
+to any card size as a 9-patch. Without Pillow, rounded_border raises
+RuntimeError and callers keep drawing vector outlines.
+"""
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:
+    Image = None
+
+SUPERSAMPLE = 4
+GRADIENT_STEPS = 256
+
+
+def rounded_border(radius, width, supersample=SUPERSAMPLE):
+    """White rounded-rectangle outline in a (2*radius + 2) square.
+
+    The corners take `radius` pixels on each side; the 2-pixel middle row and
+    column are the stretchable part (border=(radius,) * 4 in a BorderImage).
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is not installed")
+    size = 2 * radius + 2
+    big = size * supersample
+    image = Image.new('RGBA', (big, big), (255, 255, 255, 0))
+    inset = width * supersample / 2
+    ImageDraw.Draw(image).rounded_rectangle(
+        (inset, inset, big - 1 - inset, big - 1 - inset),
+        radius=radius * supersample,
+        outline=(255, 255, 255, 255),
+        width=max(1, round(width * supersample)),
+    )
+    resample = getattr(Image, 'Resampling', Image).LANCZOS
+    image = image.resize((size, size), resample)
+    # Symmetric, so top-down and bottom-up rows are the same
+    return size, size, image.tobytes()
+
+
+def vertical_gradient(bottom, top, steps=GRADIENT_STEPS):
+    """A 1-pixel-wide RGBA strip from `bottom` to `top` (0..1 colour tuples)"""
+    pixels = bytearray()
+    for row in range(steps):
+        t = row / (steps - 1)
+        pixels += bytes(round((b + (a - b) * t) * 255) for b, a in zip(bottom, top))
+    return 1, steps, bytes(pixels)
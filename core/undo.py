@@ -0,0 +1,132 @@
+"""
+Undo/redo history for counting, as a compact delta log.
+
+Each change is one (slot, delta) record in two parallel arrays, and user
+actions (a tap, a held +/- button, a typed number, a reset) are ranges of
+records. Consecutive changes to the same slot within one action are folded
+into one record, so holding + for a thousand steps costs one record. Every
+CHECKPOINT_EVERY actions a copy of the counts is kept, so going to any
+point in the history replays at most that many actions from the nearest
+checkpoint.
+"""
+
+from array import array
+from bisect import bisect_right
+
+CHECKPOINT_EVERY = 64
+
+
+class DeltaLog:
+    """Linear history of (slot, delta) records grouped into actions"""
+
+    def __init__(self, size, initial=None, checkpoint_every=CHECKPOINT_EVERY):
+        self.size = size
+        self.checkpoint_every = checkpoint_every
+        self.slots = array('H')
+        self.deltas = array('q')
+        self.starts = array('I')       # first record of each action
+        self.cursor = 0                # actions applied; the rest can be redone
+        # Counts at the cursor, starting from `initial` (e.g. a restored till)
+        self.counts = array('q', initial) if initial is not None else array('q', bytes(8 * size))
+        self._checkpoint_at = array('I', [0])       # action numbers, ascending
+        self._checkpoints = [array('q', self.counts)]
+        self._open = False
+
+    @property
+    def actions(self):
+        return len(self.starts)
+
+    def can_undo(self):
+        return self.cursor > 0
+
+    def can_redo(self):
+        return self.cursor < len(self.starts)
+
+    def begin(self):
+        """Start a new action; later records join it until the next begin()"""
+        self._open = False
+
+    def record(self, slot, delta):
+        """Log a change the caller has already applied"""
+        if not delta:
+            return
+        self._truncate()
+        if not self._open:
+            self._maybe_checkpoint()
+            self.starts.append(len(self.slots))
+            self.cursor += 1
+            self._open = True
+        elif self.slots and len(self.slots) > self.starts[-1] and self.slots[-1] == slot:
+            self.deltas[-1] += delta
+            self.counts[slot] += delta
+            return
+        self.slots.append(slot)
+        self.deltas.append(delta)
+        self.counts[slot] += delta
+
+    def undo(self):
+        """[(slot, delta)] that reverts the last action, or [] at the start"""
+        if not self.can_undo():
+            return []
+        self._open = False
+        start, end = self._range(self.cursor - 1)
+        self.cursor -= 1
+        changes = [(self.slots[i], -self.deltas[i]) for i in range(end - 1, start - 1, -1)]
+        for slot, delta in changes:
+            self.counts[slot] += delta
+        return changes
+
+    def redo(self):
+        """[(slot, delta)] that re-applies the next action, or [] at the end"""
+        if not self.can_redo():
+            return []
+        self._open = False
+        start, end = self._range(self.cursor)
+        self.cursor += 1
+        changes = [(self.slots[i], self.deltas[i]) for i in range(start, end)]
+        for slot, delta in changes:
+            self.counts[slot] += delta
+        return changes
+
+    def counts_at(self, action):
+        """Counts after `action` actions, replayed from the nearest checkpoint"""
+        action = max(0, min(action, len(self.starts)))
+        k = bisect_right(self._checkpoint_at, action) - 1
+        counts = array('q', self._checkpoints[k])
+        for i in range(self._offset(self._checkpoint_at[k]), self._offset(action)):
+            counts[self.slots[i]] += self.deltas[i]
+        return counts
+
+    def goto(self, action):
+        """Move the cursor to `action`; return [(slot, delta)] to apply"""
+        target = self.counts_at(action)
+        changes = [(slot, target[slot] - self.counts[slot])
+                   for slot in range(self.size) if target[slot] != self.counts[slot]]
+        self.counts = target
+        self.cursor = max(0, min(action, len(self.starts)))
+        self._open = False
+        return changes
+
+    def _offset(self, action):
+        """First record of `action` (the end of the log past the last one)"""
+        return self.starts[action] if action < len(self.starts) else len(self.slots)
+
+    def _range(self, action):
+        return self._offset(action), self._offset(action + 1)
+
+    def _truncate(self):
+        """Drop the redo tail once something new is recorded"""
+        if self.cursor < len(self.starts):
+            del self.slots[self.starts[self.cursor]:]
+            del self.deltas[self.starts[self.cursor]:]
+            del self.starts[self.cursor:]
+            while self._checkpoint_at[-1] > self.cursor:
+                self._checkpoint_at.pop()
+                self._checkpoints.pop()
+            self._open = False
+
+    def _maybe_checkpoint(self):
+        """Before action number `cursor` starts, keep the counts every N actions"""
+        if self.cursor % self.checkpoint_every == 0 and self._checkpoint_at[-1] != self.cursor:
+            self._checkpoint_at.append(self.cursor)
+            self._checkpoints.append(array('q', self.counts))
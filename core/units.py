@@ -0,0 +1,364 @@
+"""
+Unit conversion over a graph of defining relations.
+
+Each unit is defined by an edge to a unit it is measured in ('1 ft = 12 in',
+'°F = °C * 9/5 + 32'). Every conversion is affine (scale and offset; the
+offset is 0 except for temperatures), with exact Fraction coefficients, so
+chains of edges compose without rounding.
+
+The closure is built once per dimension, on first use: a walk from the
+dimension's first unit gives every unit's map to that root, in linear time.
+A pair's map (a to root, then root to b) is composed the first time it is
+asked for and memoized, so any later conversion is one dict lookup.
+
+Floats convert with float coefficients; ints, Fractions and Decimals
+convert exactly. convert_column() does a whole column at once (with NumPy
+when available); convert_csv() streams a CSV column like dates.bulk_ages.
+"""
+
+from collections import deque
+from decimal import Decimal
+from fractions import Fraction
+from math import floor, log10
+import csv
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CHUNK_ROWS = 4096
+# Typed values: Fraction('1e999999999') would build a billion-digit integer
+MAX_VALUE_DIGITS = 64
+MAX_VALUE_EXPONENT = 1000
+# Whole results up to this many digits are shown exactly, larger ones in e-notation
+_EXACT_DIGITS = 30
+
+
+class UnitError(KeyError):
+    """Unknown unit, or units of different dimensions"""
+
+
+class Unit:
+    __slots__ = ('symbol', 'name', 'dimension')
+
+    def __init__(self, symbol, name, dimension):
+        self.symbol = symbol
+        self.name = name
+        self.dimension = dimension
+
+
+class Conversion:
+    """y = x * scale + offset, exact and as floats"""
+    __slots__ = ('scale', 'offset', 'fscale', 'foffset')
+
+    def __init__(self, scale, offset=Fraction(0)):
+        self.scale = scale
+        self.offset = offset
+        self.fscale = float(scale)
+        self.foffset = float(offset)
+
+    def then(self, other):
+        """This conversion followed by `other`"""
+        return Conversion(self.scale * other.scale, self.offset * other.scale + other.offset)
+
+    def inverse(self):
+        return Conversion(1 / self.scale, -self.offset / self.scale)
+
+    def __call__(self, value):
+        if isinstance(value, float):
+            return value * self.fscale + self.foffset
+        if isinstance(value, Decimal):
+            value = Fraction(value)
+        return value * self.scale + self.offset
+
+
+class UnitGraph:
+    """Units and the edges that define them, with a lazily built closure"""
+
+    def __init__(self):
+        self.units = {}
+        self.dimensions = {}        # dimension -> [symbols] in definition order
+        self._edges = {}            # symbol -> [(symbol, Conversion)]
+        self._to_root = {}          # dimension -> {symbol: Conversion to the root}
+        self._pairs = {}            # (from, to) -> Conversion, memoized
+
+    def add_unit(self, symbol, name, dimension):
+        if symbol in self.units:
+            raise ValueError(f"unit {symbol} is already defined")
+        self.units[symbol] = Unit(symbol, name, dimension)
+        self.dimensions.setdefault(dimension, []).append(symbol)
+        self._edges[symbol] = []
+        self._invalidate(dimension)
+
+    def add_edge(self, source, target, scale, offset=0):
+        """1 `source` is `scale` `target` (plus `offset`); both units must exist"""
+        a, b = self.unit(source), self.unit(target)
+        if a.dimension != b.dimension:
+            raise UnitError(f"{source} and {target} measure different things")
+        forward = Conversion(Fraction(scale), Fraction(offset))
+        self._edges[source].append((target, forward))
+        self._edges[target].append((source, forward.inverse()))
+        self._invalidate(a.dimension)
+
+    def define(self, symbol, name, dimension, scale=1, target=None, offset=0):
+        """add_unit plus its defining edge (none for a dimension's first unit)"""
+        self.add_unit(symbol, name, dimension)
+        if target is not None:
+            self.add_edge(symbol, target, scale, offset)
+
+    def unit(self, symbol):
+        try:
+            return self.units[symbol]
+        except KeyError:
+            raise UnitError(f"unknown unit {symbol!r}") from None
+
+    def _invalidate(self, dimension):
+        self._to_root.pop(dimension, None)
+        self._pairs = {pair: c for pair, c in self._pairs.items()
+                       if self.units[pair[0]].dimension != dimension}
+
+    def _closure(self, dimension):
+        """{symbol: Conversion from the symbol to the dimension's root}"""
+        maps = self._to_root.get(dimension)
+        if maps is None:
+            root = self.dimensions[dimension][0]
+            # from_root[u] converts root -> u; walked breadth first over the edges
+            from_root = {root: Conversion(Fraction(1))}
+            queue = deque([root])
+            while queue:
+                symbol = queue.popleft()
+                for other, step in self._edges[symbol]:
+                    if other not in from_root:
+                        from_root[other] = from_root[symbol].then(step)
+                        queue.append(other)
+            maps = self._to_root[dimension] = {s: c.inverse() for s, c in from_root.items()}
+        return maps
+
+    def conversion(self, source, target):
+        """The Conversion from `source` to `target`; one lookup once memoized"""
+        pair = (source, target)
+        found = self._pairs.get(pair)
+        if found is None:
+            a, b = self.unit(source), self.unit(target)
+            if a.dimension != b.dimension:
+                raise UnitError(f"cannot convert {a.name} to {b.name}")
+            maps = self._closure(a.dimension)
+            if source not in maps or target not in maps:
+                raise UnitError(f"no path from {source} to {target}")
+            found = self._pairs[pair] = maps[source].then(maps[target].inverse())
+        return found
+
+    def convert(self, value, source, target):
+        return self.conversion(source, target)(value)
+
+    def convert_column(self, values, source, target, use_numpy=None):
+        """Convert a sequence of numbers; an ndarray (float) with NumPy, else a list"""
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        elif use_numpy and numpy is None:
+            raise RuntimeError("NumPy is not installed")
+        conversion = self.conversion(source, target)
+        if use_numpy:
+            return numpy.asarray(values, dtype=float) * conversion.fscale + conversion.foffset
+        return [conversion(value) for value in values]
+
+    def convert_csv(self, src, dst, column, source, target, chunk_rows=CHUNK_ROWS):
+        """Stream a CSV, adding '<column>_<target>'; unparsable cells stay empty.
+
+        Returns the number of data rows written.
+        """
+        conversion = self.conversion(source, target)
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        header = next(reader, None)
+        if header is None:
+            return 0
+        index = header.index(column) if column in header else 0
+        writer.writerow(header + [f"{header[index]}_{target}"])
+        rows = 0
+        chunk = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                rows += _write_chunk(writer, chunk, index, conversion)
+                chunk = []
+        if chunk:
+            rows += _write_chunk(writer, chunk, index, conversion)
+        return rows
+
+
+def _write_chunk(writer, chunk, index, conversion):
+    out = []
+    for row in chunk:
+        try:
+            result = format_value(conversion(float(row[index])))
+        except (ValueError, IndexError):
+            result = ''
+        out.append(row + [result])
+    writer.writerows(out)
+    return len(chunk)
+
+
+def parse_value(text):
+    """Exact Fraction for typed text ('1.5', '2e3', '1/3'); ValueError if it is
+    not a number or is too long or too large to convert"""
+    text = text.strip()
+    mantissa, _, exponent = text.lower().partition('e')
+    if sum(c.isdigit() for c in text) > MAX_VALUE_DIGITS:
+        raise ValueError("number too long")
+    try:
+        if exponent and abs(int(exponent)) > MAX_VALUE_EXPONENT:
+            raise ValueError("number too large")
+        return Fraction(text)
+    except ZeroDivisionError:
+        raise ValueError("division by zero") from None
+
+
+def _scientific(value, digits):
+    """'d.ddde+N' for a Fraction of any size, without float() or str() of it"""
+    sign = '-' if value < 0 else ''
+    value = abs(value)
+    # log10 of big ints is exact enough to place the exponent within one
+    exponent = floor(log10(value.numerator) - log10(value.denominator))
+    mantissa = round(value * Fraction(10) ** (digits - 1 - exponent))
+    if mantissa >= 10 ** digits:
+        exponent += 1
+        mantissa = round(value * Fraction(10) ** (digits - 1 - exponent))
+    elif mantissa < 10 ** (digits - 1):
+        exponent -= 1
+        mantissa = round(value * Fraction(10) ** (digits - 1 - exponent))
+    text = str(mantissa).rstrip('0') or '0'
+    if len(text) > 1:
+        text = text[0] + '.' + text[1:]
+    return f"{sign}{text}e{exponent:+03d}"
+
+
+def format_value(value, digits=10):
+    """Up to `digits` significant digits, without float noise"""
+    if isinstance(value, Fraction):
+        if not value:
+            return '0'
+        if value.denominator == 1 and abs(value.numerator) < 10 ** _EXACT_DIGITS:
+            return str(value.numerator)
+        size = log10(abs(value.numerator)) - log10(value.denominator)
+        if not -300 < size < 300:
+            # float() would overflow or lose the value to zero
+            return _scientific(value, digits)
+        value = float(value)
+    return f"{value:.{digits}g}"
+
+
+# ==================== CATALOGUE ====================
+# (symbol, name, scale, defined in); the first unit of a dimension is its root
+CATALOGUE = {
+    'length': [
+        ('m', 'metre', 1, None),
+        ('km', 'kilometre', 1000, 'm'),
+        ('cm', 'centimetre', '0.01', 'm'),
+        ('mm', 'millimetre', '0.1', 'cm'),
+        ('µm', 'micrometre', '0.001', 'mm'),
+        ('nm', 'nanometre', '0.001', 'µm'),
+        ('in', 'inch', '2.54', 'cm'),
+        ('ft', 'foot', 12, 'in'),
+        ('yd', 'yard', 3, 'ft'),
+        ('mi', 'mile', 1760, 'yd'),
+        ('nmi', 'nautical mile', 1852, 'm'),
+    ],
+    'mass': [
+        ('kg', 'kilogram', 1, None),
+        ('g', 'gram', '0.001', 'kg'),
+        ('mg', 'milligram', '0.001', 'g'),
+        ('t', 'tonne', 1000, 'kg'),
+        ('lb', 'pound', '0.45359237', 'kg'),
+        ('oz', 'ounce', '0.0625', 'lb'),
+        ('st', 'stone', 14, 'lb'),
+    ],
+    'volume': [
+        ('L', 'litre', 1, None),
+        ('mL', 'millilitre', '0.001', 'L'),
+        ('m³', 'cubic metre', 1000, 'L'),
+        ('gal', 'US gallon', '3.785411784', 'L'),
+        ('qt', 'US quart', '0.25', 'gal'),
+        ('pt', 'US pint', '0.5', 'qt'),
+        ('cup', 'US cup', '0.5', 'pt'),
+        ('fl oz', 'US fluid ounce', '0.125', 'cup'),
+        ('tbsp', 'tablespoon', '0.5', 'fl oz'),
+        ('tsp', 'teaspoon', Fraction(1, 3), 'tbsp'),
+        ('in³', 'cubic inch', '16.387064', 'mL'),
+        ('ft³', 'cubic foot', 1728, 'in³'),
+    ],
+    'area': [
+        ('m²', 'square metre', 1, None),
+        ('cm²', 'square centimetre', '0.0001', 'm²'),
+        ('km²', 'square kilometre', 1000000, 'm²'),
+        ('ha', 'hectare', 10000, 'm²'),
+        ('in²', 'square inch', '6.4516', 'cm²'),
+        ('ft²', 'square foot', 144, 'in²'),
+        ('acre', 'acre', 43560, 'ft²'),
+        ('mi²', 'square mile', 640, 'acre'),
+        ('feddan', 'feddan', 4200, 'm²'),
+    ],
+    'temperature': [
+        ('°C', 'degree Celsius', 1, None),
+        ('K', 'kelvin', 1, '°C'),           # see TEMPERATURE_OFFSETS
+        ('°F', 'degree Fahrenheit', 1, '°C'),
+    ],
+    'data': [
+        ('B', 'byte', 1, None),
+        ('bit', 'bit', '0.125', 'B'),
+        ('kB', 'kilobyte', 1000, 'B'),
+        ('MB', 'megabyte', 1000, 'kB'),
+        ('GB', 'gigabyte', 1000, 'MB'),
+        ('TB', 'terabyte', 1000, 'GB'),
+        ('KiB', 'kibibyte', 1024, 'B'),
+        ('MiB', 'mebibyte', 1024, 'KiB'),
+        ('GiB', 'gibibyte', 1024, 'MiB'),
+        ('TiB', 'tebibyte', 1024, 'GiB'),
+    ],
+    'time': [
+        ('s', 'second', 1, None),
+        ('ms', 'millisecond', '0.001', 's'),
+        ('µs', 'microsecond', '0.001', 'ms'),
+        ('min', 'minute', 60, 's'),
+        ('h', 'hour', 60, 'min'),
+        ('day', 'day', 24, 'h'),
+        ('week', 'week', 7, 'day'),
+        ('yr', 'year (365.25 days)', '365.25', 'day'),
+    ],
+}
+
+# Temperatures: (unit, scale, offset) against °C, as in "K = °C * 1 + 273.15"
+TEMPERATURE_OFFSETS = {'K': (1, '273.15'), '°F': (Fraction(9, 5), 32)}
+
+
+def build_graph(catalogue=CATALOGUE):
+    graph = UnitGraph()
+    for dimension, units in catalogue.items():
+        for symbol, name, scale, target in units:
+            graph.add_unit(symbol, name, dimension)
+            if target is None:
+                continue
+            if symbol in TEMPERATURE_OFFSETS:
+                # The catalogue reads "1 unit = scale target"; temperatures are
+                # defined the other way, from °C
+                factor, offset = TEMPERATURE_OFFSETS[symbol]
+                graph.add_edge(target, symbol, Fraction(factor), Fraction(offset))
+            else:
+                graph.add_edge(symbol, target, Fraction(scale))
+    return graph
+
+
+_default = None
+
+
+def default_graph():
+    """The shared graph of the built-in catalogue"""
+    global _default
+    if _default is None:
+        _default = build_graph()
+    return _default
+
+
+def convert(value, source, target):
+    return default_graph().convert(value, source, target)
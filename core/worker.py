@@ -0,0 +1,105 @@
+"""
+Off-UI-thread evaluation for the calculator.
+
+Jobs run on a single background thread with their own Budget (a larger size
+limit plus a deadline). Results are handed back through `dispatch`, which the
+screen points at Clock.schedule_once so callbacks run on the UI thread.
+
+A thread is used rather than a process pool because Android builds of Python
+have no multiprocessing semaphores; large powers and factorials are computed
+in budget-checked steps, so the GIL is released regularly and a job stops
+soon after it is cancelled. A job still running past its deadline is stuck
+in a step that never checks the Budget; its thread is abandoned and the next
+job starts on a fresh one instead of queueing behind it.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+import threading
+
+from core.expression import Budget, evaluate, format_result
+
+WORKER_MAX_BITS = 1 << 17   # ~39,000 digits
+EVAL_TIMEOUT = 10           # seconds
+
+
+class EvaluationJob:
+    """One submitted expression; cancel() is safe from any thread"""
+    def __init__(self, text, mode, budget):
+        self.text = text
+        self.mode = mode
+        self.budget = budget
+
+    @property
+    def cancelled(self):
+        return self.budget.cancelled
+
+    def cancel(self):
+        self.budget.cancel()
+
+    def overdue(self):
+        deadline = self.budget.deadline
+        return deadline is not None and monotonic() > deadline
+
+
+class EvaluationWorker:
+    """Runs calculator evaluations on one background thread"""
+    def __init__(self, dispatch, max_bits=WORKER_MAX_BITS, timeout=EVAL_TIMEOUT):
+        self.dispatch = dispatch
+        self.max_bits = max_bits
+        self.timeout = timeout
+        self._executor = self._new_executor()
+        self._lock = threading.Lock()
+        self._current = None
+        self._running = None        # the job on the executor's thread, if any
+
+    @staticmethod
+    def _new_executor():
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix='calc-worker')
+
+    def submit(self, text, mode, callback):
+        """Evaluate `text`; later call callback(job, result_text, error) via dispatch.
+
+        Any job still pending is cancelled first. Cancelled jobs never call back.
+        """
+        job = EvaluationJob(text, mode, Budget(self.max_bits, self.timeout))
+        with self._lock:
+            if self._current is not None:
+                self._current.cancel()
+            self._current = job
+            if self._running is not None and self._running.overdue():
+                # Leave the stuck thread to finish on its own; nothing waits for it
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+                self._running = None
+            self._executor.submit(self._run, job, callback)
+        return job
+
+    def cancel(self):
+        with self._lock:
+            if self._current is not None:
+                self._current.cancel()
+                self._current = None
+
+    def _run(self, job, callback):
+        with self._lock:
+            if job.cancelled:
+                return
+            self._running = job
+        result, error = None, None
+        try:
+            # Formatting a huge result is expensive too, so it happens here
+            result = format_result(evaluate(job.text, job.mode, job.budget))
+        except Exception as e:
+            error = e
+        with self._lock:
+            if self._current is job:
+                self._current = None
+            if self._running is job:
+                self._running = None
+        if not job.cancelled:
+            self.dispatch(lambda: callback(job, result, error))
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in main-loop instrumentation (ELBASHA_PROFILE=1).
+
+install() wraps the hot callbacks and the layout passes with a
+CallbackProfiler and counts frames on each window flip. F12 (or a triple tap
+in the top-left corner) toggles an overlay with fps, p50/p99 frame times and
+the top offenders; F11 exports the numbers as JSON. They are also exported
+when the app stops.
+
+Wrapping a screen's methods imports its module up front, so with profiling
+on, tool screens no longer load lazily.
+"""
+
+import importlib
+import os
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics import Color, Rectangle
+from kivy.uix.label import Label
+
+from core.frameprofile import CallbackProfiler
+
+# "module:Class.method" targets, wrapped on the class before any instance binds them
+TARGETS = (
+    'widgets:AnimatedBackground.animate_particles',
+    'widgets:BackgroundEngine.on_user_activity',
+    'screens.calculator:CalculatorScreen.button_press',
+    'screens.calculator:CalculatorScreen.update_preview',
+    'screens.calculator:CalculatorScreen.on_result',
+    'screens.money:MoneyCounterScreen.update_count',
+    'screens.money:MoneyCounterScreen.flush_labels',
+    'screens.age:AgeCalculatorScreen.calculate_age',
+    'tools:Tool.build',
+)
+# Layout passes are timed per layout class
+LAYOUTS = (
+    'kivy.uix.boxlayout:BoxLayout.do_layout',
+    'kivy.uix.gridlayout:GridLayout.do_layout',
+    'kivy.uix.floatlayout:FloatLayout.do_layout',
+    'kivy.uix.anchorlayout:AnchorLayout.do_layout',
+)
+EXPORT_FILENAME = 'callback-profile.json'
+OVERLAY_REFRESH = 0.5
+CORNER = 120    # px, triple-tap area for the overlay toggle
+
+profiler = None
+overlay = None
+
+
+def _patch(profiler, target, name=None):
+    module_name, attribute = target.split(':')
+    class_name, method = attribute.split('.')
+    cls = getattr(importlib.import_module(module_name), class_name)
+    setattr(cls, method, profiler.wrap(name or attribute, getattr(cls, method)))
+
+
+def install():
+    """Wrap the targets and start counting frames; call before building widgets"""
+    global profiler
+    if profiler is None:
+        profiler = CallbackProfiler()
+        for target in TARGETS:
+            _patch(profiler, target)
+        for target in LAYOUTS:
+            _patch(profiler, target, 'layout ' + target.split(':')[1].split('.')[0])
+        Window.bind(on_flip=lambda window: profiler.frame())
+    return profiler
+
+
+def attach(root, export_dir='.'):
+    """Add the (hidden) overlay on top of `root`"""
+    global overlay
+    overlay = ProfilerOverlay(profiler, os.path.join(export_dir, EXPORT_FILENAME))
+    root.add_widget(overlay)
+    Window.bind(on_key_down=overlay.on_window_key)
+    return overlay
+
+
+def export():
+    """Write the current numbers to the overlay's export path"""
+    if overlay is not None:
+        return overlay.export()
+
+
+# ==================== OVERLAY ====================
+class ProfilerOverlay(Label):
+    """Monospace readout in the top-left corner; hidden until toggled"""
+
+    def __init__(self, profiler, export_path, **kwargs):
+        super().__init__(
+            font_name='RobotoMono-Regular',
+            font_size='11sp',
+            halign='left',
+            valign='top',
+            size_hint=(None, None),
+            pos_hint={'x': 0, 'top': 1},
+            opacity=0,
+            **kwargs
+        )
+        self.profiler = profiler
+        self.export_path = export_path
+        self._refresh_event = None
+        self.bind(texture_size=self._fit)
+        with self.canvas.before:
+            Color(0, 0, 0, 0.6)
+            self._bg = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self._sync_bg, size=self._sync_bg)
+
+    @property
+    def visible(self):
+        return self._refresh_event is not None
+
+    def toggle(self):
+        if self.visible:
+            self._refresh_event.cancel()
+            self._refresh_event = None
+            self.opacity = 0
+        else:
+            self.refresh()
+            self._refresh_event = Clock.schedule_interval(self.refresh, OVERLAY_REFRESH)
+            self.opacity = 1
+
+    def refresh(self, *args):
+        frames = self.profiler.frame_stats()
+        lines = [
+            f"{frames['fps']:5.1f} fps   p50 {frames['p50_ms']:5.1f} ms   "
+            f"p99 {frames['p99_ms']:5.1f} ms",
+            f"{'callback':<34}{'calls':>6}{'p50':>7}{'p99':>7}{'total':>8}",
+        ]
+        for name, stats in self.profiler.top(6):
+            lines.append(f"{name[-34:]:<34}{stats['samples']:>6}{stats['p50_ms']:>7.2f}"
+                         f"{stats['p99_ms']:>7.2f}{stats['total_ms']:>8.1f}")
+        self.text = "\n".join(lines)
+
+    def export(self):
+        return self.profiler.export(self.export_path)
+
+    def on_window_key(self, window, key, scancode, codepoint, modifiers):
+        if key == 293:      # F12
+            self.toggle()
+            return True
+        if key == 292:      # F11
+            self.export()
+            return True
+        return False
+
+    def on_touch_down(self, touch):
+        top = self.parent.top if self.parent else Window.height
+        if touch.is_triple_tap and touch.x < CORNER and touch.y > top - CORNER:
+            self.toggle()
+            return True
+        return super().on_touch_down(touch)
+
+    def _fit(self, instance, size):
+        self.size = (size[0] + 16, size[1] + 12)
+
+    def _sync_bg(self, *args):
+        self._bg.pos = self.pos
+        self._bg.size = self.size
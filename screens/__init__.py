@@ -0,0 +1,4 @@
+"""
+Screens of ELBASHA Multi Tools, one module per tool.
+Tool screens are imported lazily through the registry in ``tools``.
+"""
@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+"""
+Age calculator tool
+"""
+
+from kivymd.app import MDApp
+from kivymd.uix.screen import MDScreen
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.floatlayout import MDFloatLayout
+from kivymd.uix.label import MDLabel
+from kivymd.uix.button import MDRaisedButton, MDIconButton
+from kivymd.uix.textfield import MDTextField
+from kivymd.uix.filemanager import MDFileManager
+from kivymd.toast import toast
+from kivy.metrics import dp
+from kivy.properties import StringProperty
+from kivy.clock import Clock
+from datetime import date
+import os
+import threading
+
+from core import dates
+from core.roster import Roster
+from widgets import GlassCard
+
+
+# ==================== AGE CALCULATOR SCREEN ====================
+class AgeCalculatorScreen(MDScreen):
+    age_result = StringProperty("")
+    # Roster query results show at most this many names
+    ROSTER_LINES = 12
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        
+        content = MDFloatLayout()
+        main_layout = MDBoxLayout(orientation='vertical', padding=dp(20), spacing=dp(15))
+        
+        # Header
+        header_card = GlassCard(size_hint_y=None, height=dp(60), padding=dp(10))
+        header = MDBoxLayout()
+        
+        back_btn = MDIconButton(
+            icon="arrow-left-circle",
+            icon_size="36sp",
+            theme_text_color="Custom",
+            text_color=(1, 0.85, 0.3, 1),
+            size_hint_x=0.2
+        )
+        back_btn.bind(on_press=lambda x: self.go_back())
+        header.add_widget(back_btn)
+        
+        title = MDLabel(
+            text="Age Calculator",
+            halign='center',
+            font_style='H5',
+            size_hint_x=0.6
+        )
+        header.add_widget(title)
+        roster_btn = MDIconButton(
+            icon="account-group",
+            theme_text_color="Custom",
+            text_color=(1, 0.85, 0.3, 1),
+            size_hint_x=0.2
+        )
+        roster_btn.bind(on_press=lambda x: self.toggle_roster())
+        header.add_widget(roster_btn)
+        
+        header_card.add_widget(header)
+        main_layout.add_widget(header_card)
+        
+        # Input card
+        input_card = GlassCard(padding=dp(20), spacing=dp(15), size_hint_y=0.55)
+        
+        input_layout = MDBoxLayout(orientation='vertical', spacing=dp(15))
+        
+        input_title = MDLabel(
+            text="📅 Enter Birth Date",
+            halign='center',
+            font_style='H6',
+            size_hint_y=None,
+            height=dp(40),
+            theme_text_color="Custom",
+            text_color=(1, 0.85, 0.3, 1)
+        )
+        input_layout.add_widget(input_title)
+        
+        # Day field (first)
+        self.day_field = MDTextField(
+            hint_text="Day (1-31)",
+            mode="rectangle",
+            size_hint_y=None,
+            height=dp(60),
+            font_size='20sp',
+            input_filter='int'
+        )
+        self.day_field.bind(on_text_validate=self.focus_next_field)
+        input_layout.add_widget(self.day_field)
+        
+        # Month field (second)
+        self.month_field = MDTextField(
+            hint_text="Month (1-12)",
+            mode="rectangle",
+            size_hint_y=None,
+            height=dp(60),
+            font_size='20sp',
+            input_filter='int'
+        )
+        self.month_field.bind(on_text_validate=self.focus_next_field)
+        input_layout.add_widget(self.month_field)
+        
+        # Year field (third)
+        self.year_field = MDTextField(
+            hint_text="Year (e.g., 2000)",
+            mode="rectangle",
+            size_hint_y=None,
+            height=dp(60),
+            font_size='20sp',
+            input_filter='int'
+        )
+        self.year_field.bind(on_text_validate=lambda x: self.calculate_age())
+        input_layout.add_widget(self.year_field)
+        
+        calc_btn = MDRaisedButton(
+            text="✨ Calculate Age",
+            size_hint_y=None,
+            height=dp(65),
+            md_bg_color=(0.2, 0.7, 0.4, 1),
+            font_size='20sp',
+            elevation=8
+        )
+        calc_btn.bind(on_press=self.calculate_age)
+        input_layout.add_widget(calc_btn)
+        
+        input_card.add_widget(input_layout)
+        main_layout.add_widget(input_card)
+        
+        # Result card
+        result_card = GlassCard(padding=dp(20), size_hint_y=0.35)
+        
+        self.result_label = MDLabel(
+            text="Your age will appear here ✨",
+            halign='center',
+            font_style='H5',
+            theme_text_color="Custom",
+            text_color=(1, 0.85, 0.3, 1)
+        )
+        self.bind(age_result=lambda instance, value: setattr(self.result_label, 'text', value))
+        result_card.add_widget(self.result_label)
+        
+        main_layout.add_widget(result_card)
+        self.main_layout = main_layout
+        
+        # Roster panel, shown above the result by the header button
+        self.roster = None
+        self._file_manager = None
+        self.roster_card = GlassCard(size_hint_y=None, height=dp(120), padding=dp(8))
+        roster_layout = MDBoxLayout(orientation='vertical', spacing=dp(4))
+        roster_top = MDBoxLayout(spacing=dp(6))
+        import_btn = MDIconButton(
+            icon="file-upload-outline",
+            theme_text_color="Custom",
+            text_color=(1, 0.85, 0.3, 1),
+            size_hint_x=0.15
+        )
+        import_btn.bind(on_press=lambda x: self.import_roster())
+        roster_top.add_widget(import_btn)
+        self.roster_field = MDTextField(
+            hint_text="Days / age",
+            mode="rectangle",
+            size_hint_x=0.35,
+            input_filter='int'
+        )
+        roster_top.add_widget(self.roster_field)
+        self.roster_label = MDLabel(text="No roster", font_style='Caption', size_hint_x=0.5)
+        roster_top.add_widget(self.roster_label)
+        roster_layout.add_widget(roster_top)
+        
+        roster_buttons = MDBoxLayout(spacing=dp(6))
+        for text, handler in [
+            ("🎂 Next days", self.show_upcoming),
+            ("🎉 Turning", self.show_turning),
+            ("📅 Ages on date", self.show_ages),
+        ]:
+            btn = MDRaisedButton(text=text, md_bg_color=(0.2, 0.5, 0.7, 1))
+            btn.bind(on_press=lambda x, h=handler: h())
+            roster_buttons.add_widget(btn)
+        roster_layout.add_widget(roster_buttons)
+        self.roster_card.add_widget(roster_layout)
+        
+        content.add_widget(main_layout)
+        self.add_widget(content)
+        
+        # Restore the last birth date entered and save further edits
+        app = MDApp.get_running_app()
+        self.store = getattr(app, 'store', None)
+        if self.store is not None:
+            fields = (self.day_field, self.month_field, self.year_field)
+            for field, text in zip(fields, self.store.get('age', 'fields', ())):
+                field.text = text
+            for field in fields:
+                field.bind(text=self.save_fields)
+    
+    def save_fields(self, *args):
+        self.store.set('age', 'fields', [self.day_field.text, self.month_field.text,
+                                         self.year_field.text])
+    
+    def focus_next_field(self, instance):
+        """Move focus to next field when Enter is pressed"""
+        if instance == self.day_field:
+            self.month_field.focus = True
+        elif instance == self.month_field:
+            self.year_field.focus = True
+    
+    def calculate_age(self, instance=None):
+        try:
+            day = int(self.day_field.text) if self.day_field.text else 1
+            month = int(self.month_field.text) if self.month_field.text else 1
+            year = int(self.year_field.text) if self.year_field.text else 2000
+            
+            age_years, age_months, age_days = dates.age((year, month, day), date.today())
+            
+            self.result_label.font_style = 'H5'
+            self.age_result = f"🎂 Your Age:\n\n{age_years} Years ✨\n{age_months} Months 🌙\n{age_days} Days ⭐"
+            
+        except ValueError:
+            self.age_result = "❌ Invalid Date!\nPlease check your input"
+        except Exception:
+            self.age_result = "⚠️ Error occurred!"
+    
+    # ----- roster -----
+    def roster_path(self):
+        app = MDApp.get_running_app()
+        return os.path.join(app.user_data_dir if app else '.', 'roster.bin')
+    
+    def toggle_roster(self):
+        if self.roster_card.parent is not None:
+            self.main_layout.remove_widget(self.roster_card)
+            return
+        # Just above the result card
+        self.main_layout.add_widget(self.roster_card, index=1)
+        if self.roster is None:
+            try:
+                self.set_roster(Roster.load(self.roster_path()))
+            except (OSError, ValueError):
+                self.roster_label.text = "No roster yet: import a CSV\n(name, birth_date)"
+    
+    def set_roster(self, roster):
+        self.roster = roster
+        self.roster_label.text = f"{len(roster)} people"
+    
+    def import_roster(self):
+        """Pick a CSV of names and ISO birth dates; it replaces the saved roster"""
+        if self._file_manager is None:
+            self._file_manager = MDFileManager(
+                exit_manager=lambda *args: self._file_manager.close(),
+                select_path=self.on_roster_selected,
+                ext=['.csv'],
+                preview=False
+            )
+        self._file_manager.show(os.environ.get('EXTERNAL_STORAGE', os.path.expanduser('~')))
+    
+    def on_roster_selected(self, path):
+        """Build and save the index off the UI thread"""
+        self._file_manager.close()
+        self.roster_label.text = "Importing…"
+        target = self.roster_path()
+        
+        def work():
+            try:
+                with open(path, newline='', encoding='utf-8') as fh:
+                    roster, skipped = Roster.from_csv(fh)
+                roster.save(target)
+                error = None
+            except (OSError, ValueError, UnicodeDecodeError) as e:
+                roster, skipped, error = None, 0, e
+            Clock.schedule_once(lambda dt: self.on_roster_imported(roster, skipped, error))
+        
+        threading.Thread(target=work, name='roster-import', daemon=True).start()
+    
+    def on_roster_imported(self, roster, skipped, error):
+        if error is not None:
+            self.roster_label.text = "Import failed"
+            toast(str(error))
+            return
+        self.set_roster(roster)
+        toast(f"Imported {len(roster)} people" + (f", skipped {skipped} rows" if skipped else ""))
+    
+    def roster_number(self, default):
+        try:
+            return int(self.roster_field.text)
+        except ValueError:
+            return default
+    
+    def show_lines(self, title, lines):
+        """Put a roster answer in the result card, trimmed to ROSTER_LINES names"""
+        shown = lines[:self.ROSTER_LINES]
+        if len(lines) > len(shown):
+            shown.append(f"… and {len(lines) - len(shown)} more")
+        self.result_label.font_style = 'Body1'
+        self.age_result = "\n".join([title] + (shown or ["Nobody"]))
+    
+    def show_upcoming(self):
+        if self.roster is None:
+            return
+        days = self.roster_number(30)
+        found = self.roster.upcoming(date.today(), days)
+        self.show_lines(f"🎂 Birthdays in the next {days} days: {len(found)}", [
+            f"{birthday:%d %b} · {name} turns {turning}" for birthday, name, _, turning in found])
+    
+    def show_turning(self):
+        if self.roster is None:
+            return
+        today = date.today()
+        years = self.roster_number(30)
+        found = self.roster.turning(today.year, today.month, years)
+        self.show_lines(f"🎉 Turning {years} in {today:%B}: {len(found)}", [
+            f"{name} · {y:04d}-{m:02d}-{d:02d}" for name, (y, m, d) in found])
+    
+    def show_ages(self):
+        """Ages on the date in the fields (today if empty): everyone aged N, or a count per age"""
+        if self.roster is None:
+            return
+        today = date.today()
+        try:
+            on = (int(self.year_field.text or today.year), int(self.month_field.text or today.month),
+                  int(self.day_field.text or today.day))
+            dates.check_date(*on)
+        except ValueError:
+            self.age_result = "❌ Invalid Date!\nPlease check your input"
+            return
+        label = f"{on[0]:04d}-{on[1]:02d}-{on[2]:02d}"
+        if self.roster_field.text:
+            years = self.roster_number(0)
+            found = self.roster.aged(on, years)
+            self.show_lines(f"📅 Aged {years} on {label}: {len(found)}", [
+                f"{name} · {y}y {m}m {d}d" for name, _, (y, m, d) in found])
+        else:
+            counts = self.roster.age_counts(on)
+            entries = [f"{years}: {count}" for years, count in sorted(counts.items())]
+            self.show_lines(f"📅 Ages on {label}: {sum(counts.values())} people",
+                            ["  ·  ".join(entries[i:i + 5]) for i in range(0, len(entries), 5)])
+    
+    def go_back(self):
+        self.manager.transition.direction = 'right'
+        self.manager.current = 'home'
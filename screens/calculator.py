@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+Calculator tool
+"""
+
+from kivymd.app import MDApp
+from kivymd.uix.screen import MDScreen
+from kivymd.uix.anchorlayout import MDAnchorLayout
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.gridlayout import MDGridLayout
+from kivymd.uix.floatlayout import MDFloatLayout
+from kivymd.uix.label import MDLabel
+from kivymd.uix.button import MDRaisedButton, MDIconButton
+from kivymd.uix.spinner import MDSpinner
+from kivy.metrics import dp
+from kivy.properties import StringProperty, BooleanProperty
+from kivy.clock import Clock
+from kivymd.toast import toast
+from kivymd.uix.filemanager import MDFileManager
+import os
+import threading
+
+from core.batch import run_batch
+from core.expression import IncrementalEvaluator, format_result
+from core.worker import EvaluationWorker
+from widgets import GlassCard, GlyphLabel
+
+
+# ==================== CALCULATOR SCREEN ====================
+class CalculatorScreen(MDScreen):
+    expression = StringProperty("")
+    busy = BooleanProperty(False)
+    # 'float' keeps the old eval() results, 'decimal'/'fraction' are exact
+    EVAL_MODE = 'float'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        
+        # Evaluations run off the UI thread; results come back via the Clock
+        self.job = None
+        self.worker = EvaluationWorker(dispatch=lambda fn: Clock.schedule_once(lambda dt: fn()))
+        app = MDApp.get_running_app()
+        # Batch tape: one file at a time, stopped with the app
+        self._file_manager = None
+        self._batch_cancel = None
+        if app is not None:
+            app.bind(on_stop=lambda *args: self.stop())
+        self.store = getattr(app, 'store', None)
+        
+        content = MDFloatLayout()
+        main_layout = MDBoxLayout(orientation='vertical', padding=dp(15), spacing=dp(15))
+        
+        # Header with glass effect
+        header_card = GlassCard(size_hint_y=None, height=dp(60), padding=dp(10))
+        header = MDBoxLayout()
+        
+        back_btn = MDIconButton(
+            icon="arrow-left-circle",
+            icon_size="36sp",
+            theme_text_color="Custom",
+            text_color=(1, 0.85, 0.3, 1),
+            size_hint_x=0.2
+        )
+        back_btn.bind(on_press=lambda x: self.go_back())
+        header.add_widget(back_btn)
+        
+        title = MDLabel(
+            text="Calculator",
+            halign='center',
+            font_style='H5',
+            size_hint_x=0.6,
+            theme_text_color="Custom",
+            text_color=(1, 1, 1, 1)
+        )
+        header.add_widget(title)
+        
+        # Busy indicator while an evaluation is running
+        spinner_box = MDAnchorLayout(size_hint_x=0.2)
+        self.spinner = MDSpinner(
+            size_hint=(None, None),
+            size=(dp(28), dp(28)),
+            active=False,
+            color=(1, 0.85, 0.3, 1)
+        )
+        spinner_box.add_widget(self.spinner)
+        header.add_widget(spinner_box)
+        self.bind(busy=lambda instance, value: setattr(self.spinner, 'active', value))
+        
+        header_card.add_widget(header)
+        main_layout.add_widget(header_card)
+        
+        # Display with glass effect
+        display_card = GlassCard(size_hint_y=0.2, padding=dp(20))
+        display_layout = MDBoxLayout(orientation='vertical')
+        # Redrawn on every key press: glyph quads, no text rasterizing
+        self.display_label = GlyphLabel(
+            text="0",
+            halign='right',
+            font_name='RobotoLight',
+            font_size='60sp',
+            size_hint_y=0.7,
+            color=(1, 0.85, 0.3, 1)
+        )
+        display_layout.add_widget(self.display_label)
+        
+        # Live result preview, refreshed at most once per frame
+        self.preview_label = MDLabel(
+            text="",
+            halign='right',
+            font_style='H6',
+            size_hint_y=0.3,
+            theme_text_color="Custom",
+            text_color=(0.7, 0.8, 0.9, 1)
+        )
+        display_layout.add_widget(self.preview_label)
+        display_card.add_widget(display_layout)
+        main_layout.add_widget(display_card)
+        self.previewer = IncrementalEvaluator(self.EVAL_MODE)
+        self._preview_trigger = Clock.create_trigger(self.update_preview)
+        self.bind(expression=self.update_display)
+        
+        # Buttons
+        buttons_card = GlassCard(size_hint_y=0.7, padding=dp(15))
+        buttons_grid = MDGridLayout(cols=4, spacing=dp(8))
+        
+        buttons = [
+            ('7', (0.25, 0.35, 0.5, 1), False), ('8', (0.25, 0.35, 0.5, 1), False), 
+            ('9', (0.25, 0.35, 0.5, 1), False), ('/', (0.3, 0.5, 0.7, 1), False),
+            ('4', (0.25, 0.35, 0.5, 1), False), ('5', (0.25, 0.35, 0.5, 1), False), 
+            ('6', (0.25, 0.35, 0.5, 1), False), ('*', (0.3, 0.5, 0.7, 1), False),
+            ('1', (0.25, 0.35, 0.5, 1), False), ('2', (0.25, 0.35, 0.5, 1), False), 
+            ('3', (0.25, 0.35, 0.5, 1), False), ('-', (0.3, 0.5, 0.7, 1), False),
+            ('C', (0.8, 0.3, 0.3, 1), False), ('0', (0.25, 0.35, 0.5, 1), False), 
+            ('=', (0.2, 0.7, 0.4, 1), False), ('+', (0.3, 0.5, 0.7, 1), False),
+            ('⌫', (0.9, 0.5, 0.2, 1), "backspace-outline"),
+            ('tape', (0.4, 0.4, 0.6, 1), "file-document-multiple-outline"),
+            ('', (0, 0, 0, 0), False), ('!', (0.3, 0.5, 0.7, 1), False),
+        ]
+        
+        for btn_text, color, icon in buttons:
+            if btn_text:
+                if icon:
+                    # Icon buttons: backspace and the batch tape
+                    btn = MDIconButton(
+                        icon=icon,
+                        md_bg_color=color,
+                        theme_text_color="Custom",
+                        text_color=(1, 1, 1, 1),
+                        icon_size="32sp"
+                    )
+                else:
+                    # Create normal button
+                    btn = MDRaisedButton(
+                        text=btn_text,
+                        md_bg_color=color,
+                        font_size='26sp',
+                        elevation=8
+                    )
+                
+                btn.bind(on_press=lambda x, text=btn_text: self.button_press(text))
+                buttons_grid.add_widget(btn)
+            else:
+                buttons_grid.add_widget(MDLabel())
+        
+        buttons_card.add_widget(buttons_grid)
+        main_layout.add_widget(buttons_card)
+        
+        content.add_widget(main_layout)
+        self.add_widget(content)
+        
+        # Bring back the last expression; later edits are saved as they happen
+        if self.store is not None:
+            self.expression = self.store.get('calculator', 'expression', "")
+            self.bind(expression=lambda instance, value: self.store.set('calculator', 'expression', value))
+    
+    def update_display(self, instance, value):
+        self.display_label.text = value if value else "0"
+        self._preview_trigger()
+    
+    def update_preview(self, *args):
+        value = self.previewer.update(self.expression)
+        text = format_result(value) if value is not None else ""
+        # Nothing to preview for a bare number
+        self.preview_label.text = f"= {text}" if text and text != self.expression else ""
+    
+    def button_press(self, button_text):
+        if button_text == 'tape':
+            self.open_batch()
+            return
+        if self.busy:
+            # Any key stops the running evaluation; 'C' also clears it
+            self.job.cancel()
+            self.job = None
+            self.busy = False
+        
+        if button_text == 'C':
+            self.expression = ""
+        elif button_text == '⌫':
+            # Delete last character (Backspace icon style)
+            if self.expression:
+                self.expression = self.expression[:-1]
+        elif button_text == '=':
+            self.busy = True
+            self.job = self.worker.submit(self.expression, self.EVAL_MODE, self.on_result)
+        else:
+            if self.expression == "Error":
+                self.expression = ""
+            self.expression += button_text
+    
+    def on_result(self, job, result, error):
+        if job is not self.job or job.cancelled:
+            return
+        self.job = None
+        self.busy = False
+        self.expression = "Error" if error is not None else result
+    
+    # ----- batch tape -----
+    def open_batch(self):
+        """Pick a text file with one expression per line"""
+        if self._batch_cancel is not None:
+            toast("A batch is already running")
+            return
+        if self._file_manager is None:
+            self._file_manager = MDFileManager(
+                exit_manager=lambda *args: self._file_manager.close(),
+                select_path=self.on_batch_selected,
+                ext=['.txt', '.csv'],
+                preview=False
+            )
+        self._file_manager.show(os.environ.get('EXTERNAL_STORAGE', os.path.expanduser('~')))
+    
+    def on_batch_selected(self, path):
+        """Evaluate the file off the UI thread into exports/<name>-results.txt"""
+        self._file_manager.close()
+        app = MDApp.get_running_app()
+        folder = os.path.join(app.user_data_dir if app else '.', 'exports')
+        os.makedirs(folder, exist_ok=True)
+        output = os.path.join(folder, os.path.splitext(os.path.basename(path))[0] + '-results.txt')
+        cancel = self._batch_cancel = threading.Event()
+        self.spinner.active = True
+        
+        def progress(report):
+            lines = report.lines
+            Clock.schedule_once(lambda dt: setattr(self.preview_label, 'text', f"tape: {lines} lines"))
+        
+        def work():
+            report, error = None, None
+            try:
+                with open(path, encoding='utf-8') as src, open(output, 'w', encoding='utf-8') as dst:
+                    report = run_batch(src, dst, self.EVAL_MODE, progress=progress,
+                                       cancelled=cancel.is_set)
+            except Exception as e:
+                error = e
+            finally:
+                # Always report back, or _batch_cancel would never be cleared
+                Clock.schedule_once(lambda dt: self.on_batch_done(report, output, error))
+        
+        threading.Thread(target=work, name='batch-tape', daemon=True).start()
+    
+    def on_batch_done(self, report, output, error):
+        self._batch_cancel = None
+        self.spinner.active = self.busy
+        self._preview_trigger()
+        if error is not None:
+            toast(f"Batch failed: {error}")
+        else:
+            toast(f"{report.expressions} done, {report.errors} errors, "
+                  f"{report.per_second:.0f}/s → {output}")
+    
+    def stop(self):
+        """App exit: stop the evaluation worker and any batch"""
+        self.worker.shutdown()
+        if self._batch_cancel is not None:
+            self._batch_cancel.set()
+    
+    def go_back(self):
+        self.manager.transition.direction = 'right'
+        self.manager.current = 'home'
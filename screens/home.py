@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Home screen listing every registered tool
+"""
+
+from kivymd.uix.screen import MDScreen
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.floatlayout import MDFloatLayout
+from kivymd.uix.label import MDLabel
+from kivymd.uix.button import MDRectangleFlatIconButton
+from kivy.metrics import dp
+
+import tools
+from widgets import GlassCard
+
+
+# ==================== HOME SCREEN WITH STUNNING UI ====================
+class HomeScreen(MDScreen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        
+        # Main content
+        content = MDFloatLayout()
+        
+        main_layout = MDBoxLayout(
+            orientation='vertical',
+            padding=dp(20),
+            spacing=dp(25),
+            pos_hint={'center_x': 0.5, 'center_y': 0.5},
+            size_hint=(1, 1)
+        )
+        
+        # Logo and title with glow effect
+        header_card = GlassCard(
+            size_hint_y=None,
+            height=dp(140),
+            padding=dp(20)
+        )
+        
+        header_layout = MDBoxLayout(orientation='vertical', spacing=dp(5))
+        
+        logo = MDLabel(
+            text="💎",
+            halign='center',
+            font_style='H2',
+            size_hint_y=0.5
+        )
+        header_layout.add_widget(logo)
+        
+        title = MDLabel(
+            text="ELBASHA",
+            halign='center',
+            font_style='H3',
+            size_hint_y=0.3,
+            theme_text_color="Custom",
+            text_color=(1, 0.85, 0.3, 1)
+        )
+        header_layout.add_widget(title)
+        
+        subtitle = MDLabel(
+            text="Professional Multi Tools",
+            halign='center',
+            font_style='Subtitle1',
+            size_hint_y=0.2,
+            theme_text_color="Custom",
+            text_color=(0.7, 0.8, 0.9, 1)
+        )
+        header_layout.add_widget(subtitle)
+        
+        header_card.add_widget(header_layout)
+        main_layout.add_widget(header_card)
+        
+        # Menu buttons with enhanced design
+        menu_layout = MDBoxLayout(orientation='vertical', spacing=dp(15), size_hint_y=1)
+        
+        for tool in tools.TOOLS:
+            btn_card = GlassCard(size_hint_y=None, height=dp(90), padding=dp(5))
+            
+            btn = MDRectangleFlatIconButton(
+                text=tool.name,
+                icon=tool.icon,
+                line_color=tool.color,
+                text_color=(1, 1, 1, 1),
+                icon_color=tool.color,
+                font_size='22sp',
+                size_hint=(1, 1)
+            )
+            btn.bind(on_press=lambda x, s=tool.screen: self.go_to_screen_animated(s))
+            
+            btn_card.add_widget(btn)
+            menu_layout.add_widget(btn_card)
+        
+        main_layout.add_widget(menu_layout)
+        
+        # Footer
+        footer = MDLabel(
+            text="Version 2.0 | Made with ❤️",
+            halign='center',
+            font_style='Caption',
+            size_hint_y=None,
+            height=dp(30),
+            theme_text_color="Custom",
+            text_color=(0.5, 0.6, 0.7, 1)
+        )
+        main_layout.add_widget(footer)
+        
+        content.add_widget(main_layout)
+        self.add_widget(content)
+    
+    def go_to_screen_animated(self, screen_name):
+        tools.open_screen(self.manager, screen_name)
+        self.manager.transition.direction = 'left'
+        self.manager.current = screen_name
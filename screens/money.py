@@ -0,0 +1,825 @@
+# -*- coding: utf-8 -*-
+"""
+Money counter tool
+"""
+
+from kivymd.app import MDApp
+from kivymd.uix.screen import MDScreen
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.floatlayout import MDFloatLayout
+from kivymd.uix.label import MDLabel
+from kivymd.uix.button import MDIconButton, MDFillRoundFlatButton, MDFlatButton
+from kivymd.uix.card import MDCard
+from kivymd.uix.filemanager import MDFileManager
+from kivymd.uix.menu import MDDropdownMenu
+from kivymd.uix.textfield import MDTextField
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.metrics import dp
+from kivy.properties import NumericProperty
+from kivy.clock import Clock
+from kivymd.toast import toast
+import os
+import shutil
+import threading
+import time
+
+from core import currencies
+from core.banknotes import Detector
+from core.change import solver_for
+from core.rates import RateTable, Valuation
+from core.undo import DeltaLog
+from core.sessions import DayLedger, export_csv, ledger_layout, restore_ledger, till_key
+from widgets import GlassCard, GlyphLabel
+
+# Row colours and emoji, cycled through a profile's notes; coins share one look
+NOTE_COLORS = [
+    (0.9, 0.3, 0.2), (0.8, 0.2, 0.5), (0.2, 0.6, 0.9), (0.3, 0.7, 0.3),
+    (0.9, 0.6, 0.2), (0.6, 0.4, 0.8), (0.7, 0.7, 0.7),
+]
+NOTE_EMOJI = ['💵', '💴', '💶', '💷', '💰']
+COIN_COLORS = [(0.85, 0.7, 0.3), (0.65, 0.65, 0.7)]
+COIN_EMOJI = '🪙'
+
+# Reference notes for photo import: assets/banknotes/<currency>/<value>.png
+BANKNOTE_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'assets', 'banknotes')
+# The counted shifts are also shown valued in these currencies (see core.rates)
+VALUE_IN = ('EGP', 'USD', 'EUR', 'SAR')
+
+
+# ==================== DENOMINATION ROW ====================
+class DenominationRow(RecycleDataViewBehavior, MDCard):
+    """A recycled money row; its data dict says which denomination it shows"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(
+            orientation="horizontal",
+            padding=dp(8),
+            spacing=dp(6),
+            elevation=6,
+            radius=[15],
+            **kwargs
+        )
+        self.denomination = None
+        self.screen = None
+        self._loading = False
+        
+        # Info
+        info_box = MDBoxLayout(orientation='vertical', size_hint_x=0.12, spacing=dp(2))
+        self.emoji_label = MDLabel(halign="center", font_style="H6")
+        self.value_label = MDLabel(halign="center", font_style="Caption", bold=True)
+        info_box.add_widget(self.emoji_label)
+        info_box.add_widget(self.value_label)
+        self.add_widget(info_box)
+        
+        # Text input for count
+        self.count_field = MDTextField(
+            hint_text="0",
+            text="",
+            halign="center",
+            font_size='20sp',
+            size_hint_x=0.22,
+            mode="rectangle",
+            input_filter='int'
+        )
+        self.count_field.bind(
+            text=self.on_count_text,
+            on_text_validate=lambda instance: self.screen.focus_next_money_field(self.denomination)
+        )
+        self.add_widget(self.count_field)
+        
+        # Buttons
+        buttons_box = MDBoxLayout(size_hint_x=0.32, spacing=dp(4))
+        for icon, color, change in [
+            ("minus-circle", (1, 0.3, 0.3, 1), -1),
+            ("plus-circle", (0.3, 1, 0.3, 1), 1),
+        ]:
+            btn = MDIconButton(
+                icon=icon,
+                theme_text_color="Custom",
+                text_color=color,
+                icon_size="28sp"
+            )
+            btn.bind(
+                on_press=lambda x, c=change: self.screen.start_repeat(self.denomination, c),
+                state=self.on_step_state
+            )
+            buttons_box.add_widget(btn)
+        self.add_widget(buttons_box)
+        
+        # Subtotal
+        self.subtotal_label = GlyphLabel(
+            text="0",
+            halign="center",
+            font_size='12sp',
+            size_hint_x=0.34,
+            bold=True
+        )
+        self.add_widget(self.subtotal_label)
+    
+    def refresh_view_attrs(self, rv, index, data):
+        """Show `data`; typing callbacks are muted while the row is rebound"""
+        self._loading = True
+        self.screen = rv.screen
+        self.denomination = data['denomination']
+        self.md_bg_color = data['color']
+        self.emoji_label.text = data['emoji']
+        self.value_label.text = data['label']
+        self.subtotal_label.text = data['subtotal_text']
+        # Keep what the user is typing when it already means this count
+        try:
+            same = int(self.count_field.text or 0) == data['count']
+        except ValueError:
+            same = False
+        if not same:
+            self.count_field.text = data['count_text']
+        self._loading = False
+    
+    def on_count_text(self, instance, value):
+        if not self._loading and self.screen is not None:
+            self.screen.on_text_change(self.denomination, value)
+    
+    def on_step_state(self, instance, value):
+        if value == 'normal' and self.screen is not None:
+            self.screen.stop_repeat()
+
+
+# ==================== MONEY COUNTER SCREEN ====================
+class MoneyCounterScreen(MDScreen):
+    total_amount = NumericProperty(0)
+    # Holding +/- repeats after REPEAT_DELAY, every REPEAT_INTERVAL seconds
+    REPEAT_DELAY = 0.4
+    REPEAT_INTERVAL = 0.05
+    # A replaced rate file is picked up at most this many seconds later
+    RATE_CHECK_SECONDS = 5
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        
+        # One dict per row of the current currency, keyed by denomination;
+        # the same dicts are the RecycleView's data
+        self.currency_data = {}
+        self._row_index = {}
+        self._menu = None
+        self._file_manager = None
+        self._rates_manager = None
+        self._detectors = {}
+        self._photo_busy = False        # detectors are not safe to run twice at once
+        self.rates = None
+        self.valuation = None
+        self._rates_checked = 0
+        
+        # Counts live in the current till; sessions and days aggregate them.
+        # The app's state store (if any) brings back the last count.
+        app = MDApp.get_running_app()
+        self.store = getattr(app, 'store', None)
+        self.restore_state()
+        
+        # Row and label writes are collected here and flushed once per frame
+        self._dirty = set()
+        self._flush_trigger = Clock.create_trigger(self.flush_labels)
+        self._repeat_event = None
+        
+        # Undo history per till; typing into one field is a single action
+        self.histories = {}
+        self._replaying = False
+        self._typing = None
+        
+        content = MDFloatLayout()
+        main_layout = MDBoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10))
+        
+        # Header
+        header_card = GlassCard(size_hint_y=None, height=dp(60), padding=dp(10))
+        header = MDBoxLayout()
+        
+        back_btn = MDIconButton(
+            icon="arrow-left-circle",
+            icon_size="36sp",
+            theme_text_color="Custom",
+            text_color=(1, 0.85, 0.3, 1),
+            size_hint_x=0.2
+        )
+        back_btn.bind(on_press=lambda x: self.go_back())
+        header.add_widget(back_btn)
+        
+        title = MDLabel(
+            text="Money Counter",
+            halign='center',
+            font_style='H5',
+            size_hint_x=0.6
+        )
+        header.add_widget(title)
+        self.currency_button = MDFlatButton(
+            text=self.currency.code,
+            theme_text_color="Custom",
+            text_color=(1, 0.85, 0.3, 1),
+            size_hint_x=0.2
+        )
+        self.currency_button.bind(on_press=lambda x: self.open_currency_menu())
+        header.add_widget(self.currency_button)
+        
+        header_card.add_widget(header)
+        main_layout.add_widget(header_card)
+        
+        # Session / till bar
+        session_card = GlassCard(size_hint_y=None, height=dp(56), padding=dp(4))
+        session_bar = MDBoxLayout(spacing=dp(2))
+        self.session_label = MDLabel(
+            text="",
+            halign='center',
+            font_style='Caption',
+            size_hint_x=0.3
+        )
+        session_bar.add_widget(self.session_label)
+        for icon, handler in [
+            ('undo', lambda x: self.undo()),
+            ('redo', lambda x: self.redo()),
+            ('chevron-left', lambda x: self.select_till(-1)),
+            ('chevron-right', lambda x: self.select_till(1)),
+            ('plus-box-outline', lambda x: self.new_till()),
+            ('folder-plus-outline', lambda x: self.new_session()),
+            ('file-export-outline', lambda x: self.export_report()),
+        ]:
+            btn = MDIconButton(
+                icon=icon,
+                theme_text_color="Custom",
+                text_color=(1, 0.85, 0.3, 1),
+                size_hint_x=0.1
+            )
+            btn.bind(on_press=handler)
+            session_bar.add_widget(btn)
+        session_card.add_widget(session_bar)
+        main_layout.add_widget(session_card)
+        
+        # Total card with glow
+        total_card = GlassCard(
+            size_hint_y=None,
+            height=dp(124),
+            padding=dp(15)
+        )
+        
+        total_layout = MDBoxLayout(orientation='vertical', spacing=dp(5))
+        
+        total_title = MDLabel(
+            text="💰 Total Money Calculator",
+            halign="center",
+            font_style="Subtitle1",
+            size_hint_y=0.25
+        )
+        total_layout.add_widget(total_title)
+        
+        # Changes on every count; drawn from a glyph atlas (see widgets.GlyphLabel)
+        self.total_label = GlyphLabel(
+            text="0 EGP",
+            halign="center",
+            font_size='48sp',
+            color=(1, 0.85, 0.3, 1),
+            size_hint_y=0.5
+        )
+        total_layout.add_widget(self.total_label)
+        
+        # Every currency's shift total, valued in VALUE_IN at the offline rates
+        self.value_label = MDLabel(
+            text="",
+            halign="center",
+            font_style="Caption",
+            size_hint_y=0.25
+        )
+        total_layout.add_widget(self.value_label)
+        
+        total_card.add_widget(total_layout)
+        main_layout.add_widget(total_card)
+        
+        # Denomination rows: a RecycleView reuses a screenful of row widgets,
+        # however many denominations the currency has
+        self.money_list = RecycleView(size_hint_y=1, bar_width=dp(4))
+        self.money_list.viewclass = DenominationRow
+        self.money_list.screen = self
+        rows_layout = RecycleBoxLayout(
+            orientation='vertical',
+            spacing=dp(8),
+            default_size=(None, dp(64)),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        rows_layout.bind(minimum_height=rows_layout.setter('height'))
+        self.money_list.add_widget(rows_layout)
+        main_layout.add_widget(self.money_list)
+        
+        # Make change: fewest pieces for an amount, from the till's counts
+        change_card = GlassCard(size_hint_y=None, height=dp(64), padding=dp(5))
+        change_bar = MDBoxLayout(spacing=dp(6))
+        self.change_field = MDTextField(
+            hint_text="Amount",
+            halign="center",
+            size_hint_x=0.3,
+            mode="rectangle",
+            input_filter='int'
+        )
+        self.change_field.bind(on_text_validate=lambda x: self.make_change())
+        change_bar.add_widget(self.change_field)
+        change_btn = MDIconButton(
+            icon="cash-fast",
+            theme_text_color="Custom",
+            text_color=(1, 0.85, 0.3, 1),
+            size_hint_x=0.12
+        )
+        change_btn.bind(on_press=lambda x: self.make_change())
+        change_bar.add_widget(change_btn)
+        self.change_label = MDLabel(
+            text="Split an amount from this till",
+            halign="center",
+            font_style="Caption",
+            size_hint_x=0.58
+        )
+        change_bar.add_widget(self.change_label)
+        change_card.add_widget(change_bar)
+        main_layout.add_widget(change_card)
+        
+        # Reset button
+        reset_card = GlassCard(size_hint_y=None, height=dp(55), padding=dp(5))
+        reset_bar = MDBoxLayout(spacing=dp(6))
+        reset_btn = MDFillRoundFlatButton(
+            text="🔄 Reset All",
+            size_hint=(0.7, 1),
+            md_bg_color=(0.8, 0.3, 0.2, 1),
+            font_size='18sp'
+        )
+        reset_btn.bind(on_press=self.clear_all)
+        reset_bar.add_widget(reset_btn)
+        
+        # Import photo: count notes spread on a table
+        photo_btn = MDIconButton(
+            icon="image-search-outline",
+            theme_text_color="Custom",
+            text_color=(1, 0.85, 0.3, 1),
+            size_hint_x=0.15
+        )
+        photo_btn.bind(on_press=lambda x: self.import_photo())
+        reset_bar.add_widget(photo_btn)
+        
+        # Install a new exchange rate file
+        rates_btn = MDIconButton(
+            icon="bank-transfer",
+            theme_text_color="Custom",
+            text_color=(1, 0.85, 0.3, 1),
+            size_hint_x=0.15
+        )
+        rates_btn.bind(on_press=lambda x: self.import_rates())
+        reset_bar.add_widget(rates_btn)
+        reset_card.add_widget(reset_bar)
+        main_layout.add_widget(reset_card)
+        
+        content.add_widget(main_layout)
+        self.add_widget(content)
+        self.load_rates()
+        self.show_currency()
+    
+    def on_text_change(self, denomination, value):
+        try:
+            count = int(value) if value else 0
+            if count != self.till.count(denomination) and self._typing != denomination:
+                self.history.begin()
+                self._typing = denomination
+            self.set_count(denomination, count)
+        except (ValueError, OverflowError):
+            pass
+    
+    def set_count(self, denomination, count):
+        """Apply a new count by its difference; labels refresh on the next frame"""
+        delta = self.till.set_count(denomination, count)
+        if not delta:
+            return
+        if not self._replaying:
+            self.history.record(self.till.slot(denomination), delta)
+        if self.store is not None:
+            self.store.set('money', self._key(till_key(self.ledger, self.till)), list(self.till.counts))
+        self.currency_data[denomination]['count'] = count
+        self.total_amount = self.till.total
+        if self.valuation is not None:
+            self.valuation.add(self.currency.code, delta * denomination)
+        self._dirty.add(denomination)
+        self._flush_trigger()
+    
+    def focus_next_money_field(self, current_denom):
+        """Move to next denomination field when Enter is pressed"""
+        index = self._row_index.get(current_denom, -1) + 1
+        if not 0 < index < len(self.currency.rows):
+            return
+        view = self.money_list.view_adapter.get_visible_view(index)
+        if view is None:
+            # Scroll the row into view; its widget exists after the next layout
+            rows = self.money_list.layout_manager
+            scrollable = rows.height - self.money_list.height
+            if scrollable > 0:
+                row_top = index * (dp(64) + rows.spacing)
+                self.money_list.scroll_y = max(0, min(1, 1 - row_top / scrollable))
+            Clock.schedule_once(lambda dt: self._focus_row(index))
+        else:
+            view.count_field.focus = True
+    
+    def _focus_row(self, index):
+        view = self.money_list.view_adapter.get_visible_view(index)
+        if view is not None:
+            view.count_field.focus = True
+    
+    def update_count(self, denomination, change):
+        current = self.currency_data[denomination]['count']
+        new_count = max(0, current + change)
+        self.set_count(denomination, new_count)
+    
+    def start_repeat(self, denomination, change):
+        """Step once now, then keep stepping while the button is held"""
+        self.stop_repeat()
+        # One press, however long it is held, undoes as one step
+        self.history.begin()
+        self._typing = None
+        self.update_count(denomination, change)
+        self._repeat_event = Clock.schedule_once(
+            lambda dt: self._begin_repeat(denomination, change), self.REPEAT_DELAY)
+    
+    def _begin_repeat(self, denomination, change):
+        self._repeat_event = Clock.schedule_interval(
+            lambda dt: self.update_count(denomination, change), self.REPEAT_INTERVAL)
+    
+    def stop_repeat(self, *args):
+        if self._repeat_event is not None:
+            self._repeat_event.cancel()
+            self._repeat_event = None
+    
+    def flush_labels(self, *args):
+        """Update the row data that changed since the last frame; only rows on screen are redrawn"""
+        adapter = self.money_list.view_adapter
+        for denom in self._dirty:
+            data = self.currency_data[denom]
+            count = data['count']
+            data['count_text'] = str(count) if count > 0 else ""
+            data['subtotal_text'] = self.currency.format(denom * count, suffix=False)
+            index = self._row_index[denom]
+            view = adapter.get_visible_view(index)
+            if view is not None:
+                view.refresh_view_attrs(self.money_list, index, data)
+        self._dirty.clear()
+        self.total_label.text = self.currency.format(self.total_amount)
+        self.show_values()
+        
+        position = self.session.tills.index(self.till) + 1
+        session_total = self.currency.format(self.session.total)
+        self.session_label.text = (
+            f"{self.session.name} · {self.till.name} ({position}/{len(self.session.tills)})\n"
+            f"Shift total: {session_total}"
+        )
+    
+    def calculate_total(self):
+        """Reload every row from the current till (the per-edit path is set_count)"""
+        for denomination, data in self.currency_data.items():
+            data['count'] = self.till.count(denomination)
+        self.total_amount = self.till.total
+        if self.valuation is not None:
+            self.valuation.set(self.currency.code, self.session.total)
+        self._dirty.update(self.currency_data)
+        self._flush_trigger()
+    
+    def clear_all(self, instance=None):
+        """Reset the current till (undoable as one step)"""
+        self.stop_repeat()
+        self.history.begin()
+        self._typing = None
+        for denomination in self.currency_data:
+            self.set_count(denomination, 0)
+    
+    @property
+    def history(self):
+        log = self.histories.get(self.till)
+        if log is None:
+            log = self.histories[self.till] = DeltaLog(len(self.till.denominations), self.till.counts)
+        return log
+    
+    def undo(self):
+        self.apply_changes(self.history.undo())
+    
+    def redo(self):
+        self.apply_changes(self.history.redo())
+    
+    def apply_changes(self, changes):
+        """Apply (slot, delta) pairs from the history without recording them"""
+        self.stop_repeat()
+        self._typing = None
+        self._replaying = True
+        try:
+            for slot, delta in changes:
+                denomination = self.till.denominations[slot]
+                self.set_count(denomination, self.till.counts[slot] + delta)
+        finally:
+            self._replaying = False
+        self._flush_trigger()
+    
+    def select_till(self, step):
+        tills = self.session.tills
+        index = (tills.index(self.till) + step) % len(tills)
+        self.show_till(tills[index])
+    
+    def show_till(self, till):
+        self.stop_repeat()
+        self.till = till
+        self.calculate_total()
+        self.save_layout()
+    
+    def new_till(self):
+        self.show_till(self.session.add_till())
+    
+    def new_session(self):
+        self.session = self.ledger.new_session(denominations=self.currency.values)
+        self.show_till(self.session.add_till())
+    
+    # ----- currencies -----
+    def show_currency(self):
+        """Point the rows at the current currency profile and its till"""
+        self.currency_data = {}
+        self._row_index = {}
+        notes = 0
+        for index, row in enumerate(self.currency.rows):
+            if row.kind == currencies.COIN:
+                color = COIN_COLORS[row.value * 2 < self.currency.minor]
+                emoji = COIN_EMOJI
+            else:
+                color = NOTE_COLORS[notes % len(NOTE_COLORS)]
+                emoji = NOTE_EMOJI[notes % len(NOTE_EMOJI)]
+                notes += 1
+            self.currency_data[row.value] = {
+                'denomination': row.value,
+                'label': row.label,
+                'emoji': emoji,
+                'color': (*color, 0.4),
+                'count': 0,
+                'count_text': "",
+                'subtotal_text': "0",
+            }
+            self._row_index[row.value] = index
+        self.money_list.data = list(self.currency_data.values())
+        self.currency_button.text = self.currency.code
+        self.change_field.input_filter = 'float' if self.currency.minor > 1 else 'int'
+        self.change_field.text = ""
+        self.change_label.text = "Split an amount from this till"
+        self.calculate_total()
+    
+    def open_currency_menu(self):
+        if self._menu is None:
+            items = [{
+                'text': f"{currency.code} · {currency.name}",
+                'viewclass': 'OneLineListItem',
+                'on_release': lambda code=code: self.select_currency(code),
+            } for code, currency in currencies.CURRENCIES.items()]
+            self._menu = MDDropdownMenu(caller=self.currency_button, items=items, width_mult=4)
+        self._menu.open()
+    
+    def select_currency(self, code):
+        """Switch profiles; each keeps its own sessions, tills and history"""
+        if self._menu is not None:
+            self._menu.dismiss()
+        if code == self.currency.code:
+            return
+        self.stop_repeat()
+        self._typing = None
+        self.ledgers[self.currency.code] = (self.ledger, self.session, self.till)
+        self.currency = currencies.get(code)
+        if code in self.ledgers:
+            self.ledger, self.session, self.till = self.ledgers[code]
+        else:
+            self.restore_ledger()
+        if self.store is not None:
+            self.store.set('money', 'currency', code)
+        self.show_currency()
+    
+    # ----- persistence -----
+    def restore_state(self):
+        """Bring back the last currency and its ledger from the store"""
+        self.ledgers = {}
+        code = self.store.get('money', 'currency') if self.store is not None else None
+        self.currency = currencies.get(code if code in currencies.CURRENCIES else currencies.DEFAULT)
+        self.restore_ledger()
+        # Other currencies with saved counts are loaded too, so they can be valued
+        for other in currencies.CURRENCIES.values():
+            if other is not self.currency:
+                stored = self.stored_ledger(other)
+                if stored is not None:
+                    self.ledgers[other.code] = stored
+    
+    def restore_ledger(self):
+        """Rebuild this currency's sessions, tills and counts, or start fresh"""
+        stored = self.stored_ledger(self.currency)
+        if stored is not None:
+            self.ledger, self.session, self.till = stored
+        else:
+            self.ledger = DayLedger()
+            self.session = self.ledger.new_session(denominations=self.currency.values)
+            self.till = self.session.add_till()
+            self.save_layout()
+    
+    def stored_ledger(self, currency):
+        """(ledger, session, till) of a currency from the store, or None"""
+        state = self.store.namespace('money') if self.store is not None else {}
+        prefix = self._key('', currency)
+        state = {key[len(prefix):]: value for key, value in state.items() if key.startswith(prefix)}
+        layout = state.get('layout')
+        if not layout:
+            return None
+        ledger = restore_ledger(layout, state, currency.values)
+        s, t = state.get('current', (len(layout) - 1, 0))
+        session = ledger.sessions[s]
+        return ledger, session, session.tills[t]
+    
+    def _key(self, name, currency=None):
+        """Store key for a currency (default: the current one); the classic profile keeps bare keys"""
+        code = (currency or self.currency).code
+        if code == currencies.DEFAULT:
+            return name
+        return f"{code}/{name}"
+    
+    def save_layout(self):
+        """Persist the session/till structure and which till is shown"""
+        if self.store is None:
+            return
+        self.store.set('money', self._key('layout'), ledger_layout(self.ledger))
+        self.store.set('money', self._key('current'), [self.ledger.sessions.index(self.session),
+                                                       self.session.tills.index(self.till)])
+    
+    def make_change(self):
+        """Show the fewest-piece breakdown of the entered amount from this till"""
+        try:
+            amount = self.currency.to_minor(self.change_field.text or '0')
+        except ValueError:
+            amount = 0
+        if amount <= 0:
+            self.change_label.text = "Enter an amount"
+            return
+        # One cached solver per stock vector, so repeat queries are memo hits
+        solver = solver_for(self.till.denominations, tuple(self.till.counts))
+        breakdown = solver.solve(amount)
+        if breakdown is None:
+            self.change_label.text = "Not possible with this till"
+            return
+        pieces = sum(breakdown.values())
+        parts = " + ".join(f"{count}×{self.currency_data[denom]['label']}"
+                           for denom, count in breakdown.items())
+        self.change_label.text = f"{parts}\n{pieces} pieces"
+    
+    # ----- valuation -----
+    def rates_path(self):
+        app = MDApp.get_running_app()
+        return os.path.join(app.user_data_dir if app else '.', 'rates.bin')
+    
+    def load_rates(self):
+        """Map the rate file (if any) and value every currency's current shift"""
+        old = self.rates
+        try:
+            self.rates = RateTable(self.rates_path())
+        except (OSError, ValueError):
+            self.rates = None
+        if old is not None:
+            old.close()
+        self._rates_checked = time.monotonic()
+        if self.rates is None:
+            self.valuation = None
+            return
+        targets = self.store.get('money', 'value_in', VALUE_IN) if self.store is not None else VALUE_IN
+        if self.valuation is None:
+            self.valuation = Valuation(self.rates, targets)
+            for code, (_, session, _) in self.ledgers.items():
+                self.valuation.set(code, session.total)
+            self.valuation.set(self.currency.code, self.session.total)
+        else:
+            self.valuation.rebase(self.rates, targets)
+    
+    def check_rates(self):
+        """Reload the rate file if it was replaced; stat()s it at most every RATE_CHECK_SECONDS"""
+        now = time.monotonic()
+        if now - self._rates_checked < self.RATE_CHECK_SECONDS:
+            return
+        self._rates_checked = now
+        if self.rates is None or self.rates.changed():
+            self.load_rates()
+    
+    def show_values(self):
+        self.check_rates()
+        if self.valuation is None:
+            self.value_label.text = "No exchange rates yet: import a rate file"
+            return
+        text = "≈ " + " · ".join(self.valuation.formatted())
+        if self.valuation.missing:
+            text += f"\n(no rate for {', '.join(sorted(self.valuation.missing))})"
+        elif self.rates.as_of is not None:
+            text += f"\nrates of {self.rates.as_of.isoformat()}"
+        self.value_label.text = text
+    
+    def import_rates(self):
+        """Pick a rate file (see core.rates.write_table); it replaces the installed one"""
+        if self._rates_manager is None:
+            self._rates_manager = MDFileManager(
+                exit_manager=lambda *args: self._rates_manager.close(),
+                select_path=self.on_rates_selected,
+                ext=['.bin', '.rates'],
+                preview=False
+            )
+        self._rates_manager.show(os.environ.get('EXTERNAL_STORAGE', os.path.expanduser('~')))
+    
+    def on_rates_selected(self, path):
+        self._rates_manager.close()
+        target = self.rates_path()
+        try:
+            RateTable(path).close()
+            shutil.copyfile(path, target + '.tmp')
+            os.replace(target + '.tmp', target)
+        except (OSError, ValueError) as e:
+            toast(f"Not a rate file: {e}")
+            return
+        self.load_rates()
+        self.show_values()
+        toast(f"Installed {len(self.rates)} exchange rates")
+    
+    # ----- photo import -----
+    def import_photo(self):
+        """Pick a photo of notes spread on a table and count them into this till"""
+        if self._file_manager is None:
+            self._file_manager = MDFileManager(
+                exit_manager=lambda *args: self._file_manager.close(),
+                select_path=self.on_photo_selected,
+                ext=['.jpg', '.jpeg', '.png'],
+                preview=False
+            )
+        self._file_manager.show(os.environ.get('EXTERNAL_STORAGE', os.path.expanduser('~')))
+    
+    def note_detector(self):
+        """Detector for this currency's reference notes, or None if none are installed"""
+        folder = os.path.join(BANKNOTE_FOLDER, self.currency.code.split('-')[0])
+        if folder not in self._detectors:
+            try:
+                detector = Detector.from_folder(folder)
+            except (OSError, RuntimeError):
+                detector = None
+            self._detectors[folder] = detector if detector is not None and detector.templates else None
+        return self._detectors[folder]
+    
+    def on_photo_selected(self, path):
+        """Detect notes off the UI thread; on_photo_counted applies the result"""
+        self._file_manager.close()
+        if self._photo_busy:
+            toast("Still reading the last photo")
+            return
+        detector = self.note_detector()
+        if detector is None:
+            toast(f"No reference notes installed for {self.currency.code}")
+            return
+        self._photo_busy = True
+        self.change_label.text = "Reading photo…"
+        till = self.till
+        
+        def work():
+            counts, error = None, None
+            try:
+                counts = detector.count(path)
+            except Exception as e:
+                # Pillow also raises UnidentifiedImageError, DecompressionBombError, SyntaxError
+                error = e
+            finally:
+                Clock.schedule_once(lambda dt: self.on_photo_counted(till, detector, counts, error))
+        
+        threading.Thread(target=work, name='note-detector', daemon=True).start()
+    
+    def on_photo_counted(self, till, detector, counts, error):
+        """Replace the known note counts of the till with the photo's (one undo step)"""
+        self._photo_busy = False
+        self.change_label.text = "Split an amount from this till"
+        if error is not None:
+            toast("Could not read that photo")
+            return
+        if till is not self.till:
+            toast("The till changed; photo not applied")
+            return
+        self.stop_repeat()
+        self.history.begin()
+        self._typing = None
+        for value in detector.values:
+            denomination = value * self.currency.minor
+            if denomination in self.currency_data:
+                self.set_count(denomination, counts.get(value, 0))
+        toast(f"Counted {sum(counts.values())} notes from the photo")
+    
+    def export_report(self):
+        """Stream every till, shift and day total to a CSV file"""
+        app = MDApp.get_running_app()
+        folder = os.path.join(app.user_data_dir if app else '.', 'exports')
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"cash-count-{self.session.day.isoformat()}-{self.currency.code}.csv")
+        try:
+            with open(path, 'w', newline='', encoding='utf-8') as fh:
+                rows = export_csv(self.ledger, fh)
+            toast(f"Exported {rows} rows to {path}")
+        except OSError:
+            toast("Export failed")
+    
+    def go_back(self):
+        self.manager.transition.direction = 'right'
+        self.manager.current = 'home'
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+Unit converter tool
+"""
+
+from kivymd.app import MDApp
+from kivymd.uix.screen import MDScreen
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.floatlayout import MDFloatLayout
+from kivymd.uix.label import MDLabel
+from kivymd.uix.button import MDFlatButton, MDIconButton, MDRaisedButton
+from kivymd.uix.menu import MDDropdownMenu
+from kivymd.uix.textfield import MDTextField
+from kivy.metrics import dp
+
+from core import units
+from widgets import GlassCard
+
+ACCENT = (1, 0.85, 0.3, 1)
+# Columns longer than this are converted but only the first lines are shown
+COLUMN_LINES = 200
+
+
+# ==================== UNIT CONVERTER SCREEN ====================
+class UnitConverterScreen(MDScreen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.graph = units.default_graph()
+        self._menu = None
+        
+        content = MDFloatLayout()
+        main_layout = MDBoxLayout(orientation='vertical', padding=dp(20), spacing=dp(15))
+        
+        # Header
+        header_card = GlassCard(size_hint_y=None, height=dp(60), padding=dp(10))
+        header = MDBoxLayout()
+        
+        back_btn = MDIconButton(
+            icon="arrow-left-circle",
+            icon_size="36sp",
+            theme_text_color="Custom",
+            text_color=ACCENT,
+            size_hint_x=0.2
+        )
+        back_btn.bind(on_press=lambda x: self.go_back())
+        header.add_widget(back_btn)
+        
+        title = MDLabel(
+            text="Unit Converter",
+            halign='center',
+            font_style='H5',
+            size_hint_x=0.5
+        )
+        header.add_widget(title)
+        self.dimension_button = MDFlatButton(
+            text="",
+            theme_text_color="Custom",
+            text_color=ACCENT,
+            size_hint_x=0.3
+        )
+        self.dimension_button.bind(on_press=lambda x: self.open_menu(
+            self.dimension_button, list(self.graph.dimensions), self.select_dimension))
+        header.add_widget(self.dimension_button)
+        
+        header_card.add_widget(header)
+        main_layout.add_widget(header_card)
+        
+        # Single value
+        value_card = GlassCard(padding=dp(16), size_hint_y=0.4)
+        value_layout = MDBoxLayout(orientation='vertical', spacing=dp(10))
+        
+        unit_bar = MDBoxLayout(spacing=dp(6), size_hint_y=None, height=dp(48))
+        self.source_button = MDRaisedButton(text="", md_bg_color=(0.2, 0.5, 0.7, 1))
+        self.source_button.bind(on_press=lambda x: self.open_menu(
+            self.source_button, self.dimension_units(), self.select_source))
+        unit_bar.add_widget(self.source_button)
+        swap_btn = MDIconButton(
+            icon="swap-horizontal",
+            theme_text_color="Custom",
+            text_color=ACCENT
+        )
+        swap_btn.bind(on_press=lambda x: self.swap())
+        unit_bar.add_widget(swap_btn)
+        self.target_button = MDRaisedButton(text="", md_bg_color=(0.2, 0.5, 0.7, 1))
+        self.target_button.bind(on_press=lambda x: self.open_menu(
+            self.target_button, self.dimension_units(), self.select_target))
+        unit_bar.add_widget(self.target_button)
+        value_layout.add_widget(unit_bar)
+        
+        self.value_field = MDTextField(
+            hint_text="Value",
+            mode="rectangle",
+            size_hint_y=None,
+            height=dp(60),
+            font_size='20sp'
+        )
+        value_layout.add_widget(self.value_field)
+        
+        self.result_label = MDLabel(
+            text="",
+            halign='center',
+            font_style='H5',
+            theme_text_color="Custom",
+            text_color=ACCENT
+        )
+        value_layout.add_widget(self.result_label)
+        value_card.add_widget(value_layout)
+        main_layout.add_widget(value_card)
+        
+        # Column of values
+        column_card = GlassCard(padding=dp(16), size_hint_y=0.6)
+        column_layout = MDBoxLayout(orientation='vertical', spacing=dp(8))
+        column_fields = MDBoxLayout(spacing=dp(8))
+        self.column_field = MDTextField(
+            hint_text="One value per line",
+            mode="rectangle",
+            multiline=True
+        )
+        column_fields.add_widget(self.column_field)
+        self.column_output = MDTextField(
+            hint_text="Converted",
+            mode="rectangle",
+            multiline=True,
+            readonly=True
+        )
+        column_fields.add_widget(self.column_output)
+        column_layout.add_widget(column_fields)
+        column_btn = MDRaisedButton(
+            text="📏 Convert column",
+            size_hint_y=None,
+            height=dp(50),
+            md_bg_color=(0.2, 0.7, 0.4, 1)
+        )
+        column_btn.bind(on_press=lambda x: self.convert_column())
+        column_layout.add_widget(column_btn)
+        column_card.add_widget(column_layout)
+        main_layout.add_widget(column_card)
+        
+        content.add_widget(main_layout)
+        self.add_widget(content)
+        
+        # Restore the last units and value, and save further changes
+        app = MDApp.get_running_app()
+        self.store = getattr(app, 'store', None)
+        saved = self.store.namespace('units') if self.store is not None else {}
+        dimension = saved.get('dimension')
+        if dimension not in self.graph.dimensions:
+            dimension = next(iter(self.graph.dimensions))
+        self.value_field.text = saved.get('value', "1")
+        self.select_dimension(dimension, saved.get('source'), saved.get('target'))
+        self.value_field.bind(text=lambda *args: self.update_result())
+    
+    def dimension_units(self):
+        return self.graph.dimensions[self.dimension]
+    
+    def unit_label(self, symbol):
+        return f"{symbol} · {self.graph.units[symbol].name}"
+    
+    def open_menu(self, caller, choices, select):
+        if self._menu is not None:
+            self._menu.dismiss()
+        label = self.unit_label if select is not self.select_dimension else str.capitalize
+        items = [{
+            'text': label(choice),
+            'viewclass': 'OneLineListItem',
+            'on_release': lambda choice=choice: self.on_menu_choice(select, choice),
+        } for choice in choices]
+        self._menu = MDDropdownMenu(caller=caller, items=items, width_mult=4)
+        self._menu.open()
+    
+    def on_menu_choice(self, select, choice):
+        self._menu.dismiss()
+        select(choice)
+    
+    def select_dimension(self, dimension, source=None, target=None):
+        """Switch dimensions; units not in it fall back to its first two"""
+        self.dimension = dimension
+        symbols = self.graph.dimensions[dimension]
+        self.source = source if source in symbols else symbols[0]
+        self.target = target if target in symbols else symbols[min(1, len(symbols) - 1)]
+        self.dimension_button.text = dimension.capitalize()
+        self.show_units()
+    
+    def select_source(self, symbol):
+        self.source = symbol
+        self.show_units()
+    
+    def select_target(self, symbol):
+        self.target = symbol
+        self.show_units()
+    
+    def swap(self):
+        self.source, self.target = self.target, self.source
+        self.show_units()
+    
+    def show_units(self):
+        self.source_button.text = self.source
+        self.target_button.text = self.target
+        self.column_output.text = ""
+        self.update_result()
+        self.save_state()
+    
+    def update_result(self):
+        text = self.value_field.text.strip().replace(',', '')
+        if not text:
+            self.result_label.text = ""
+            return
+        try:
+            # Parsed exactly, so 1 mi shows 1.609344 km rather than a float's tail
+            result = self.graph.convert(units.parse_value(text), self.source, self.target)
+        except (ValueError, ZeroDivisionError, OverflowError):
+            self.result_label.text = "❌ Not a number"
+            return
+        self.result_label.text = f"{units.format_value(result)} {self.target}"
+        self.save_state()
+    
+    def convert_column(self):
+        """Convert every line at once; lines that are not numbers come back as '?'"""
+        lines = self.column_field.text.splitlines()
+        values = []
+        positions = []
+        for i, line in enumerate(lines):
+            try:
+                values.append(float(line.strip().replace(',', '')))
+                positions.append(i)
+            except ValueError:
+                pass
+        out = ['?' if line.strip() else '' for line in lines]
+        for i, value in zip(positions, self.graph.convert_column(values, self.source, self.target)):
+            out[i] = units.format_value(value)
+        if len(out) > COLUMN_LINES:
+            out = out[:COLUMN_LINES] + [f"… {len(out) - COLUMN_LINES} more"]
+        self.column_output.text = "\n".join(out)
+    
+    def save_state(self):
+        if self.store is not None:
+            for key, value in (('dimension', self.dimension), ('source', self.source),
+                               ('target', self.target), ('value', self.value_field.text)):
+                self.store.set('units', key, value)
+    
+    def go_back(self):
+        self.manager.transition.direction = 'right'
+        self.manager.current = 'home'
@@ -0,0 +1,39 @@
+"""ChangeSolver against an exhaustive bounded-coin DP on small cases"""
+
+import random
+
+import pytest
+
+from core.change import ChangeSolver
+
+
+def fewest_notes(amount, denominations, stock):
+    missing = amount + 1
+    best = [0] + [missing] * amount
+    for d, s in zip(denominations, stock):
+        limit = amount // d if s is None else s
+        new = best[:]
+        for a in range(amount + 1):
+            for k in range(1, min(limit, a // d) + 1):
+                new[a] = min(new[a], best[a - k * d] + k)
+        best = new
+    return None if best[amount] >= missing else best[amount]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_exhaustive_search(seed):
+    rng = random.Random(seed)
+    for _ in range(40):
+        denominations = rng.sample(range(1, 60), rng.randint(1, 5))
+        stock = [rng.choice([None, rng.randint(0, 12)]) for _ in denominations]
+        solver = ChangeSolver(denominations, stock)
+        for amount in rng.sample(range(300), 10):
+            found = solver.solve(amount)
+            expected = fewest_notes(amount, denominations, stock)
+            if found is None:
+                assert expected is None
+                continue
+            assert sum(d * n for d, n in found.items()) == amount
+            assert sum(found.values()) == expected
+            for d, s in zip(denominations, stock):
+                assert s is None or found.get(d, 0) <= s
@@ -0,0 +1,67 @@
+"""python -m core calc: bad expressions are reported, never a traceback"""
+
+import pytest
+
+from core.cli import main
+
+
+@pytest.mark.parametrize('text', [
+    "(1e999-1e999)!",
+    "1+1 / (-8)**0.5 % 2 / 2*3",
+    "1e99999999!",
+])
+def test_calc_reports_errors(capsys, text):
+    assert main(['calc', text]) == 1
+    out, err = capsys.readouterr()
+    assert out == ''
+    assert err.startswith('error: ')
+
+
+def test_calc_keeps_going_after_an_error(capsys):
+    assert main(['calc', "(1e999-1e999)!", "2+2"]) == 1
+    out, err = capsys.readouterr()
+    assert out == '4\n'
+    assert err.count('error: ') == 1
+
+
+@pytest.mark.parametrize('text, message', [
+    ("5%0", "division by zero"),
+    ("(-8)**0.5", "undefined result"),
+    ("0**-1", "result out of range"),
+])
+def test_calc_decimal_errors_are_readable(capsys, text, message):
+    assert main(['calc', '--mode', 'decimal', text]) == 1
+    assert capsys.readouterr().err == f"error: {message}\n"
+
+
+def test_calc_rejects_complex_and_infinite_results(capsys):
+    assert main(['calc', "(-8)**0.5", "1e999"]) == 1
+    assert capsys.readouterr().err == "error: not a real number\nerror: result out of range\n"
+
+
+@pytest.mark.parametrize('argv', [
+    ['total', '200=x'],
+    ['age', '2000-01-01', '--today', 'bogus'],
+    ['ages', '-', '--today', 'bogus'],
+    ['change', '-5'],
+    ['change', '10', '--stock', '0=1'],
+    ['value', 'no-such-table.bin', 'EGP=1'],
+    ['rates', 'no-such-rates.csv'],
+])
+def test_bad_input_is_an_error_not_a_traceback(capsys, argv):
+    assert main(argv) == 1
+    assert capsys.readouterr().err.startswith('error: ')
+
+
+def test_value_rejects_a_file_that_is_not_a_table(capsys, tmp_path):
+    path = tmp_path / 'rates.bin'
+    path.write_bytes(b'not a rate table at all')
+    assert main(['value', str(path), 'EGP=1']) == 1
+    assert capsys.readouterr().err.startswith('error: ')
+
+
+def test_convert_bounds_values(capsys):
+    assert main(['convert', 'm', 'km', '1e999999999', '1e400']) == 1
+    out, err = capsys.readouterr()
+    assert out == '1e+397\n'
+    assert err.startswith('error: 1e999999999')
@@ -0,0 +1,41 @@
+"""Roster files: a save/load round trip, and damaged files raise ValueError"""
+
+import pytest
+
+from core.roster import Roster
+
+
+@pytest.fixture
+def saved(tmp_path):
+    roster = Roster()
+    roster.add("Mona", (1990, 5, 17))
+    roster.add("Karim", (2000, 2, 29))
+    roster.add("Salma", (1985, 12, 1))
+    path = tmp_path / 'roster.bin'
+    roster.save(path)
+    return roster, path
+
+
+def test_round_trip(saved):
+    roster, path = saved
+    loaded = Roster.load(path)
+    assert len(loaded) == len(roster)
+    assert [loaded.person(slot) for slot in range(3)] == [roster.person(slot) for slot in range(3)]
+
+
+@pytest.mark.parametrize('keep', [0, 4, 12, 18, 30, -1])
+def test_truncated_file(saved, keep):
+    _, path = saved
+    data = path.read_bytes()
+    path.write_bytes(data[:keep])
+    with pytest.raises(ValueError):
+        Roster.load(path)
+
+
+def test_corrupt_header(saved):
+    _, path = saved
+    data = bytearray(path.read_bytes())
+    data[8:12] = (10 ** 9).to_bytes(4, 'little')    # slots
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        Roster.load(path)
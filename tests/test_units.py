@@ -0,0 +1,34 @@
+"""Typed values and result formatting stay bounded for any input size"""
+
+from fractions import Fraction
+
+import pytest
+
+from core import units
+
+
+@pytest.mark.parametrize('text', ["1e999999999", "1e5000", "1" * 100, "abc", "1/0", ""])
+def test_parse_value_rejects(text):
+    with pytest.raises(ValueError):
+        units.parse_value(text)
+
+
+def test_parse_value_is_exact():
+    assert units.parse_value(" 1/3 ") == Fraction(1, 3)
+    assert units.parse_value("2.5e3") == 2500
+
+
+@pytest.mark.parametrize('value, text', [
+    (Fraction(63360), "63360"),
+    (Fraction(2, 3), "0.6666666667"),
+    (Fraction(10) ** 5000 * 3, "3e+5000"),
+    (-Fraction(10) ** 400 / 7, "-1.428571429e+399"),
+    (Fraction(1, 10 ** 400), "1e-400"),
+])
+def test_format_value(value, text):
+    assert units.format_value(value) == text
+
+
+def test_large_value_converts():
+    graph = units.default_graph()
+    assert units.format_value(graph.convert(units.parse_value("1e400"), 'm', 'km')) == "1e+397"
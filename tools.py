@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Tool registry: every tool declares its name, icon, colour and screen factory.
+Screens are imported and built the first time they are opened, so adding a
+tool does not add to time-to-first-frame.
+"""
+
+import importlib
+
+from kivy.clock import Clock
+
+from core import profiling
+
+
+class Tool:
+    """One tool on the home screen"""
+    def __init__(self, screen, name, icon, color, factory):
+        self.screen = screen      # ScreenManager name
+        self.name = name
+        self.icon = icon
+        self.color = color
+        self.factory = factory    # "module:ScreenClass", imported on first use
+
+    def build(self):
+        module_name, class_name = self.factory.split(':')
+        with profiling.phase(f'screen {self.screen}'):
+            screen_class = getattr(importlib.import_module(module_name), class_name)
+            return screen_class(name=self.screen)
+
+
+TOOLS = []
+
+
+def register(screen, name, icon, color, factory):
+    """Add a tool; the home screen lists tools in registration order"""
+    tool = Tool(screen, name, icon, color, factory)
+    TOOLS.append(tool)
+    return tool
+
+
+def get_tool(screen):
+    for tool in TOOLS:
+        if tool.screen == screen:
+            return tool
+    raise KeyError(screen)
+
+
+register('calculator', 'Calculator', 'calculator', (0.2, 0.5, 0.8, 1),
+         'screens.calculator:CalculatorScreen')
+register('money', 'Money Counter', 'cash-multiple', (0.2, 0.7, 0.4, 1),
+         'screens.money:MoneyCounterScreen')
+register('age', 'Age Calculator', 'calendar-heart', (0.9, 0.5, 0.3, 1),
+         'screens.age:AgeCalculatorScreen')
+register('units', 'Unit Converter', 'scale-balance', (0.6, 0.4, 0.8, 1),
+         'screens.units:UnitConverterScreen')
+
+
+def open_screen(manager, screen):
+    """Return the tool's screen, building it on first use"""
+    if not manager.has_screen(screen):
+        manager.add_widget(get_tool(screen).build())
+    return manager.get_screen(screen)
+
+
+def prewarm(manager, interval=0.3):
+    """Build the remaining tool screens while idle, one every `interval` seconds"""
+    pending = [tool.screen for tool in TOOLS if not manager.has_screen(tool.screen)]
+
+    def build_next(dt):
+        while pending:
+            screen = pending.pop(0)
+            if not manager.has_screen(screen):
+                open_screen(manager, screen)
+                break
+        if pending:
+            Clock.schedule_once(build_next, interval)
+
+    if pending:
+        Clock.schedule_once(build_next, interval)
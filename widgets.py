@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+Shared widgets: the app-wide animated background, glass cards and glyph labels
+"""
+
+from kivymd.uix.floatlayout import MDFloatLayout
+from kivymd.uix.card import MDCard
+from kivy.uix.widget import Widget
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import Color, Rectangle, Line, Mesh, InstructionGroup, BorderImage
+from kivy.graphics.texture import Texture
+from kivy.properties import (BooleanProperty, ColorProperty, NumericProperty, OptionProperty,
+                             StringProperty)
+from kivy.clock import Clock
+from kivy.core.window import Window
+import time
+
+from core import glyphs, particles, textures
+from core.governor import PROFILES, FrameGovernor, detect_device_class
+from core.particles import ParticleField, quad_indices
+
+# ==================== ANIMATED BACKGROUND ====================
+_particle_texture = None
+_textures = {}
+
+# Background gradient, bottom to top (dark blue to purple)
+GRADIENT_BOTTOM = (0.05, 0.05, 0.15, 1)
+GRADIENT_TOP = (0.12, 0.05, 0.22, 1)
+
+
+def cached_texture(key, make):
+    """Texture built from make() -> (width, height, rgba bytes), once per key"""
+    texture = _textures.get(key)
+    if texture is None:
+        width, height, pixels = make()
+        texture = Texture.create(size=(width, height), colorfmt='rgba')
+        texture.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte')
+        texture.wrap = 'clamp_to_edge'
+        _textures[key] = texture
+    return texture
+
+
+def gradient_texture():
+    return cached_texture(('gradient', GRADIENT_BOTTOM, GRADIENT_TOP),
+                          lambda: textures.vertical_gradient(GRADIENT_BOTTOM, GRADIENT_TOP))
+
+
+def particle_texture(size=16):
+    """Soft round sprite shared by every particle quad (built once)"""
+    global _particle_texture
+    if _particle_texture is None:
+        center = (size - 1) / 2
+        pixels = bytearray()
+        for y in range(size):
+            for x in range(size):
+                dist = ((x - center) ** 2 + (y - center) ** 2) ** 0.5 / (size / 2)
+                alpha = max(0.0, min(1.0, (1 - dist) * 2))
+                pixels += bytes((255, 255, 255, int(alpha * 255)))
+        _particle_texture = Texture.create(size=(size, size), colorfmt='rgba')
+        _particle_texture.blit_buffer(bytes(pixels), colorfmt='rgba', bufferfmt='ubyte')
+    return _particle_texture
+
+
+class AnimatedBackground(MDFloatLayout):
+    """Stunning animated background with particles"""
+    # The array fallback costs ~1.6 us per particle per frame
+    PARTICLE_COUNT = 3000 if particles.numpy is not None else 300
+
+    def __init__(self, particle_count=None, **kwargs):
+        super().__init__(**kwargs)
+        self.particle_count = min(particle_count or self.PARTICLE_COUNT, self.PARTICLE_COUNT)
+        self.active_count = self.particle_count
+        self.field = None
+        self.meshes = []
+        self.gradient = None
+        self.bind(pos=self.update_canvas, size=self.update_canvas)
+        Clock.schedule_once(lambda dt: self.setup_background(), 0.1)
+    
+    def setup_background(self):
+        """Create gradient background with animated particles"""
+        with self.canvas.before:
+            # One shared 1-pixel-wide gradient, stretched to the widget
+            Color(1, 1, 1, 1)
+            self.gradient = Rectangle(texture=gradient_texture(), pos=self.pos, size=self.size)
+        
+        # All particles live in one array-backed field, drawn with one
+        # textured Mesh per colour bucket
+        self.field = ParticleField(self.particle_count, self.width, self.height)
+        group = InstructionGroup()
+        for bucket, rgba in enumerate(self.field.palette):
+            start, end = self.field.buckets[bucket]
+            if start == end:
+                continue
+            mesh = Mesh(mode='triangles', texture=particle_texture())
+            group.add(Color(*rgba))
+            group.add(mesh)
+            self.meshes.append([bucket, mesh, None])
+        self.canvas.before.add(group)
+        self.set_particle_count(self.active_count)
+    
+    def animate_particles(self, dt):
+        """Animate floating particles"""
+        if self.field is None:
+            return
+        self.field.step(dt)
+        self.draw_particles()
+    
+    def draw_particles(self):
+        vertices = self.field.vertices()
+        for entry in self.meshes:
+            bucket, mesh, drawn = entry
+            size = self.field.bucket_size(bucket)
+            if size != drawn:
+                # Shrink or grow the index buffer first so it never outruns the vertices
+                if drawn is not None and size > drawn:
+                    mesh.vertices = self.field.bucket_vertices(vertices, bucket)
+                mesh.indices = quad_indices(size)
+                entry[2] = size
+            mesh.vertices = self.field.bucket_vertices(vertices, bucket)
+    
+    def set_particle_count(self, count):
+        """Animate and draw only `count` particles (the rest stay parked)"""
+        self.active_count = min(count, self.particle_count)
+        if self.field is not None:
+            self.field.set_active(self.active_count)
+            self.draw_particles()
+    
+    def update_canvas(self, *args):
+        if self.gradient is not None:
+            self.gradient.pos = self.pos
+            self.gradient.size = self.size
+        if self.field is not None:
+            self.field.resize(self.width, self.height)
+
+
+# ==================== BACKGROUND ENGINE ====================
+class BackgroundEngine:
+    """Single animated background shared by all screens, owned by the app.
+
+    A FrameGovernor sets the tick rate and particle count from the measured
+    frame times, per device class; after the profile's idle timeout without
+    input, ticking stops and the background costs no redraws at all.
+    """
+
+    def __init__(self, device_class=None):
+        profile = PROFILES[device_class or detect_device_class()]
+        self.governor = FrameGovernor(profile)
+        self.widget = AnimatedBackground(particle_count=profile.particles)
+        self._tick_event = None
+        self._settings = None
+        self._pause_reasons = set()
+        self._idle_trigger = Clock.create_trigger(lambda dt: self.pause('idle'), profile.idle_timeout)
+        Window.bind(on_touch_down=self.on_user_activity, on_key_down=self.on_user_activity)
+        self.on_user_activity()
+
+    @property
+    def running(self):
+        return self._tick_event is not None
+
+    def pause(self, reason):
+        """Stop ticking until every pause reason has been resumed"""
+        self._pause_reasons.add(reason)
+        if self._tick_event is not None:
+            self._tick_event.cancel()
+            self._tick_event = None
+
+    def resume(self, reason):
+        self._pause_reasons.discard(reason)
+        if not self._pause_reasons and self._tick_event is None:
+            # The first dt after a pause is the pause itself, not a frame
+            self.governor.reset_samples()
+            self.apply_settings()
+
+    def apply_settings(self):
+        """Reschedule the tick and resize the particle count for the governor's level"""
+        interval, count = settings = self.governor.settings(time.monotonic())
+        if settings == self._settings and self._tick_event is not None:
+            return
+        self._settings = settings
+        self.widget.set_particle_count(count)
+        if self._tick_event is not None:
+            self._tick_event.cancel()
+        self._tick_event = Clock.schedule_interval(self.tick, interval)
+
+    def tick(self, dt):
+        self.widget.animate_particles(dt)
+        changed = self.governor.observe(dt)
+        # Level changes, and the end of an input hold, take effect here
+        if changed or self.governor.settings(time.monotonic()) != self._settings:
+            self.apply_settings()
+
+    def on_user_activity(self, *args):
+        """Wake up on touch/key input and restart the idle countdown"""
+        self._idle_trigger.cancel()
+        self._idle_trigger()
+        self.governor.note_input(time.monotonic())
+        if self._tick_event is not None:
+            self.apply_settings()
+        self.resume('idle')
+
+    def stop(self):
+        self._idle_trigger.cancel()
+        Window.unbind(on_touch_down=self.on_user_activity, on_key_down=self.on_user_activity)
+        self.pause('stopped')
+
+
+# ==================== GLASSMORPHISM CARD ====================
+class GlassCard(MDCard):
+    """Glassmorphism effect card"""
+    BORDER_RADIUS = 20
+    BORDER_WIDTH = 1.5
+    # Draw the border from the shared 9-patch texture (needs Pillow);
+    # otherwise fall back to a vector outline rebuilt on every resize
+    use_ninepatch = textures.Image is not None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.md_bg_color = (0.1, 0.1, 0.2, 0.3)
+        self.elevation = 10
+        self.radius = [self.BORDER_RADIUS]
+        
+        radius = self.BORDER_RADIUS
+        self._ninepatch = self.use_ninepatch
+        with self.canvas.before:
+            Color(1, 1, 1, 0.05)
+            if self._ninepatch:
+                self.border = BorderImage(
+                    texture=border_texture(radius, self.BORDER_WIDTH),
+                    border=(radius, radius, radius, radius),
+                    auto_scale='both_lower',
+                    pos=self.pos,
+                    size=self.size
+                )
+            else:
+                self.border = Line(
+                    rounded_rectangle=(self.x, self.y, self.width, self.height, radius),
+                    width=self.BORDER_WIDTH
+                )
+        
+        self.bind(pos=self.update_border, size=self.update_border)
+    
+    def update_border(self, *args):
+        if self._ninepatch:
+            # A 9-patch is 16 fixed vertices; only their positions change
+            self.border.pos = self.pos
+            self.border.size = self.size
+        else:
+            self.border.rounded_rectangle = (self.x, self.y, self.width, self.height,
+                                             self.BORDER_RADIUS)
+
+
+def border_texture(radius, width):
+    """Anti-aliased rounded outline shared by every GlassCard (built once)"""
+    return cached_texture(('border', radius, width),
+                          lambda: textures.rounded_border(radius, width))
+
+
+# ==================== GLYPH LABEL ====================
+class GlyphAtlas:
+    """One font's glyphs rasterized once into a texture, shared by its GlyphLabels"""
+    _atlases = {}
+
+    def __init__(self, font_name, font_size, bold=False, charset=glyphs.DEFAULT_CHARSET):
+        self.font = (font_name, font_size, bold)
+        self.charset = charset
+        self.build()
+
+    @classmethod
+    def get(cls, font_name, font_size, bold=False):
+        key = (font_name, int(round(font_size)), bool(bold))
+        atlas = cls._atlases.get(key)
+        if atlas is None:
+            atlas = cls._atlases[key] = cls(*key)
+        return atlas
+
+    def build(self):
+        """Render the character set as one multi-line label and record each glyph's cell"""
+        font_name, font_size, bold = self.font
+        rows = glyphs.atlas_rows(self.charset)
+        label = CoreLabel(text='\n'.join(rows), font_name=font_name, font_size=font_size,
+                          bold=bold, halign='left')
+        label.refresh()
+        texture = label.texture
+        line_height = texture.height // len(rows)
+        metrics = glyphs.GlyphMetrics(line_height, label.get_extents(' ')[0])
+        for r, row in enumerate(rows):
+            # Regions are measured from the bottom; the first row is the top line
+            bottom = texture.height - (r + 1) * line_height
+            for i, char in enumerate(row):
+                if char == ' ':
+                    continue
+                left = label.get_extents(row[:i])[0] if i else 0
+                advance = label.get_extents(char)[0]
+                region = texture.get_region(left, bottom, advance, line_height)
+                metrics.add(char, advance, region.tex_coords)
+        self.texture = texture
+        self.metrics = metrics
+
+    def ensure(self, text):
+        """Add any characters of `text` the atlas lacks (a rebuild, so rare)"""
+        missing = self.metrics.missing(text)
+        if missing:
+            self.charset += ''.join(sorted(missing))
+            self.build()
+
+
+class GlyphLabel(Widget):
+    """A label for often-changing numbers, drawn as quads from a shared glyph atlas.
+
+    Setting `text` only rewrites the mesh's vertices (once per frame); no
+    text is rasterized after the atlas is built. Text wider than the widget
+    is scaled down to fit.
+    """
+    text = StringProperty('')
+    color = ColorProperty([1, 1, 1, 1])
+    halign = OptionProperty('left', options=['left', 'center', 'right'])
+    font_name = StringProperty('Roboto')
+    font_size = NumericProperty('15sp')
+    bold = BooleanProperty(False)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._atlas = None
+        self._quads = None
+        with self.canvas:
+            self._color = Color(*self.color)
+            self._mesh = Mesh(mode='triangles')
+        self._trigger = Clock.create_trigger(self.redraw)
+        self.bind(
+            text=self._trigger, pos=self._trigger, size=self._trigger, halign=self._trigger,
+            font_name=self._reset_atlas, font_size=self._reset_atlas, bold=self._reset_atlas,
+            color=lambda instance, value: setattr(self._color, 'rgba', value)
+        )
+        self._trigger()
+
+    def _reset_atlas(self, *args):
+        self._atlas = None
+        self._trigger()
+
+    def redraw(self, *args):
+        """Lay the text out again from the atlas metrics"""
+        atlas = self._atlas
+        if atlas is None:
+            atlas = self._atlas = GlyphAtlas.get(self.font_name, self.font_size, self.bold)
+        atlas.ensure(self.text)
+        vertices, quads = glyphs.layout(atlas.metrics, self.text, self.x, self.y,
+                                        self.width, self.height, self.halign)
+        mesh = self._mesh
+        if mesh.texture is not atlas.texture:
+            mesh.texture = atlas.texture
+        if quads != self._quads:
+            # Shrink or grow the index buffer first so it never outruns the vertices
+            if self._quads is not None and quads > self._quads:
+                mesh.vertices = vertices
+            mesh.indices = quad_indices(quads)
+            self._quads = quads
+        mesh.vertices = vertices